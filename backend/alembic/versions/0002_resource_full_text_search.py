@@ -0,0 +1,64 @@
+"""Resource full-text search
+
+Adds a generated, weighted tsvector over the resource name (A), description
+(B), content (C) and metadata (D) with a GIN index for full-text search, and
+trigram indexes so short substring searches on name and description do not
+need a sequential scan. The metadata is indexed as plain text with the
+"simple" configuration, which covers its tags without requiring valid JSON.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        ALTER TABLE resources ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(meta_data, '')), 'D')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_resources_search_vector',
+        'resources',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_resources_name_trgm',
+        'resources',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_resources_description_trgm',
+        'resources',
+        ['description'],
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resources_description_trgm', table_name='resources')
+    op.drop_index('ix_resources_name_trgm', table_name='resources')
+    op.drop_index('ix_resources_search_vector', table_name='resources')
+    op.drop_column('resources', 'search_vector')
@@ -0,0 +1,32 @@
+"""Resource name prefix index
+
+Adds a btree index on the lowercased resource name with the
+text_pattern_ops operator class, so case-insensitive prefix matches
+(``lower(name) LIKE 'abc%'``) used by name suggestions are index range
+scans regardless of the database collation.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_resources_name_lower_pattern "
+        "ON resources (lower(name) text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resources_name_lower_pattern', table_name='resources')
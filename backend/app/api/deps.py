@@ -1,15 +1,18 @@
-from typing import AsyncGenerator, Optional
+import time
+from typing import AsyncGenerator, Callable, FrozenSet, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import ALGORITHM
+from app.core.principal import UserPrincipal, cache_principal, get_cached_principal
+from app.core.revocation import revocation_list
+from app.core.keys import key_ring
 from app.db.session import get_db
-from app.models.user import User
+from app.repositories.role import role_repository
 from app.repositories.user import user_repository
 from app.schemas.auth import TokenPayload
 
@@ -27,56 +30,72 @@ logger = logging.getLogger(__name__)
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme),
-) -> User:
+) -> UserPrincipal:
     """
     Get the current authenticated user.
     
+    Verified tokens are cached with the principal of their user for
+    ``settings.AUTH_CACHE_TTL_SECONDS`` (never beyond the token's expiry),
+    so repeated requests with the same token neither decode it nor query
+    the database. Revoked tokens are rejected using the in-memory
+    revocation list, which cache hits are checked against too.
+    
     Args:
         db: Database session
         token: JWT token
         
     Returns:
-        User: Current user
+        UserPrincipal: Current user
         
     Raises:
         HTTPException: If authentication fails
     """
-    logger.info(f"Authenticating user with token: {token[:10]}...")
+    principal = get_cached_principal(token)
+    if principal is not None:
+        return principal
     
+    started = time.perf_counter()
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
-        logger.info(f"Token decoded successfully: {payload}")
+        payload = key_ring.decode(token)
         token_data = TokenPayload(**payload)
-        logger.info(f"Token data validated: {token_data}")
     except (JWTError, ValidationError) as e:
-        logger.error(f"Token validation failed: {str(e)}")
+        logger.warning(f"Token validation failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if revocation_list.is_revoked(token_data.jti):
+        logger.warning(f"Revoked token used (jti: {token_data.jti})")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     # Convert token_data.sub (string) to integer for database query
     user_id = int(token_data.sub)
-    logger.info(f"Looking up user with ID: {user_id}")
     
     user = await user_repository.get(db, id=user_id)
     if not user:
-        logger.error(f"User with ID {user_id} not found")
+        logger.warning(f"User with ID {user_id} not found")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     
-    logger.info(f"User authenticated: {user.username} (ID: {user.id})")
-    return user
+    principal = UserPrincipal.from_user(user)
+    cache_principal(
+        token, principal, token_data.exp, time.perf_counter() - started, jti=token_data.jti
+    )
+    logger.debug(f"User authenticated: {user.username} (ID: {user.id})")
+    return principal
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
     """
     Get the current active user.
     
@@ -84,12 +103,12 @@ async def get_current_active_user(
         current_user: Current authenticated user
         
     Returns:
-        User: Current active user
+        UserPrincipal: Current active user
         
     Raises:
         HTTPException: If the user is inactive
     """
-    logger.info(f"Checking if user {current_user.username} (ID: {current_user.id}) is active")
+    logger.debug(f"Checking if user {current_user.username} (ID: {current_user.id}) is active")
     
     if not current_user.is_active:
         logger.error(f"User {current_user.username} (ID: {current_user.id}) is inactive")
@@ -98,13 +117,13 @@ async def get_current_active_user(
             detail="Inactive user",
         )
     
-    logger.info(f"User {current_user.username} (ID: {current_user.id}) is active")
+    logger.debug(f"User {current_user.username} (ID: {current_user.id}) is active")
     return current_user
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> UserPrincipal:
     """
     Get the current admin user.
     
@@ -112,12 +131,12 @@ async def get_current_admin_user(
         current_user: Current active user
         
     Returns:
-        User: Current admin user
+        UserPrincipal: Current admin user
         
     Raises:
         HTTPException: If the user is not an admin
     """
-    logger.info(f"Checking if user {current_user.username} (ID: {current_user.id}) is admin")
+    logger.debug(f"Checking if user {current_user.username} (ID: {current_user.id}) is admin")
     
     if not current_user.is_admin:
         logger.error(f"User {current_user.username} (ID: {current_user.id}) is not admin")
@@ -126,5 +145,55 @@ async def get_current_admin_user(
             detail="Not enough permissions",
         )
     
-    logger.info(f"User {current_user.username} (ID: {current_user.id}) is admin")
+    logger.debug(f"User {current_user.username} (ID: {current_user.id}) is admin")
     return current_user
+
+
+async def get_current_user_permissions(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> FrozenSet[str]:
+    """
+    Get the effective permissions of the current user, granted through their roles.
+    
+    Args:
+        db: Database session
+        current_user: Current active user
+        
+    Returns:
+        FrozenSet[str]: Permission names
+    """
+    return await role_repository.get_permission_names(db=db, user_id=current_user.id)
+
+
+def require_permissions(*permissions: str) -> Callable[..., UserPrincipal]:
+    """
+    Create a dependency requiring the current user to have permissions.
+    
+    Admin users pass regardless of their roles. Effective permissions are
+    cached, so the check is a set lookup once they are resolved.
+    
+    Args:
+        permissions: Names of the required permissions
+        
+    Returns:
+        Callable[..., UserPrincipal]: Dependency returning the current user
+    """
+    required = frozenset(permissions)
+    
+    async def check_permissions(
+        db: AsyncSession = Depends(get_db),
+        current_user: UserPrincipal = Depends(get_current_active_user),
+    ) -> UserPrincipal:
+        if current_user.is_admin:
+            return current_user
+        granted = await role_repository.get_permission_names(db=db, user_id=current_user.id)
+        if not required <= granted:
+            logger.error(f"User {current_user.username} (ID: {current_user.id}) lacks permissions {sorted(required - granted)}")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return current_user
+    
+    return check_permissions
@@ -1,13 +1,18 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_current_user, oauth2_scheme
 from app.core.config import settings
+from app.core.keys import key_ring
+from app.core.principal import UserPrincipal
+from app.core.rate_limit import login_rate_limiter
 from app.db.session import get_db
 from app.schemas.auth import Token, Login
+from app.schemas.common import Message
 from app.schemas.user import User, UserCreate
 from app.services.auth import auth_service
 
@@ -16,12 +21,17 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
+    
+    Attempts are rate limited per account and per client IP.
     """
+    client_ip = request.client.host if request.client else None
+    counter = await login_rate_limiter.hit(form_data.username, client_ip)
     user = await auth_service.authenticate_user(
         db, username=form_data.username, password=form_data.password
     )
@@ -31,6 +41,7 @@ async def login(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await login_rate_limiter.succeeded(form_data.username, counter)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
@@ -43,12 +54,17 @@ async def login(
 
 @router.post("/login/access-token", response_model=Token)
 async def login_access_token(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     login_data: Login = Depends(),
 ) -> Any:
     """
     Get an access token for future requests using username/email and password.
+    
+    Attempts are rate limited per account and per client IP.
     """
+    client_ip = request.client.host if request.client else None
+    counter = await login_rate_limiter.hit(login_data.username, client_ip)
     user = await auth_service.authenticate_user(
         db, username=login_data.username, password=login_data.password
     )
@@ -58,6 +74,7 @@ async def login_access_token(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await login_rate_limiter.succeeded(login_data.username, counter)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
@@ -68,6 +85,19 @@ async def login_access_token(
     }
 
 
+@router.post("/logout", response_model=Message)
+async def logout(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Any:
+    """
+    Revoke the access token used for this request.
+    """
+    await auth_service.revoke_token(db, token=token)
+    return {"message": "Token revoked"}
+
+
 @router.post("/register", response_model=User)
 async def register(
     *,
@@ -78,3 +108,14 @@ async def register(
     Register a new user.
     """
     return await auth_service.register_user(db=db, user_in=user_in)
+
+
+@router.get("/jwks", response_model=Dict[str, Any])
+async def read_jwks() -> Any:
+    """
+    Get the public keys verifying access tokens, as a JWK Set.
+    
+    Symmetric keys are never published, so the set is empty unless tokens
+    are signed with asymmetric (ES256 or RS256) keys.
+    """
+    return key_ring.jwks()
@@ -1,11 +1,11 @@
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user, get_current_admin_user
+from app.core.principal import UserPrincipal
 from app.db.session import get_db
-from app.models.user import User
 from app.schemas.common import Message
 from app.utils.caching import get_cache_stats, clear_expired_cache, invalidate_cache
 
@@ -14,19 +14,20 @@ router = APIRouter(prefix="/cache", tags=["cache"])
 
 @router.get("/stats", response_model=Dict[str, Any])
 async def read_cache_stats(
-    current_user: User = Depends(get_current_admin_user),
+    top: int = Query(0, ge=0, le=1000, description="Number of largest entries to include"),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
 ) -> Any:
     """
     Get cache statistics.
     
     Only admin users can access this endpoint.
     """
-    return get_cache_stats()
+    return get_cache_stats(top=top)
 
 
 @router.post("/clear-expired", response_model=Message)
 async def clear_expired_cache_entries(
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
 ) -> Any:
     """
     Clear expired cache entries.
@@ -40,7 +41,7 @@ async def clear_expired_cache_entries(
 @router.post("/invalidate", response_model=Message)
 async def invalidate_cache_entries(
     prefix: str = None,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
 ) -> Any:
     """
     Invalidate cache entries.
@@ -50,7 +51,7 @@ async def invalidate_cache_entries(
         
     Only superusers can access this endpoint.
     """
-    invalidate_cache(prefix)
+    await invalidate_cache(prefix)
     if prefix:
         return {"message": f"Invalidated cache entries with prefix '{prefix}'"}
     else:
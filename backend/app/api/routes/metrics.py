@@ -0,0 +1,49 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_admin_user
+from app.core.principal import UserPrincipal
+from app.core.rate_limit import login_rate_limiter
+from app.core.security import password_hasher
+from app.db.session import get_pool_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/password-hashing", response_model=Dict[str, Any])
+async def read_password_hashing_metrics(
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Get password hashing pool metrics: size, queue depth, rejections and timings.
+    
+    Only admin users can access this endpoint.
+    """
+    return password_hasher.stats()
+
+
+@router.get("/login-rate-limit", response_model=Dict[str, Any])
+async def read_login_rate_limit_metrics(
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Get sign-in rate limiter metrics: limits, allowed and rejected attempts,
+    and the bcrypt CPU time the rejections saved.
+    
+    Only admin users can access this endpoint.
+    """
+    return login_rate_limiter.stats()
+
+
+@router.get("/db-pool", response_model=Dict[str, Any])
+async def read_db_pool_metrics(
+    current_user: UserPrincipal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Get database connection pool metrics: size, connections checked out,
+    overflow, checkout timeouts and wait times.
+    
+    Only admin users can access this endpoint.
+    """
+    return get_pool_stats()
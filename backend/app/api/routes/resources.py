@@ -1,71 +1,136 @@
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
+from app.core.principal import UserPrincipal
 from app.db.session import get_db
-from app.models.user import User
+from app.repositories.resource import resource_listing_tags
 from app.schemas.common import Message
 from app.schemas.resource import (
+    PermissionCheck,
+    PermissionCheckResult,
     Resource as ResourceSchema,
     ResourceCreate,
     ResourceUpdate,
     ResourceShare,
+    ResourceSuggestion,
 )
 from app.services.resource import resource_service
-from app.utils.pagination import PaginationParams, Page
+from app.utils.caching import make_cache_key
+from app.utils.pagination import IncludeTotal, PaginationParams, Page
+from app.utils.response_cache import cached_json_response, response_scope
 
 router = APIRouter(prefix="/resources", tags=["resources"])
 
 
 @router.get("/", response_model=Page[ResourceSchema])
 async def read_resources(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination: PaginationParams = Depends(),
     owner_id: Optional[int] = None,
     is_public: Optional[bool] = None,
     search: Optional[str] = None,
-    sort_by: Optional[str] = Query(None, description="Field to sort by (name, id, etc.)"),
+    sort_by: Optional[str] = Query(None, description="Field to sort by (name, id, etc., or relevance when searching)"),
     sort_order: Optional[str] = Query("asc", description="Sort order (asc or desc)"),
-    current_user: User = Depends(get_current_active_user),
+    include_total: IncludeTotal = Query(
+        "exact", description="Total to include: exact count, planner estimate, or none"
+    ),
+    search_mode: Literal["auto", "substring", "fulltext"] = Query(
+        "auto", description="Search by substring, full text, or full text for longer terms (auto)"
+    ),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve resources with filtering, sorting, and pagination.
     """
-    return await resource_service.get_resources(
-        db=db,
-        pagination=pagination,
-        current_user=current_user,
-        owner_id=owner_id,
-        is_public=is_public,
-        search=search,
-        sort_by=sort_by,
-        sort_order=sort_order,
+    params = {
+        "scope": response_scope(current_user),
+        "pagination": pagination,
+        "owner_id": owner_id,
+        "is_public": is_public,
+        "search": search,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+        "include_total": include_total,
+        "search_mode": search_mode,
+    }
+    return await cached_json_response(
+        request,
+        db,
+        namespace="routes.read_resources",
+        key=make_cache_key((), params),
+        model=Page[ResourceSchema],
+        compute=lambda session: resource_service.get_resources(
+            db=session,
+            pagination=pagination,
+            current_user=current_user,
+            owner_id=owner_id,
+            is_public=is_public,
+            search=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            include_total=include_total,
+            search_mode=search_mode,
+        ),
+        tags=lambda page: resource_listing_tags(
+            {"current_user": current_user, "owner_id": owner_id}, page
+        ),
+        soft_ttl=60,
     )
 
 
 @router.get("/me", response_model=Page[ResourceSchema])
 async def read_my_resources(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination: PaginationParams = Depends(),
-    sort_by: Optional[str] = Query(None, description="Field to sort by (name, id, etc.)"),
+    sort_by: Optional[str] = Query(None, description="Field to sort by (name, id, etc., or relevance when searching)"),
     sort_order: Optional[str] = Query("asc", description="Sort order (asc or desc)"),
     is_public: Optional[bool] = Query(None, description="Filter by public status"),
     search: Optional[str] = Query(None, description="Search term for name or description"),
-    current_user: User = Depends(get_current_active_user),
+    include_total: IncludeTotal = Query(
+        "exact", description="Total to include: exact count, planner estimate, or none"
+    ),
+    search_mode: Literal["auto", "substring", "fulltext"] = Query(
+        "auto", description="Search by substring, full text, or full text for longer terms (auto)"
+    ),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve resources owned by or shared with the current user.
     """
-    return await resource_service.get_user_resources(
-        db=db,
-        pagination=pagination,
-        user_id=current_user.id,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        is_public=is_public,
-        search=search,
+    params = {
+        "scope": current_user.id,
+        "pagination": pagination,
+        "is_public": is_public,
+        "search": search,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+        "include_total": include_total,
+        "search_mode": search_mode,
+    }
+    return await cached_json_response(
+        request,
+        db,
+        namespace="routes.read_my_resources",
+        key=make_cache_key((), params),
+        model=Page[ResourceSchema],
+        compute=lambda session: resource_service.get_user_resources(
+            db=session,
+            pagination=pagination,
+            user_id=current_user.id,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            is_public=is_public,
+            search=search,
+            include_total=include_total,
+            search_mode=search_mode,
+        ),
+        tags=lambda page: resource_listing_tags({"user_id": current_user.id}, page),
+        soft_ttl=60,
     )
 
 
@@ -74,7 +139,7 @@ async def create_resource(
     *,
     db: AsyncSession = Depends(get_db),
     resource_in: ResourceCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Create new resource.
@@ -84,12 +149,42 @@ async def create_resource(
     )
 
 
+@router.get("/suggest", response_model=List[ResourceSuggestion])
+async def suggest_resources(
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=100, description="Name prefix typed so far"),
+    limit: int = Query(10, ge=1, le=20, description="Maximum number of suggestions"),
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Suggest names of visible resources starting with a prefix, for typeahead.
+    """
+    return await resource_service.suggest_resources(
+        db=db, query=q, current_user=current_user, limit=limit
+    )
+
+
+@router.post("/permissions:check", response_model=PermissionCheckResult)
+async def check_permissions(
+    *,
+    db: AsyncSession = Depends(get_db),
+    check: PermissionCheck,
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Check the current user's permissions on up to 5000 resources at once.
+    """
+    return await resource_service.check_permissions(
+        db=db, check=check, current_user=current_user
+    )
+
+
 @router.get("/{id}", response_model=ResourceSchema)
 async def read_resource(
     *,
     db: AsyncSession = Depends(get_db),
     id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get resource by ID.
@@ -111,7 +206,7 @@ async def update_resource(
     db: AsyncSession = Depends(get_db),
     id: int,
     resource_in: ResourceUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Update a resource.
@@ -126,7 +221,7 @@ async def delete_resource(
     *,
     db: AsyncSession = Depends(get_db),
     id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Delete a resource.
@@ -142,7 +237,7 @@ async def share_resource(
     db: AsyncSession = Depends(get_db),
     id: int,
     share_data: ResourceShare,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Share a resource with a user.
@@ -159,7 +254,7 @@ async def unshare_resource(
     db: AsyncSession = Depends(get_db),
     id: int,
     user_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Unshare a resource from a user.
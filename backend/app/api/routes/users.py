@@ -1,30 +1,48 @@
-from typing import Any, List
+from typing import Any, FrozenSet, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_current_admin_user
+from app.api.deps import (
+    get_current_active_user,
+    get_current_admin_user,
+    get_current_user_permissions,
+)
+from app.core.principal import UserPrincipal
 from app.db.session import get_db
-from app.models.user import User
-from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.repositories.user import user_listing_tags
+from app.schemas.user import User as UserSchema, UserCreate, UserPermissions, UserUpdate
 from app.services.user import user_service
+from app.utils.caching import make_cache_key
 from app.utils.pagination import PaginationParams, Page
+from app.utils.response_cache import cached_json_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/", response_model=Page[UserSchema])
 async def read_users(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     pagination: PaginationParams = Depends(),
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
 ) -> Any:
     """
     Retrieve users.
     
     Only admin users can access this endpoint.
     """
-    return await user_service.get_users(db=db, pagination=pagination)
+    # Only admins get here and they all see the same listing
+    return await cached_json_response(
+        request,
+        db,
+        namespace="routes.read_users",
+        key=make_cache_key((), {"pagination": pagination}),
+        model=Page[UserSchema],
+        compute=lambda session: user_service.get_users(db=session, pagination=pagination),
+        tags=lambda page: user_listing_tags({}, page),
+        soft_ttl=60,
+    )
 
 
 @router.post("/", response_model=UserSchema)
@@ -32,7 +50,7 @@ async def create_user(
     *,
     db: AsyncSession = Depends(get_db),
     user_in: UserCreate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
 ) -> Any:
     """
     Create new user.
@@ -45,7 +63,7 @@ async def create_user(
 @router.get("/me", response_model=UserSchema)
 async def read_user_me(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get current user.
@@ -53,12 +71,22 @@ async def read_user_me(
     return await user_service.get_me(db=db, current_user=current_user)
 
 
+@router.get("/me/permissions", response_model=UserPermissions)
+async def read_user_me_permissions(
+    permissions: FrozenSet[str] = Depends(get_current_user_permissions),
+) -> Any:
+    """
+    Get the permissions the current user has through their roles.
+    """
+    return {"permissions": sorted(permissions)}
+
+
 @router.put("/me", response_model=UserSchema)
 async def update_user_me(
     *,
     db: AsyncSession = Depends(get_db),
     user_in: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Update current user.
@@ -73,7 +101,7 @@ async def read_user(
     *,
     db: AsyncSession = Depends(get_db),
     user_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get user by ID.
@@ -95,7 +123,7 @@ async def update_user(
     db: AsyncSession = Depends(get_db),
     user_id: int,
     user_in: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Update a user.
@@ -113,7 +141,7 @@ async def delete_user(
     *,
     db: AsyncSession = Depends(get_db),
     user_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserPrincipal = Depends(get_current_active_user),
 ) -> Any:
     """
     Delete a user.
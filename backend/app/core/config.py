@@ -8,14 +8,63 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
+    # Development mode: the server may start without SECRET_KEY or
+    # JWT_KEYS_FILE, signing tokens with a random per-process key
+    DEBUG: bool = False
+    # Signs tokens when no JWT_KEYS_FILE is set; set it so every worker shares it
     SECRET_KEY: str = secrets.token_urlsafe(32)
+    # JWK Set of private signing keys (oct/HS*, EC/ES* or RSA/RS*, each with a
+    # "kid"). JWT_ACTIVE_KID signs new tokens (defaults to the first key); every
+    # key verifies, so keys can be rotated without invalidating tokens
+    JWT_KEYS_FILE: Optional[str] = None
+    JWT_ACTIVE_KID: Optional[str] = None
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Authenticated users are cached by access token for this long (0 disables)
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    # Cap of that TTL when the cache backend does not broadcast invalidations
+    # (memory, redis), bounding how long other workers miss user updates
+    AUTH_CACHE_UNSHARED_TTL_SECONDS: int = 5
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    # Revoked tokens are checked in memory; each worker loads new revocations
+    # every TOKEN_REVOCATION_SYNC_SECONDS and prunes expired ones every
+    # TOKEN_REVOCATION_PRUNE_SECONDS. The Bloom filter is sized for
+    # TOKEN_REVOCATION_CAPACITY tokens and grows beyond it
+    TOKEN_REVOCATION_CAPACITY: int = 100000
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 5
+    TOKEN_REVOCATION_PRUNE_SECONDS: int = 3600
+    # bcrypt runs on this many threads; calls beyond PASSWORD_HASH_MAX_PENDING
+    # (running plus queued) are rejected with 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # Sign-in attempts allowed per account and per client IP in any sliding
+    # window, checked before the user lookup and bcrypt. The "redis" backend
+    # (CACHE_REDIS_URL) shares the counts between workers
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_ATTEMPTS_PER_USERNAME: int = 10
+    LOGIN_ATTEMPTS_PER_IP: int = 50
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
     # CORS configuration
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
 
     # Database configuration
     DATABASE_URI: str = "postgresql+asyncpg://postgres:postgres@db:5432/postgres"
+    # Connection pool of each worker: DB_POOL_SIZE connections kept open plus
+    # up to DB_MAX_OVERFLOW more under load; checkouts fail after waiting
+    # DB_POOL_TIMEOUT seconds. Connections are replaced after DB_POOL_RECYCLE
+    # seconds; DB_POOL_PRE_PING tests each checkout with an extra round trip
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Prepared statements cached per asyncpg connection (0 disables)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Behind pgbouncer in transaction mode: no statement caches and unique
+    # names for server-side prepared statements
+    DB_PGBOUNCER: bool = False
 
     # Project information
     PROJECT_NAME: str = "Resource Management System"
@@ -23,6 +72,40 @@ class Settings(BaseSettings):
     # Cache configuration
     CACHE_ENABLED: bool = True
     CACHE_EXPIRE_SECONDS: int = 60 * 5  # 5 minutes
+    # Cache TTLs are randomly shortened by up to this fraction
+    CACHE_TTL_JITTER: float = 0.1
+    # Limits applied to each cached function unless overridden below
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # 16 MiB (estimated)
+    CACHE_EVICTION_POLICY: str = "lru"  # "lru" or "tinylfu"
+    # Per-function overrides keyed by qualified name, e.g.
+    # {"ResourceService.get_resources": {"max_entries": 4096, "policy": "tinylfu"}}
+    CACHE_FUNCTION_LIMITS: Dict[str, Dict[str, Any]] = {}
+    # "memory" (per process), "redis" (shared) or "tiered" (in-process L1 + shared L2
+    # with cross-worker invalidation)
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # Expired entries are swept in the background every interval, in batches
+    CACHE_SWEEP_INTERVAL_SECONDS: int = 30
+    CACHE_SWEEP_BATCH_SIZE: int = 500
+    # Cached listing responses at least this large also keep a gzip copy
+    RESPONSE_CACHE_COMPRESS_MIN_BYTES: int = 1024
+    # In-process sets of the resources shared with each user, used for permission
+    # checks and listing filters (not used with the plain "redis" backend, which
+    # does not broadcast invalidations to other workers)
+    VISIBILITY_CACHE_ENABLED: bool = True
+    VISIBILITY_CACHE_MAX_USERS: int = 10000
+    VISIBILITY_CACHE_MAX_IDS: int = 1_000_000  # 4 bytes each
+    VISIBILITY_CACHE_TTL_SECONDS: int = 300
+
+    # Search configuration
+    # In "auto" mode, searches at least this long use full-text search (PostgreSQL)
+    SEARCH_FULLTEXT_MIN_LENGTH: int = 3
+    # Answer non-full-text searches from an in-process inverted index of resource
+    # names, descriptions and metadata tags (for SQLite and small deployments)
+    SEARCH_INDEX_ENABLED: bool = False
+    # Time budget of a name suggestion lookup; slower lookups return no suggestions
+    SUGGEST_TIMEOUT_MS: int = 100
 
     model_config = {
         "case_sensitive": True,
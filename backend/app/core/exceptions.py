@@ -47,3 +47,25 @@ class ConflictError(HTTPException):
 
     def __init__(self, detail: str = "Resource conflict"):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class ServiceUnavailableError(HTTPException):
+    """Exception raised when the server is too busy to handle a request."""
+
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class TooManyRequestsError(HTTPException):
+    """Exception raised when a client exceeds a rate limit."""
+
+    def __init__(self, detail: str = "Too many requests", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.constants import ALGORITHMS
+from jose.exceptions import JWTError
+
+from app.core.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# JWS algorithms a key may sign with
+SIGNING_ALGORITHMS = ALGORITHMS.HMAC | ALGORITHMS.EC_DS | ALGORITHMS.RSA_DS
+
+# Algorithm of keys whose JWK has no "alg", by key type
+_DEFAULT_ALGORITHMS = {"oct": ALGORITHMS.HS256, "EC": ALGORITHMS.ES256, "RSA": ALGORITHMS.RS256}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """
+    Key of the key ring, parsed once into the objects used to sign and verify.
+
+    Attributes:
+        kid: Key ID, sent in the ``kid`` header of the tokens it signs
+        algorithm: JWS algorithm
+        private_key: Key object signing tokens
+        public_key: Key object verifying tokens (the same object for symmetric keys)
+        public_jwk: Public JWK, or None for symmetric keys, which must not be published
+    """
+
+    kid: str
+    algorithm: str
+    private_key: Key
+    public_key: Key
+    public_jwk: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_jwk(cls, data: Dict[str, Any]) -> "SigningKey":
+        """
+        Parse a private JWK.
+
+        Args:
+            data: JWK with a "kid", and optionally an "alg"
+
+        Returns:
+            SigningKey: Parsed key
+
+        Raises:
+            ValueError: If the JWK has no "kid" or an unsupported algorithm
+        """
+        kid = data.get("kid")
+        if not kid:
+            raise ValueError("Every key of the key ring needs a kid")
+        algorithm = data.get("alg") or _DEFAULT_ALGORITHMS.get(data.get("kty"))
+        if algorithm not in SIGNING_ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm for key {kid}: {algorithm}")
+
+        private_key = jwk.construct(data, algorithm)
+        if algorithm in ALGORITHMS.HMAC:
+            return cls(kid, algorithm, private_key, private_key, None)
+        public_key = private_key.public_key()
+        public_jwk = {**public_key.to_dict(), "kid": kid, "use": "sig"}
+        return cls(kid, algorithm, private_key, public_key, public_jwk)
+
+    @classmethod
+    def from_secret(cls, secret: str, algorithm: str = ALGORITHMS.HS256) -> "SigningKey":
+        """
+        Create a symmetric key from a shared secret.
+
+        The key ID is derived from the secret, so workers sharing the secret
+        share the key ID without revealing the secret.
+
+        Args:
+            secret: Shared secret
+            algorithm: HMAC algorithm
+
+        Returns:
+            SigningKey: Symmetric key
+        """
+        kid = hashlib.sha256(f"kid:{secret}".encode()).hexdigest()[:16]
+        key = jwk.construct(secret, algorithm)
+        return cls(kid, algorithm, key, key, None)
+
+
+class KeyRing:
+    """
+    Set of keys verifying access tokens, one of which signs new tokens.
+
+    Tokens name their key in the ``kid`` header, so verification is a dict
+    lookup of an already parsed key instead of parsing key material on
+    every request. Keys are rotated by adding the new key to every worker,
+    then making it active, then removing the old key once the tokens it
+    signed have expired.
+
+    Attributes:
+        active: Key signing new tokens
+    """
+
+    def __init__(self, keys: Iterable[SigningKey], active_kid: Optional[str] = None):
+        self._keys = {key.kid: key for key in keys}
+        if not self._keys:
+            raise ValueError("The key ring needs at least one key")
+        if active_kid is None:
+            active_kid = next(iter(self._keys))
+        if active_kid not in self._keys:
+            raise ValueError(f"Active key {active_kid} is not in the key ring")
+        self.active = self._keys[active_kid]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, kid: str) -> bool:
+        return kid in self._keys
+
+    @classmethod
+    def from_jwks(cls, jwks: Dict[str, Any], active_kid: Optional[str] = None) -> "KeyRing":
+        """
+        Create a key ring from a JWK Set of private keys.
+
+        Args:
+            jwks: JWK Set ({"keys": [...]})
+            active_kid: ID of the key signing new tokens, defaults to the first key
+
+        Returns:
+            KeyRing: Key ring
+        """
+        return cls((SigningKey.from_jwk(data) for data in jwks.get("keys", [])), active_kid)
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        """
+        Sign claims with the active key.
+
+        Args:
+            claims: Token claims
+
+        Returns:
+            str: Encoded token
+        """
+        key = self.active
+        return jwt.encode(
+            claims, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid}
+        )
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token with the key named by its ``kid`` header.
+
+        Tokens without a ``kid``, issued before key IDs were added, are
+        verified with the active key.
+
+        Args:
+            token: Encoded token
+
+        Returns:
+            Dict[str, Any]: Verified claims
+
+        Raises:
+            JWTError: If the key is unknown or the token is invalid or expired
+        """
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.active if kid is None else self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+    def jwks(self) -> Dict[str, Any]:
+        """
+        Get the public keys as a JWK Set, for other services verifying tokens.
+
+        Returns:
+            Dict[str, Any]: JWK Set of the asymmetric keys
+        """
+        return {"keys": [key.public_jwk for key in self._keys.values() if key.public_jwk]}
+
+
+def create_key_ring() -> KeyRing:
+    """
+    Create the key ring configured by ``settings.JWT_KEYS_FILE``.
+
+    Without a key file, tokens are signed with ``settings.SECRET_KEY`` (HS256).
+
+    Returns:
+        KeyRing: Key ring
+    """
+    if settings.JWT_KEYS_FILE:
+        with open(settings.JWT_KEYS_FILE) as f:
+            key_ring = KeyRing.from_jwks(json.load(f), settings.JWT_ACTIVE_KID)
+        logger.info(f"Loaded {len(key_ring)} JWT keys, signing with {key_ring.active.kid}")
+        return key_ring
+
+    if "SECRET_KEY" not in settings.model_fields_set:
+        logger.warning(
+            "SECRET_KEY is not set: tokens are signed with a random key and only "
+            "this process accepts them"
+        )
+    return KeyRing([SigningKey.from_secret(settings.SECRET_KEY)])
+
+
+def check_key_configuration() -> None:
+    """
+    Refuse to serve with a signing key that other workers do not share.
+
+    Without ``settings.SECRET_KEY`` or ``settings.JWT_KEYS_FILE`` every
+    worker signs with a random key of its own and rejects the tokens of the
+    others, so this is only allowed with ``settings.DEBUG``.
+
+    Raises:
+        RuntimeError: If no shared key is configured outside debug mode
+    """
+    if settings.JWT_KEYS_FILE or "SECRET_KEY" in settings.model_fields_set or settings.DEBUG:
+        return
+    raise RuntimeError(
+        "Set SECRET_KEY or JWT_KEYS_FILE so that every worker signs tokens with the "
+        "same key, or DEBUG=true to use a random key in a single development process"
+    )
+
+
+key_ring = create_key_ring()
@@ -0,0 +1,165 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.core.revocation import revocation_list, revoked_token_tag
+from app.models.user import User
+from app.utils.caching import (
+    get_cache,
+    get_cache_backend,
+    invalidate_tags,
+    register_key_extractor,
+)
+
+# Cache of authenticated principals keyed by access token
+principal_cache = get_cache("auth.principals", max_entries=settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    Immutable identity of an authenticated user, detached from any session.
+    
+    Attributes:
+        id: User ID
+        username: Username
+        is_active: Whether the user is active
+        is_admin: Whether the user is an admin
+    """
+    
+    id: int
+    username: str
+    is_active: bool
+    is_admin: bool
+    
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        """
+        Create the principal of a user.
+        
+        Args:
+            user: User
+            
+        Returns:
+            UserPrincipal: Principal
+        """
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+        )
+
+
+register_key_extractor(UserPrincipal, lambda p: (p.id, p.is_admin))
+
+
+def principal_tag(user_id: int) -> str:
+    """
+    Get the tag of the cached principals of a user.
+    
+    Args:
+        user_id: User ID
+        
+    Returns:
+        str: Cache tag
+    """
+    return f"principal:{user_id}"
+
+
+def get_cached_principal(token: str) -> Optional[UserPrincipal]:
+    """
+    Get the principal cached for an access token.
+    
+    The token is checked against ``revocation_list`` on every hit, so a
+    token revoked by another worker stops working once this worker has
+    loaded the revocation, whether or not the cache backend broadcasts it.
+    
+    Args:
+        token: Access token
+        
+    Returns:
+        Optional[UserPrincipal]: Principal, or None if not cached or revoked
+    """
+    if not settings.CACHE_ENABLED or settings.AUTH_CACHE_TTL_SECONDS <= 0:
+        return None
+    entry = principal_cache.get(token)
+    if entry is None:
+        return None
+    principal, jti = entry.value
+    if revocation_list.is_revoked(jti):
+        principal_cache.invalidate_tags([revoked_token_tag(jti)])
+        return None
+    principal_cache.record_hit()
+    return principal
+
+
+def cache_principal(
+    token: str,
+    principal: UserPrincipal,
+    expires_at: Optional[float],
+    duration: float,
+    jti: Optional[str] = None,
+) -> None:
+    """
+    Cache the principal of a verified access token.
+    
+    Without the tiered cache backend other workers are not told when a
+    user changes, so the TTL is capped by
+    ``settings.AUTH_CACHE_UNSHARED_TTL_SECONDS``.
+    
+    Args:
+        token: Access token
+        principal: Principal
+        expires_at: Expiry of the token (Unix time), which caps the cache TTL
+        duration: Time taken to verify the token and load the user in seconds
+        jti: Token ID, whose revocation drops the entry
+    """
+    if not settings.CACHE_ENABLED or settings.AUTH_CACHE_TTL_SECONDS <= 0:
+        return
+    principal_cache.record_miss(duration)
+    ttl = float(settings.AUTH_CACHE_TTL_SECONDS)
+    if get_cache_backend().name != "tiered":
+        ttl = min(ttl, settings.AUTH_CACHE_UNSHARED_TTL_SECONDS)
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        tags = [principal_tag(principal.id)]
+        if jti is not None:
+            tags.append(revoked_token_tag(jti))
+        principal_cache.set(token, (principal, jti), ttl, tags=tags)
+
+
+async def invalidate_principal(user_id: int) -> None:
+    """
+    Drop the cached principals of a user, in this and every other worker.
+    
+    Other workers drop theirs when they receive the broadcast tag, which
+    only the tiered cache backend sends. With the memory or redis backend
+    their entries expire within ``settings.AUTH_CACHE_UNSHARED_TTL_SECONDS``
+    instead (see ``cache_principal``).
+    
+    Args:
+        user_id: User ID
+    """
+    tag = principal_tag(user_id)
+    # The cache is in-process; the shared backend only broadcasts the tag
+    principal_cache.invalidate_tags([tag])
+    await invalidate_tags(tag)
+
+
+async def invalidate_token(jti: str) -> None:
+    """
+    Drop the cached principal of a revoked token, in this and every other worker.
+    
+    Other workers also add the token to their revocation list from the
+    broadcast tag with the tiered cache backend, and otherwise from the
+    periodic load of the revoked_tokens table.
+    
+    Args:
+        jti: Token ID
+    """
+    tag = revoked_token_tag(jti)
+    principal_cache.invalidate_tags([tag])
+    await invalidate_tags(tag)
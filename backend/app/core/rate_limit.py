@@ -0,0 +1,310 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsError
+from app.core.security import password_hasher
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Bounded in-memory set of token buckets keyed by string.
+
+    Each bucket holds up to ``capacity`` tokens and refills continuously at
+    ``capacity / window`` tokens per second. A full bucket allows a burst of
+    ``capacity`` attempts, and tokens refilled meanwhile allow more, so up to
+    about ``2 * capacity`` attempts may pass within one ``window``; the
+    sustained rate is ``capacity`` attempts per ``window``. Buckets are
+    evicted least recently used first beyond ``max_keys``; an evicted bucket
+    simply starts full again, which keeps memory bounded under key floods.
+
+    Attributes:
+        capacity: Maximum number of tokens per bucket
+        window: Seconds needed to refill an empty bucket
+        max_keys: Maximum number of buckets kept
+        evictions: Number of buckets evicted to stay within ``max_keys``
+    """
+
+    def __init__(self, capacity: int, window: float, max_keys: int):
+        self.capacity = capacity
+        self.window = window
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._rate = capacity / window
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Take a token from a bucket.
+
+        Args:
+            key: Bucket key
+            now: Current monotonic time, defaults to ``time.monotonic()``
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic() if now is None else now
+        tokens = self._refill(key, now)
+        if tokens < 1:
+            return (1 - tokens) / self._rate
+        self._store(key, tokens - 1, now)
+        return 0.0
+
+    def release(self, key: str, now: Optional[float] = None) -> None:
+        """
+        Give back a token taken by ``acquire``.
+
+        Args:
+            key: Bucket key
+            now: Current monotonic time, defaults to ``time.monotonic()``
+        """
+        now = time.monotonic() if now is None else now
+        if key in self._buckets:
+            self._store(key, min(self.capacity, self._refill(key, now) + 1), now)
+
+    def clear(self) -> None:
+        """Drop all buckets."""
+        self._buckets.clear()
+
+    def _refill(self, key: str, now: float) -> float:
+        item = self._buckets.get(key)
+        if item is None:
+            return float(self.capacity)
+        tokens, updated = item
+        return min(float(self.capacity), tokens + (now - updated) * self._rate)
+
+    def _store(self, key: str, tokens: float, now: float) -> None:
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+
+
+class LoginRateLimiter:
+    """
+    Limiter of sign-in attempts per account and per client IP.
+
+    Attempts are counted before the user lookup and the bcrypt verification,
+    so rejected attempts cost neither. A successful sign-in gives back the
+    account's token, so only failed attempts count against an account.
+
+    In memory mode every worker has its own token buckets. With a Redis
+    client, attempts are counted across workers with a sliding window
+    counter (the current fixed window plus the overlapping share of the
+    previous one); Redis errors fall back to the local buckets.
+
+    Attributes:
+        enabled: Whether attempts are limited at all
+        client: Optional ``redis.asyncio`` compatible client shared by the workers
+        prefix: Prefix of the keys written to Redis
+        allowed: Number of attempts let through
+        rejected: Number of attempts rejected, per scope
+    """
+
+    def __init__(
+        self,
+        per_username: int,
+        per_ip: int,
+        window: int,
+        max_keys: int,
+        client: Any = None,
+        enabled: bool = True,
+        prefix: str = "login-rate:",
+    ):
+        self.enabled = enabled
+        self.window = window
+        self.client = client
+        self.prefix = prefix
+        self.allowed = 0
+        self.rejected: Dict[str, int] = {"username": 0, "ip": 0}
+        self._limits = {"username": per_username, "ip": per_ip}
+        self._buckets = {
+            scope: TokenBucket(limit, window, max_keys) for scope, limit in self._limits.items()
+        }
+
+    async def hit(self, username: str, ip: Optional[str]) -> Optional[str]:
+        """
+        Count a sign-in attempt.
+
+        Args:
+            username: Username or email the attempt signs in with
+            ip: Client IP address, if known
+
+        Returns:
+            Optional[str]: Redis key the account's attempt was counted in, to
+                pass to ``succeeded``, or None if it was counted locally
+
+        Raises:
+            TooManyRequestsError: If the account or the IP is over its limit
+        """
+        if not self.enabled:
+            return None
+
+        keys = self._keys(username, ip)
+        taken = []
+        for scope, key in keys:
+            retry_after, counter = await self._acquire(scope, key)
+            if retry_after:
+                # Give back what the other scopes took for a rejected attempt
+                for taken_scope, taken_key, taken_counter in taken:
+                    await self._release(taken_scope, taken_key, taken_counter)
+                self.rejected[scope] += 1
+                logger.warning(f"Sign-in attempts rate limited by {scope} ({key})")
+                raise TooManyRequestsError(
+                    "Too many sign-in attempts, please retry later",
+                    retry_after=max(1, math.ceil(retry_after)),
+                )
+            taken.append((scope, key, counter))
+        self.allowed += 1
+        return taken[0][2]
+
+    async def succeeded(self, username: str, counter: Optional[str] = None) -> None:
+        """
+        Give back the account's token after a successful sign-in.
+
+        Args:
+            username: Username or email the attempt signed in with
+            counter: Redis key returned by ``hit`` for the attempt
+        """
+        if self.enabled:
+            await self._release("username", self._username_key(username), counter)
+
+    def reset(self) -> None:
+        """Drop the local buckets and counters."""
+        for bucket in self._buckets.values():
+            bucket.clear()
+        self.allowed = 0
+        self.rejected = {scope: 0 for scope in self.rejected}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get limiter metrics.
+
+        Rejected attempts skip a bcrypt verification each, so the CPU time
+        saved is estimated from the average verification time of the
+        password hashing pool.
+
+        Returns:
+            Dict[str, Any]: Limits, counters and estimated CPU time saved
+        """
+        rejected = sum(self.rejected.values())
+        avg_run_ms = password_hasher.stats()["avg_run_ms"]
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if self.client is not None else "memory",
+            "window_seconds": self.window,
+            "limits": dict(self._limits),
+            "tracked_keys": {scope: len(bucket) for scope, bucket in self._buckets.items()},
+            "evictions": sum(bucket.evictions for bucket in self._buckets.values()),
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+            "estimated_cpu_seconds_saved": round(rejected * avg_run_ms / 1000, 3),
+        }
+
+    def _keys(self, username: str, ip: Optional[str]) -> List[Tuple[str, str]]:
+        keys = [("username", self._username_key(username))]
+        if ip:
+            keys.append(("ip", ip))
+        return keys
+
+    @staticmethod
+    def _username_key(username: str) -> str:
+        return username.strip().lower()
+
+    async def _acquire(self, scope: str, key: str) -> Tuple[float, Optional[str]]:
+        # Returns the retry delay and the Redis key counting the attempt, if any
+        if self.client is not None:
+            try:
+                return await self._acquire_shared(scope, key)
+            except _REDIS_ERRORS as e:
+                logger.warning(f"Shared login rate limit unavailable, using local limits: {e}")
+        return self._buckets[scope].acquire(key), None
+
+    async def _release(self, scope: str, key: str, counter: Optional[str]) -> None:
+        # The attempt may have been counted in an earlier window than the
+        # current one, so the key it incremented is decremented
+        if counter is not None:
+            try:
+                await self.client.decr(counter)
+                return
+            except _REDIS_ERRORS as e:
+                logger.warning(f"Shared login rate limit unavailable, using local limits: {e}")
+        self._buckets[scope].release(key)
+
+    async def _acquire_shared(self, scope: str, key: str) -> Tuple[float, Optional[str]]:
+        now = time.time()
+        index = self._window_index(now)
+        current_key = self._window_key(scope, key, index)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.incr(current_key)
+            pipe.expire(current_key, self.window * 2)
+            pipe.get(self._window_key(scope, key, index - 1))
+            current, _, previous = await pipe.execute()
+
+        elapsed = now / self.window - index
+        count = int(current) + int(previous or 0) * (1 - elapsed)
+        if count <= self._limits[scope]:
+            return 0.0, current_key
+        await self.client.decr(current_key)
+        return (1 - elapsed) * self.window, None
+
+    def _window_index(self, now: Optional[float] = None) -> int:
+        return int((time.time() if now is None else now) // self.window)
+
+    def _window_key(self, scope: str, key: str, index: int) -> str:
+        return f"{self.prefix}{scope}:{key}:{index}"
+
+
+def _redis_errors() -> tuple:
+    # Exception types raised by redis-py, when it is installed
+    try:
+        from redis.exceptions import RedisError
+    except ImportError:
+        return (ConnectionError, OSError)
+    return (RedisError, ConnectionError, OSError)
+
+
+_REDIS_ERRORS = _redis_errors()
+
+
+def create_login_rate_limiter() -> LoginRateLimiter:
+    """
+    Create the limiter configured by the ``LOGIN_RATE_LIMIT_*`` settings.
+
+    Returns:
+        LoginRateLimiter: Limiter counting in memory or in Redis
+    """
+    client = None
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis package is required for the redis login rate limit backend"
+            ) from e
+        client = redis.from_url(settings.CACHE_REDIS_URL)
+    elif settings.LOGIN_RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown login rate limit backend: {settings.LOGIN_RATE_LIMIT_BACKEND}")
+
+    return LoginRateLimiter(
+        per_username=settings.LOGIN_ATTEMPTS_PER_USERNAME,
+        per_ip=settings.LOGIN_ATTEMPTS_PER_IP,
+        window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+        max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+        client=client,
+        enabled=settings.LOGIN_RATE_LIMIT_ENABLED,
+    )
+
+
+login_rate_limiter = create_login_rate_limiter()
@@ -0,0 +1,215 @@
+import hashlib
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Prefix of the cache tags carrying revoked token IDs between workers
+_REVOKED_TOKEN_TAG_PREFIX = "revoked-token:"
+
+
+def revoked_token_tag(jti: str) -> str:
+    """
+    Get the cache tag of a token.
+
+    Cached principals carry the tag of their token, so invalidating it drops
+    them; other workers also learn of the revocation from the broadcast tag.
+
+    Args:
+        jti: Token ID
+
+    Returns:
+        str: Cache tag
+    """
+    return f"{_REVOKED_TOKEN_TAG_PREFIX}{jti}"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Sized for ``capacity`` items at a false positive rate of ``error_rate``.
+    Bit positions are derived from one blake2b digest by double hashing.
+    Items cannot be removed; the filter is rebuilt instead.
+
+    Attributes:
+        capacity: Number of items the filter is sized for
+        error_rate: False positive rate at capacity
+        size: Number of bits
+        hash_count: Number of bits set per item
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> None:
+        """
+        Add an item.
+
+        Args:
+            item: Item
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+
+class RevocationList:
+    """
+    In-memory set of revoked token IDs with a Bloom filter fast path.
+
+    Almost every checked token is not revoked, and the Bloom filter answers
+    those without touching the exact map; only filter hits (revoked tokens
+    and rare false positives) are confirmed against it. The list mirrors the
+    revoked_tokens table: rows are loaded incrementally by increasing ID,
+    revocations from this or another worker are added directly, and entries
+    are pruned once their token has expired, which also rebuilds the filter.
+
+    Attributes:
+        last_id: Highest revoked_tokens row ID loaded
+        checks: Number of tokens checked
+        filter_hits: Number of checks that had to consult the exact map
+        false_positives: Number of filter hits for tokens that are not revoked
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.error_rate = error_rate
+        self.last_id = 0
+        self.checks = 0
+        self.filter_hits = 0
+        self.false_positives = 0
+        self._revoked: Dict[str, float] = {}
+        self._filter = BloomFilter(capacity, error_rate)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Check whether a token is revoked.
+
+        Args:
+            jti: Token ID, or None for tokens issued without one
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        self.checks += 1
+        if jti is None or jti not in self._filter:
+            return False
+        self.filter_hits += 1
+        if jti in self._revoked:
+            return True
+        self.false_positives += 1
+        return False
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """
+        Record a revoked token.
+
+        Args:
+            jti: Token ID
+            expires_at: Expiry of the token (Unix time)
+        """
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = expires_at
+        if len(self._revoked) > self._filter.capacity:
+            # Keep the false positive rate by growing the filter
+            self._rebuild(len(self._revoked) * 2)
+        else:
+            self._filter.add(jti)
+
+    def load(self, rows: Iterable[Tuple[int, str, float]]) -> int:
+        """
+        Record revoked tokens loaded from the database.
+
+        Args:
+            rows: Row ID, token ID and expiry (Unix time) of each revoked token
+
+        Returns:
+            int: Number of rows loaded
+        """
+        count = 0
+        for row_id, jti, expires_at in rows:
+            self.add(jti, expires_at)
+            self.last_id = max(self.last_id, row_id)
+            count += 1
+        return count
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Drop the tokens that have expired and rebuild the filter without them.
+
+        Args:
+            now: Current Unix time, defaults to ``time.time()``
+
+        Returns:
+            int: Number of tokens dropped
+        """
+        now = time.time() if now is None else now
+        expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        if expired:
+            self._rebuild(self._filter.capacity)
+        return len(expired)
+
+    def handle_invalidation(self, tags: Optional[List[str]]) -> None:
+        """
+        Record the tokens another worker revoked, from its broadcast cache tags.
+
+        The broadcast carries no expiry, so the longest token lifetime is
+        assumed until the periodic load replaces it with the stored one.
+
+        Args:
+            tags: Invalidated tags, or None if the whole cache was cleared
+        """
+        if not tags:
+            return
+        expires_at = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        for tag in tags:
+            if tag.startswith(_REVOKED_TOKEN_TAG_PREFIX):
+                self.add(tag[len(_REVOKED_TOKEN_TAG_PREFIX):], expires_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get revocation list metrics.
+
+        Returns:
+            Dict[str, Any]: Size, filter dimensions and check counters
+        """
+        return {
+            "revoked": len(self._revoked),
+            "last_id": self.last_id,
+            "filter_bits": self._filter.size,
+            "filter_hashes": self._filter.hash_count,
+            "filter_capacity": self._filter.capacity,
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+        }
+
+    def _rebuild(self, capacity: int) -> None:
+        bloom = BloomFilter(max(capacity, settings.TOKEN_REVOCATION_CAPACITY), self.error_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._filter = bloom
+
+
+# Revoked tokens of this worker
+revocation_list = RevocationList(settings.TOKEN_REVOCATION_CAPACITY)
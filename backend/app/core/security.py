@@ -1,15 +1,23 @@
+import asyncio
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
-from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core.keys import key_ring
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configure logging
+logger = logging.getLogger(__name__)
 
-ALGORITHM = "HS256"
+T = TypeVar("T")
 
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
@@ -23,7 +31,8 @@ def create_access_token(
                       expiration time from settings will be used.
     
     Returns:
-        str: The encoded JWT token.
+        str: The encoded JWT token, signed with the active key of ``key_ring``
+             and with a unique ``jti`` claim so it can be revoked.
     """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -31,9 +40,8 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex}
+    return key_ring.sign(to_encode)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -61,3 +69,160 @@ def get_password_hash(password: str) -> str:
         str: The hashed password.
     """
     return pwd_context.hash(password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a bounded thread pool.
+    
+    bcrypt releases the GIL while it works, so the pool's threads hash in
+    parallel while the event loop keeps serving other requests. Calls beyond
+    ``max_pending`` (running plus queued) are rejected straight away with
+    ``ServiceUnavailableError`` instead of queueing without bound.
+    
+    Attributes:
+        workers: Number of threads
+        max_pending: Maximum number of calls running or queued
+        completed: Number of completed calls
+        rejected: Number of calls rejected because the pool was saturated
+        peak_pending: Highest number of calls running or queued at once
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.completed = 0
+        self.rejected = 0
+        self.peak_pending = 0
+        self._pending = 0
+        self._queue_seconds = 0.0
+        self._run_seconds = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password.
+        
+        Args:
+            password: The plain-text password to hash.
+        
+        Returns:
+            str: The hashed password.
+        
+        Raises:
+            ServiceUnavailableError: If too many calls are pending
+        """
+        return await self._run(pwd_context.hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a hash.
+        
+        Args:
+            plain_password: The plain-text password.
+            hashed_password: The hashed password.
+        
+        Returns:
+            bool: True if the password matches the hash, False otherwise.
+        
+        Raises:
+            ServiceUnavailableError: If too many calls are pending
+        """
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool metrics.
+        
+        Returns:
+            Dict[str, Any]: Pool size, queue depth and timings
+        """
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_ms": round(self._queue_seconds / completed * 1000, 3),
+            "avg_run_ms": round(self._run_seconds / completed * 1000, 3),
+        }
+    
+    def shutdown(self) -> None:
+        """Stop the threads once the calls in progress finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(f"Password hashing pool saturated ({self._pending} pending)")
+            raise ServiceUnavailableError("Too many concurrent sign-ins, please retry")
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hasher"
+            )
+        
+        submitted = time.perf_counter()
+        timings = {}
+        
+        def call() -> T:
+            started = time.perf_counter()
+            timings["queue"] = started - submitted
+            try:
+                return func(*args)
+            finally:
+                timings["run"] = time.perf_counter() - started
+        
+        self._pending += 1
+        self.peak_pending = max(self.peak_pending, self._pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            self._pending -= 1
+            self.completed += 1
+            self._queue_seconds += timings.get("queue", 0.0)
+            self._run_seconds += timings.get("run", 0.0)
+
+
+# Shared pool for the password APIs of every request
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash without blocking the event loop.
+    
+    Args:
+        plain_password: The plain-text password.
+        hashed_password: The hashed password.
+    
+    Returns:
+        bool: True if the password matches the hash, False otherwise.
+    
+    Raises:
+        ServiceUnavailableError: If the password hashing pool is saturated
+    """
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop.
+    
+    Args:
+        password: The plain-text password to hash.
+    
+    Returns:
+        str: The hashed password.
+    
+    Raises:
+        ServiceUnavailableError: If the password hashing pool is saturated
+    """
+    return await password_hasher.hash(password)
@@ -1,16 +1,121 @@
-from typing import AsyncGenerator
+import threading
+import time
+import uuid
+from typing import Any, AsyncGenerator, Dict
 
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool recording how long checkouts take.
+
+    A checkout's time includes waiting for a free connection, opening a new
+    one and the pre-ping round trip, so it is what a request pays before its
+    first query.
+
+    Attributes:
+        checkouts: Number of successful checkouts
+        timeouts: Number of checkouts that gave up after the pool timeout
+        peak_checked_out: Highest number of connections checked out at once
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def connect(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.checkouts += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool metrics.
+
+        Returns:
+            Dict[str, Any]: Pool size, connections in use and checkout times
+        """
+        checkouts = self.checkouts or 1
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self._timeout,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            # SQLAlchemy counts overflow from -size while the pool fills up
+            "overflow": max(0, self.overflow()),
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self._wait_seconds / checkouts * 1000, 3),
+            "max_wait_ms": round(self._max_wait_seconds * 1000, 3),
+        }
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Get the ``create_async_engine`` options configured by the ``DB_*`` settings.
+
+    Args:
+        url: Database URL
+
+    Returns:
+        Dict[str, Any]: Engine keyword arguments
+    """
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        if settings.DB_PGBOUNCER:
+            # pgbouncer in transaction mode may run each statement on a different
+            # server connection, so nothing prepared on one can be reused and
+            # prepared statement names must never collide
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            }
+    return options
+
+
 # Create async engine for PostgreSQL
 engine = create_async_engine(
     str(settings.DATABASE_URI),
     echo=False,
     future=True,
-    pool_pre_ping=True,
+    **engine_options(str(settings.DATABASE_URI)),
 )
 
 # Create async session factory
@@ -19,6 +124,16 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get the metrics of the engine's connection pool.
+
+    Returns:
+        Dict[str, Any]: Pool metrics
+    """
+    return engine.pool.stats()
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting async database session.
@@ -1,15 +1,68 @@
+import asyncio
+import contextlib
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
-from app.api.routes import auth, users, resources, cache
+from app.api.routes import auth, users, resources, cache, metrics
 from app.core.config import settings
-from app.core.middleware import CacheCleanupMiddleware
+from app.core.keys import check_key_configuration
+from app.core.security import password_hasher
 from app.db.seed import seed_db
+from app.db.session import AsyncSessionLocal
+from app.repositories.resource import resource_repository
+from app.repositories.token import revoked_token_repository
+from app.services.auth import run_revocation_sync
+from app.utils.caching import get_cache_backend, run_cache_sweeper
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize the application on startup and release resources on shutdown.
+    """
+    logger.info("Starting up application")
+    
+    # Every worker must sign and verify tokens with the same keys
+    check_key_configuration()
+    
+    # Seed the database with initial data
+    # Use force=False to avoid cleaning the database before seeding
+    await seed_db(force=False)
+    
+    # Build the in-process search index before serving searches from it
+    if settings.SEARCH_INDEX_ENABLED:
+        async with AsyncSessionLocal() as db:
+            await resource_repository.build_search_index(db)
+    
+    # Load the revoked tokens before accepting any
+    async with AsyncSessionLocal() as db:
+        await revoked_token_repository.load_revocations(db)
+    
+    # Start listening for cache invalidations from other workers
+    await get_cache_backend().start()
+    
+    # Remove expired cache entries in the background, off the request path
+    sweeper = asyncio.create_task(run_cache_sweeper())
+    
+    # Keep up with revocations from other workers and prune expired ones
+    revocation_sync = asyncio.create_task(run_revocation_sync())
+    
+    yield
+    
+    logger.info("Shutting down application")
+    for task in (sweeper, revocation_sync):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await get_cache_backend().stop()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="Resource Management System API",
@@ -17,6 +70,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     # Disable automatic redirection of trailing slashes to avoid authentication issues
     redirect_slashes=False,
+    lifespan=lifespan,
 )
 
 # Set up middlewares
@@ -28,29 +82,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add cache cleanup middleware
-app.add_middleware(
-    CacheCleanupMiddleware,
-    cleanup_interval=settings.CACHE_EXPIRE_SECONDS // 2,  # Clean up at half the cache expiration time
-)
-
 # Include API routes
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(users.router, prefix=settings.API_V1_STR)
 app.include_router(resources.router, prefix=settings.API_V1_STR)
 app.include_router(cache.router, prefix=settings.API_V1_STR)
-
-
-@app.on_event("startup")
-async def startup_event():
-    """
-    Initialize application on startup.
-    """
-    logger.info("Starting up application")
-    
-    # Seed the database with initial data
-    # Use force=False to avoid cleaning the database before seeding
-    await seed_db(force=False)
+app.include_router(metrics.router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
@@ -1,6 +1,7 @@
 from app.models.user import User
 from app.models.role import Role, Permission
 from app.models.resource import Resource
+from app.models.token import RevokedToken
 
 # For Alembic to detect all models
-__all__ = ["User", "Role", "Permission", "Resource"]
+__all__ = ["User", "Role", "Permission", "Resource", "RevokedToken"]
@@ -1,7 +1,7 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, Table, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import attribute_keyed_dict, relationship
 
 from app.db.base import Base
 
@@ -18,6 +18,51 @@ resource_permission = Table(
     Index("ix_resource_permission_user_id", "user_id"),
 )
 
+# Permission bits; each permission type implies the weaker ones
+PERMISSION_READ = 1
+PERMISSION_WRITE = 2
+PERMISSION_ADMIN = 4
+
+# Bit of each permission type
+PERMISSION_BITS: Dict[str, int] = {
+    "read": PERMISSION_READ,
+    "write": PERMISSION_WRITE,
+    "admin": PERMISSION_ADMIN,
+}
+
+# Bits granted by each permission type
+PERMISSION_MASKS: Dict[str, int] = {
+    "read": PERMISSION_READ,
+    "write": PERMISSION_READ | PERMISSION_WRITE,
+    "admin": PERMISSION_READ | PERMISSION_WRITE | PERMISSION_ADMIN,
+}
+
+
+class ResourcePermission:
+    """
+    Permission granted on a resource to a user (a row of ``resource_permission``).
+    
+    Mapped imperatively onto the association table, which has none of the
+    common columns of ``Base``.
+    
+    Attributes:
+        resource_id: ID of the shared resource
+        user_id: ID of the user the resource is shared with
+        permission_type: Permission type ("read", "write" or "admin")
+    """
+    
+    resource_id: int
+    user_id: int
+    permission_type: str
+    
+    @property
+    def mask(self) -> int:
+        """Permission bits granted (0 for unknown permission types)."""
+        return PERMISSION_MASKS.get(self.permission_type, 0)
+
+
+Base.registry.map_imperatively(ResourcePermission, resource_permission)
+
 
 class Resource(Base):
     """
@@ -33,6 +78,7 @@ class Resource(Base):
         owner_id: ID of the user who owns the resource
         owner: User who owns the resource (many-to-one relationship)
         shared_with: Users with whom the resource is shared (many-to-many relationship)
+        permissions: Permissions granted on the resource, keyed by user ID
     """
     
     id = Column(Integer, primary_key=True, index=True)
@@ -52,15 +98,26 @@ class Resource(Base):
         secondary=resource_permission,
         primaryjoin="Resource.id == resource_permission.c.resource_id",
         secondaryjoin="User.id == resource_permission.c.user_id",
+        # Shares are written through resource_permission statements
+        viewonly=True,
+    )
+    permissions = relationship(
+        ResourcePermission,
+        collection_class=attribute_keyed_dict("user_id"),
+        viewonly=True,
     )
     
     def has_permission(self, user_id: int, permission_type: str) -> bool:
         """
         Check if a user has a specific permission for this resource.
         
+        Requires ``permissions`` to be loaded (``ResourceRepository.get``
+        loads it). Write and admin permissions imply read, and admin implies
+        write.
+        
         Args:
             user_id: ID of the user
-            permission_type: Type of permission to check
+            permission_type: Type of permission to check ("read", "write" or "admin")
             
         Returns:
             bool: True if the user has the permission, False otherwise
@@ -73,10 +130,9 @@ class Resource(Base):
         if self.is_public and permission_type == "read":
             return True
         
-        # Check if the user has the specific permission
-        for user in self.shared_with:
-            if user.id == user_id:
-                # This is a simplification; in a real system, we would check the permission_type
-                return True
-        
-        return False
+        # Check the permission granted to the user, if any
+        permission = self.permissions.get(user_id)
+        if permission is None:
+            return False
+        required = PERMISSION_MASKS.get(permission_type, PERMISSION_ADMIN)
+        return permission.mask & required == required
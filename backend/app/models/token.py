@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.db.base import Base
+
+
+class RevokedToken(Base):
+    """
+    Revoked access token, kept until the token expires.
+    
+    Attributes:
+        id: Unique identifier, increasing so workers can load new rows incrementally
+        jti: Unique ID of the revoked token (unique)
+        user_id: ID of the user the token was issued to
+        expires_at: Expiry of the token, after which the row can be pruned
+    """
+    
+    __tablename__ = "revoked_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String, unique=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)
@@ -1,5 +1,7 @@
 from app.repositories.user import user_repository
 from app.repositories.resource import resource_repository
+from app.repositories.role import role_repository
+from app.repositories.token import revoked_token_repository
 
 # For easy imports
-__all__ = ["user_repository", "resource_repository"]
+__all__ = ["user_repository", "resource_repository", "role_repository", "revoked_token_repository"]
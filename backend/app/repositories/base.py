@@ -2,7 +2,7 @@ from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import Base
@@ -146,3 +146,33 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         query = select(func.count()).select_from(self.model)
         result = await db.execute(query)
         return result.scalar_one()
+
+    async def estimate_count(self, db: AsyncSession) -> Optional[int]:
+        """
+        Estimate the number of records from planner statistics.
+        
+        The table's ``pg_class.reltuples`` is read, so the cost does not grow
+        with the table. Filtered counts are not estimated: the planner's row
+        estimates for arbitrary conditions can be off by orders of magnitude.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Optional[int]: Estimated number of records, or None if the database
+            does not provide estimates (anything but PostgreSQL) or the table
+            was never analyzed
+        """
+        connection = await db.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+        
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": self.model.__tablename__},
+        )
+        estimate = result.scalar()
+        # Tables that were never analyzed report -1
+        if estimate is not None and estimate >= 0:
+            return estimate
+        return None
@@ -1,13 +1,512 @@
-from typing import List, Optional, Dict, Any, Union
+import json
+import logging
+from array import array
+from datetime import datetime
+from typing import Iterable, List, Optional, Dict, Any, Set, Tuple, Union
 
-from sqlalchemy import select, and_, or_, func
+from fastapi import HTTPException, status
+from sqlalchemy import Boolean, DateTime, Integer, String, bindparam, select, and_, or_, func, false, literal, literal_column, text, tuple_
+from sqlalchemy.sql import ColumnElement, Select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import aliased, selectinload
 
-from app.models.resource import Resource, resource_permission
+from app.core.config import settings
+from app.models.resource import (
+    PERMISSION_MASKS,
+    PERMISSION_READ,
+    Resource,
+    resource_permission,
+)
 from app.repositories.base import BaseRepository
 from app.schemas.resource import ResourceCreate, ResourceUpdate
-from app.utils.caching import cached, invalidate_cache
+from app.utils.caching import (
+    ALL_RESOURCES_TAG,
+    add_remote_invalidation_listener,
+    cached,
+    get_cache_backend,
+    invalidate_tags,
+    resource_tag,
+    user_tag,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.search_index import InvertedIndex
+from app.utils.visibility import VisibilityIndex
+
+logger = logging.getLogger(__name__)
+
+# In-process index of resource names, descriptions and metadata tags, used
+# for searches instead of substring matching when SEARCH_INDEX_ENABLED is set
+resource_search_index = InvertedIndex()
+
+# IDs of the resources shared with each user, so permission checks and
+# listings need no lookup in resource_permission
+resource_visibility = VisibilityIndex(
+    max_users=settings.VISIBILITY_CACHE_MAX_USERS,
+    max_ids=settings.VISIBILITY_CACHE_MAX_IDS,
+    ttl=settings.VISIBILITY_CACHE_TTL_SECONDS,
+)
+add_remote_invalidation_listener(resource_visibility.handle_invalidation)
+
+# Users with more shared resources than this are filtered with a subquery
+# instead of an inline list of IDs
+_MAX_INLINE_SHARED_IDS = 1000
+
+# Searches matching more indexed resources than this bind their IDs as one
+# array parameter instead of an inline list
+_MAX_INLINE_SEARCH_IDS = 1000
+
+# IDs of the resources other workers wrote since the last search, re-read
+# into resource_search_index before the next one
+_stale_search_ids: Set[int] = set()
+
+_RESOURCE_TAG_PREFIX = resource_tag("")
+
+# Search modes: full-text search for longer terms ("auto"), or always
+# substring matching or full-text search
+SEARCH_AUTO = "auto"
+SEARCH_SUBSTRING = "substring"
+SEARCH_FULLTEXT = "fulltext"
+
+# Sorts full-text matches by rank
+SORT_RELEVANCE = "relevance"
+
+# Weighted tsvector generated by the resource full-text search migration;
+# it is not mapped on the model because it only exists on PostgreSQL
+SEARCH_VECTOR = literal_column("resources.search_vector")
+_SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+# Whether the search_vector column exists, checked once per process
+_search_vector_exists: Optional[bool] = None
+
+# Columns resources can be sorted by, with the value NULLs sort as so that
+# (column, id) is a total order usable by keyset pagination
+SORTABLE_COLUMNS: Dict[str, Any] = {
+    "id": None,
+    "name": None,
+    "owner_id": None,
+    "is_public": False,
+    "description": "",
+    "content": "",
+    "meta_data": "",
+    "created_at": None,
+    "updated_at": None,
+}
+
+
+def _sort_expression(sort_by: Optional[str], entity: Any = Resource) -> Optional[ColumnElement]:
+    """
+    Get the SQL expression a listing is sorted by, before the ``id`` tie-breaker.
+    
+    Args:
+        sort_by: Requested sort field
+        entity: Resource entity (the model or an alias of it)
+        
+    Returns:
+        Optional[ColumnElement]: Sort expression, or None to sort by ``id`` only
+    """
+    if sort_by not in SORTABLE_COLUMNS or sort_by == "id":
+        return None
+    column = getattr(entity, sort_by)
+    null_value = SORTABLE_COLUMNS[sort_by]
+    if null_value is None:
+        return column
+    return func.coalesce(column, false() if null_value is False else literal(null_value))
+
+
+def _apply_sorting(
+    query: Select,
+    sort_by: Optional[str],
+    sort_order: Optional[str],
+    cursor: Optional[str] = None,
+    entity: Any = Resource,
+    tsquery: Optional[ColumnElement] = None,
+) -> Select:
+    """
+    Order a listing by the sort field and ``id``, and seek past a cursor.
+    
+    Args:
+        query: Listing query
+        sort_by: Optional field to sort by (see ``SORTABLE_COLUMNS``), or
+            ``SORT_RELEVANCE`` to rank full-text matches
+        sort_order: Optional sort order (asc or desc)
+        cursor: Optional cursor created by ``resource_cursor``
+        entity: Resource entity the query selects (the model or an alias of it)
+        tsquery: Optional full-text query the listing is filtered by
+        
+    Returns:
+        Select: Ordered query
+        
+    Raises:
+        HTTPException: If the cursor does not match the sort field
+    """
+    if sort_by == SORT_RELEVANCE and tsquery is not None:
+        # Ranks are floats, so relevance pages are only reachable by offset
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not available when sorting by relevance",
+            )
+        return query.order_by(func.ts_rank(SEARCH_VECTOR, tsquery).desc(), entity.id.asc())
+    
+    expression = _sort_expression(sort_by, entity)
+    descending = bool(sort_order) and sort_order.lower() == "desc"
+    keys = [entity.id] if expression is None else [expression, entity.id]
+    
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys) + 1 or values[0] != (sort_by if expression is not None else "id"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested sorting",
+            )
+        if expression is not None and isinstance(expression.type, DateTime):
+            # Timestamps travel as ISO 8601 strings in the cursor
+            try:
+                values[1] = datetime.fromisoformat(values[1])
+            except (TypeError, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor",
+                )
+        position = tuple_(*keys) if len(keys) > 1 else keys[0]
+        last = tuple_(*values[1:]) if len(keys) > 1 else values[1]
+        query = query.where(position < last if descending else position > last)
+    
+    return query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+
+
+async def _has_search_vector(db: AsyncSession) -> bool:
+    """
+    Check whether the ``search_vector`` column has been created by migration 0002.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        bool: True if full-text search is available
+    """
+    global _search_vector_exists
+    if _search_vector_exists is None:
+        result = await db.execute(
+            text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_schema = current_schema() "
+                "AND table_name = 'resources' AND column_name = 'search_vector'"
+            )
+        )
+        _search_vector_exists = result.scalar() is not None
+        if not _search_vector_exists:
+            logger.warning("resources.search_vector is missing, full-text search falls back to substring matching")
+    return _search_vector_exists
+
+
+async def _search_query(
+    db: AsyncSession, search: Optional[str], search_mode: Optional[str]
+) -> Optional[ColumnElement]:
+    """
+    Get the full-text query for a search, if full-text search applies.
+    
+    In "auto" mode searches of at least ``settings.SEARCH_FULLTEXT_MIN_LENGTH``
+    characters use full-text search and shorter ones substring matching.
+    Full-text search needs the ``search_vector`` column, which only exists
+    on PostgreSQL once migration 0002 has run; elsewhere substring matching
+    is always used.
+    
+    Resources written by other workers are first re-read into the search
+    index, so index searches see them too.
+    
+    Args:
+        db: Database session
+        search: Optional search term
+        search_mode: Optional search mode ("auto", "substring" or "fulltext")
+        
+    Returns:
+        Optional[ColumnElement]: The tsquery, or None for substring matching
+    """
+    if search:
+        await _refresh_search_index(db)
+    if not search or search_mode == SEARCH_SUBSTRING:
+        return None
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    if search_mode != SEARCH_FULLTEXT and len(search.strip()) < settings.SEARCH_FULLTEXT_MIN_LENGTH:
+        return None
+    if not await _has_search_vector(db):
+        return None
+    return func.websearch_to_tsquery(_SEARCH_CONFIG, search)
+
+
+def _prefix_pattern(prefix: str) -> str:
+    """
+    Build a LIKE pattern matching values that start with a prefix.
+    
+    Args:
+        prefix: Prefix (LIKE wildcards in it are matched literally)
+        
+    Returns:
+        str: Pattern, to be used with ``escape="\\"``
+    """
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def resource_search_texts(resource: Resource) -> List[Optional[str]]:
+    """
+    Get the texts of a resource indexed by ``resource_search_index``.
+    
+    Args:
+        resource: Resource
+        
+    Returns:
+        List[Optional[str]]: Name, description and metadata tags
+    """
+    texts = [resource.name, resource.description]
+    if resource.meta_data:
+        try:
+            tags = json.loads(resource.meta_data).get("tags")
+        except (ValueError, AttributeError):
+            tags = None
+        if isinstance(tags, list):
+            texts.extend(tag for tag in tags if isinstance(tag, str))
+    return texts
+
+
+def _search_index_active() -> bool:
+    """Whether searches are answered by ``resource_search_index``."""
+    return settings.SEARCH_INDEX_ENABLED and resource_search_index.ready
+
+
+def _handle_search_invalidation(tags: Optional[List[str]]) -> None:
+    """
+    Mark the resources another worker wrote as stale in the search index.
+    
+    Writes invalidate the tags of the resources they change, so every
+    worker learns which entries of its index to re-read. Clearing the whole
+    cache writes no resource, so it leaves the index alone.
+    
+    Args:
+        tags: Invalidated tags, or None if the whole cache was cleared
+    """
+    if not tags or not settings.SEARCH_INDEX_ENABLED:
+        return
+    for tag in tags:
+        if tag.startswith(_RESOURCE_TAG_PREFIX):
+            try:
+                _stale_search_ids.add(int(tag[len(_RESOURCE_TAG_PREFIX):]))
+            except ValueError:
+                continue
+
+
+add_remote_invalidation_listener(_handle_search_invalidation)
+
+
+async def _refresh_search_index(db: AsyncSession) -> None:
+    """
+    Re-read the resources marked stale by other workers into the search index.
+    
+    Args:
+        db: Database session
+    """
+    if not _stale_search_ids or not _search_index_active():
+        return
+    ids = list(_stale_search_ids)
+    _stale_search_ids.clear()
+    result = await db.execute(
+        select(Resource.id, Resource.name, Resource.description, Resource.meta_data)
+        .where(Resource.id.in_(ids))
+    )
+    found = set()
+    for row in result:
+        resource_search_index.add(row.id, resource_search_texts(row))
+        found.add(row.id)
+    for resource_id in ids:
+        if resource_id not in found:
+            resource_search_index.remove(resource_id)
+
+
+class _InIdArray(ColumnElement):
+    """
+    ``column IN (ids)`` with the IDs bound as a single parameter.
+    
+    The statement stays the same size however many IDs there are: an
+    integer array on PostgreSQL, a JSON array elsewhere.
+    """
+    
+    type = Boolean()
+    inherit_cache = False
+    
+    def __init__(self, column: ColumnElement, ids: List[int]):
+        self.column = column
+        self.ids = ids
+
+
+@compiles(_InIdArray)
+def _compile_in_id_array(element: _InIdArray, compiler: Any, **kw: Any) -> str:
+    column = compiler.process(element.column, **kw)
+    ids = compiler.process(bindparam(None, json.dumps(element.ids), type_=String), **kw)
+    return f"({column} IN (SELECT value FROM json_each({ids})))"
+
+
+@compiles(_InIdArray, "postgresql")
+def _compile_in_id_array_postgresql(element: _InIdArray, compiler: Any, **kw: Any) -> str:
+    column = compiler.process(element.column, **kw)
+    ids = compiler.process(bindparam(None, element.ids, type_=ARRAY(Integer)), **kw)
+    return f"({column} = ANY({ids}))"
+
+
+def _index_search_condition(search: str) -> Optional[ColumnElement]:
+    """
+    Build the condition matching a search against ``resource_search_index``.
+    
+    Up to ``_MAX_INLINE_SEARCH_IDS`` matching IDs are inlined; more are bound
+    as one array parameter, so the index answers every search the same way.
+    
+    Args:
+        search: Search term
+        
+    Returns:
+        Optional[ColumnElement]: Condition, or None if the index is not used
+    """
+    if not _search_index_active():
+        return None
+    ids = resource_search_index.search(search).tolist()
+    if len(ids) > _MAX_INLINE_SEARCH_IDS:
+        return _InIdArray(Resource.id, ids)
+    return Resource.id.in_(ids)
+
+
+def _visibility_enabled() -> bool:
+    """Whether ``resource_visibility`` answers shared-resource lookups."""
+    # Plain Redis caching has no invalidation broadcasts to keep it coherent
+    return settings.VISIBILITY_CACHE_ENABLED and get_cache_backend().name != "redis"
+
+
+def _filter_conditions(
+    owner_id: Optional[int],
+    is_public: Optional[bool],
+    search: Optional[str],
+    tsquery: Optional[ColumnElement] = None,
+) -> List[ColumnElement]:
+    """
+    Build the conditions of a filtered resource listing.
+    
+    Args:
+        owner_id: Optional owner ID filter
+        is_public: Optional public status filter
+        search: Optional search term, matched as a substring of the name or
+            description, or against ``resource_search_index`` when enabled
+        tsquery: Optional full-text query replacing substring matching of the search term
+        
+    Returns:
+        List[ColumnElement]: Conditions (empty when nothing is filtered)
+    """
+    filters = []
+    if owner_id is not None:
+        filters.append(Resource.owner_id == owner_id)
+    if is_public is not None:
+        filters.append(Resource.is_public == is_public)
+    index_condition = _index_search_condition(search) if search and tsquery is None else None
+    if tsquery is not None:
+        filters.append(SEARCH_VECTOR.op("@@")(tsquery))
+    elif index_condition is not None:
+        # All terms must match, each as a prefix of an indexed word
+        filters.append(index_condition)
+    elif search:
+        filters.append(
+            or_(
+                Resource.name.ilike(f"%{search}%"),
+                Resource.description.ilike(f"%{search}%")
+            )
+        )
+    return filters
+
+
+def _user_conditions(
+    user_id: int,
+    is_public: Optional[bool],
+    search: Optional[str],
+    tsquery: Optional[ColumnElement] = None,
+    shared_ids: Optional[List[int]] = None,
+) -> List[ColumnElement]:
+    """
+    Build the conditions of a listing of resources owned by or shared with a user.
+    
+    Args:
+        user_id: User ID
+        is_public: Optional public status filter
+        search: Optional search term
+        tsquery: Optional full-text query replacing substring matching of the search term
+        shared_ids: Optional IDs of the resources shared with the user, looked
+            up in resource_permission when omitted
+        
+    Returns:
+        List[ColumnElement]: Conditions
+    """
+    # Base condition: resources owned by or shared with the user
+    if shared_ids is None:
+        shared = Resource.id.in_(
+            select(resource_permission.c.resource_id)
+            .where(resource_permission.c.user_id == user_id)
+        )
+        base_condition = or_(Resource.owner_id == user_id, shared)
+    elif shared_ids:
+        base_condition = or_(Resource.owner_id == user_id, Resource.id.in_(shared_ids))
+    else:
+        base_condition = Resource.owner_id == user_id
+    return [base_condition, *_filter_conditions(None, is_public, search, tsquery)]
+
+
+def resource_cursor(resource: Resource, sort_by: Optional[str]) -> str:
+    """
+    Create the cursor of the page following a resource.
+    
+    Args:
+        resource: Last resource of a page
+        sort_by: Field the page is sorted by
+        
+    Returns:
+        str: Cursor
+    """
+    if _sort_expression(sort_by) is None:
+        return encode_cursor(["id", resource.id])
+    value = getattr(resource, sort_by)
+    if value is None:
+        value = SORTABLE_COLUMNS[sort_by]
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return encode_cursor([sort_by, value, resource.id])
+
+
+def resource_listing_tags(kwargs: Dict[str, Any], result: Any) -> List[str]:
+    """
+    Get the cache tags for a resource listing or count.
+    
+    Listings scoped to a user (by visibility or ownership) are tagged with
+    that user, unscoped ones with ``ALL_RESOURCES_TAG``. Every resource in
+    the result is tagged as well.
+    
+    Args:
+        kwargs: Keyword arguments of the cached call
+        result: Result of the cached call
+        
+    Returns:
+        List[str]: Cache tags
+    """
+    user_id = kwargs.get("user_id", kwargs.get("owner_id"))
+    current_user = kwargs.get("current_user")
+    if current_user is not None and not current_user.is_admin:
+        user_id = current_user.id
+    
+    tags = [ALL_RESOURCES_TAG if user_id is None else user_tag(user_id)]
+    items = getattr(result, "items", result)
+    if isinstance(items, tuple):
+        # (resources, total) pairs returned by get_page_with_total
+        items = items[0]
+    if isinstance(items, list):
+        tags.extend(resource_tag(item.id) for item in items)
+    return tags
 
 
 class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate]):
@@ -26,16 +525,232 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         Returns:
             Optional[Resource]: The resource if found, None otherwise
         """
-        # Override the base get method to eagerly load the shared_with relationship
+        # Override the base get method to eagerly load the permissions, which
+        # authorization needs (as (user_id, permission_type) rows, not users)
         query = (
             select(Resource)
-            .options(joinedload(Resource.shared_with))
+            .options(selectinload(Resource.permissions))
             .where(Resource.id == id)
+            # Refresh a resource already in the session, whose permissions may have changed
+            .execution_options(populate_existing=True)
         )
         result = await db.execute(query)
         return result.scalars().first()
     
-    @cached()
+    async def get_shared_ids(self, db: AsyncSession, *, user_id: int) -> array:
+        """
+        Get the IDs of the resources shared with a user.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            
+        Returns:
+            array: Sorted resource IDs (read-only)
+        """
+        use_index = _visibility_enabled()
+        if use_index:
+            ids = resource_visibility.get(user_id)
+            if ids is not None:
+                return ids
+        
+        epoch = resource_visibility.epoch
+        result = await db.execute(
+            select(resource_permission.c.resource_id)
+            .where(resource_permission.c.user_id == user_id)
+            .order_by(resource_permission.c.resource_id)
+        )
+        ids = array("I", result.scalars().all())
+        if use_index:
+            resource_visibility.put(user_id, ids, epoch)
+        return ids
+    
+    async def get_permission_masks(
+        self, db: AsyncSession, *, resource_ids: Iterable[int], user_id: int
+    ) -> Dict[int, int]:
+        """
+        Get the permission bits a user has on resources, in one query.
+        
+        Owners have every permission, public resources grant read, and
+        shared resources grant the bits of their permission type.
+        
+        Args:
+            db: Database session
+            resource_ids: Resource IDs
+            user_id: User ID
+            
+        Returns:
+            Dict[int, int]: Permission bits by resource ID (missing resources are left out)
+        """
+        query = (
+            select(
+                Resource.id,
+                Resource.owner_id,
+                Resource.is_public,
+                resource_permission.c.permission_type,
+            )
+            .outerjoin(
+                resource_permission,
+                and_(
+                    resource_permission.c.resource_id == Resource.id,
+                    resource_permission.c.user_id == user_id,
+                ),
+            )
+            .where(Resource.id.in_(list(resource_ids)))
+        )
+        result = await db.execute(query)
+        
+        all_bits = PERMISSION_MASKS["admin"]
+        masks = {}
+        for resource_id, owner_id, is_public, permission_type in result:
+            if owner_id == user_id:
+                masks[resource_id] = all_bits
+                continue
+            mask = PERMISSION_MASKS.get(permission_type, 0)
+            if is_public:
+                mask |= PERMISSION_READ
+            masks[resource_id] = mask
+        return masks
+    
+    async def _user_filters(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        is_public: Optional[bool],
+        search: Optional[str],
+        tsquery: Optional[ColumnElement] = None,
+    ) -> List[ColumnElement]:
+        """
+        Build the conditions of a listing of resources owned by or shared with a user.
+        
+        The IDs of the resources shared with the user are inlined from the
+        visibility index when it is enabled and they are few enough.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            is_public: Optional public status filter
+            search: Optional search term
+            tsquery: Optional full-text query replacing substring matching of the search term
+            
+        Returns:
+            List[ColumnElement]: Conditions
+        """
+        shared_ids = None
+        if _visibility_enabled():
+            ids = await self.get_shared_ids(db, user_id=user_id)
+            if len(ids) <= _MAX_INLINE_SHARED_IDS:
+                shared_ids = ids.tolist()
+        return _user_conditions(user_id, is_public, search, tsquery, shared_ids)
+    
+    async def _invalidate_resource(self, resource: Resource, user_ids: Iterable[int] = ()) -> None:
+        """
+        Invalidate cached listings that may include a resource.
+        
+        Args:
+            resource: Created, updated or deleted resource
+            user_ids: IDs of the users the resource is shared with
+        """
+        await invalidate_tags(
+            ALL_RESOURCES_TAG,
+            resource_tag(resource.id),
+            user_tag(resource.owner_id),
+            *(user_tag(user_id) for user_id in user_ids),
+        )
+    
+    def _index_resource(self, resource: Resource) -> None:
+        """
+        Add or replace a resource in the search index, if it is enabled.
+        
+        Args:
+            resource: Created or updated resource
+        """
+        if settings.SEARCH_INDEX_ENABLED:
+            resource_search_index.add(resource.id, resource_search_texts(resource))
+    
+    async def build_search_index(self, db: AsyncSession, batch_size: int = 1000) -> int:
+        """
+        Build the search index from all resources.
+        
+        Resources are read in keyset batches of the indexed columns only.
+        Searches fall back to substring matching until the index is built.
+        
+        Args:
+            db: Database session
+            batch_size: Number of resources read per query
+            
+        Returns:
+            int: Number of indexed resources
+        """
+        resource_search_index.clear()
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(Resource.id, Resource.name, Resource.description, Resource.meta_data)
+                .where(Resource.id > last_id)
+                .order_by(Resource.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            for row in rows:
+                resource_search_index.add(row.id, resource_search_texts(row))
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1].id
+        
+        resource_search_index.ready = True
+        logger.info(
+            f"Built resource search index with {len(resource_search_index)} resources "
+            f"and {resource_search_index.term_count} terms"
+        )
+        return len(resource_search_index)
+    
+    async def suggest_names(
+        self,
+        db: AsyncSession,
+        *,
+        prefix: str,
+        user_id: Optional[int] = None,
+        limit: int = 10,
+        timeout_ms: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Get the resources whose name starts with a prefix, case-insensitively.
+        
+        Only the ID and name are read. On PostgreSQL the prefix match is a
+        range scan of the ``lower(name) text_pattern_ops`` index.
+        
+        Args:
+            db: Database session
+            prefix: Lowercase name prefix
+            user_id: Optional user whose owned and shared resources are searched
+                (all resources are searched when omitted)
+            limit: Maximum number of resources to return
+            timeout_ms: Optional server-side statement timeout for the rest of
+                the transaction (PostgreSQL only)
+            
+        Returns:
+            List[Any]: Rows of (id, name), ordered by name
+            
+        Raises:
+            DBAPIError: If a statement exceeds ``timeout_ms``
+        """
+        if timeout_ms is not None and db.get_bind().dialect.name == "postgresql":
+            await db.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+        lower_name = func.lower(Resource.name)
+        conditions = [lower_name.like(_prefix_pattern(prefix), escape="\\")]
+        if user_id is not None:
+            conditions.extend(await self._user_filters(db, user_id, None, None))
+        
+        result = await db.execute(
+            select(Resource.id, Resource.name)
+            .where(and_(*conditions))
+            .order_by(lower_name, Resource.id)
+            .limit(limit)
+        )
+        return result.all()
+    
+    @cached(tags=resource_listing_tags)
     async def get_by_user(
         self, 
         db: AsyncSession, 
@@ -46,7 +761,9 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = "asc",
         is_public: Optional[bool] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        search_mode: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Resource]:
         """
         Get resources owned by or shared with a user.
@@ -54,79 +771,46 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         Args:
             db: Database session
             user_id: User ID
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when a cursor is given)
             limit: Maximum number of records to return
-            sort_by: Optional field to sort by (name, created_at, etc.)
+            sort_by: Optional field to sort by (name, description, etc.)
             sort_order: Optional sort order (asc or desc)
             is_public: Optional public status filter
             search: Optional search term for name or description
+            search_mode: Optional search mode ("auto", "substring" or "fulltext")
+            cursor: Optional cursor of the page to fetch
             
         Returns:
             List[Resource]: List of resources
         """
         import logging
         logger = logging.getLogger(__name__)
-        logger.info(f"get_by_user called with: user_id={user_id}, sort_by={sort_by}, sort_order={sort_order}, is_public={is_public}, search={search}")
-        
-        # Base condition: resources owned by or shared with the user
-        base_condition = or_(
-            Resource.owner_id == user_id,
-            Resource.id.in_(
-                select(resource_permission.c.resource_id)
-                .where(resource_permission.c.user_id == user_id)
-            )
-        )
-        
-        # Apply additional filters
-        filters = [base_condition]
+        logger.info(f"get_by_user called with: user_id={user_id}, sort_by={sort_by}, sort_order={sort_order}, is_public={is_public}, search={search}, search_mode={search_mode}, cursor={cursor}")
         
-        if is_public is not None:
-            filters.append(Resource.is_public == is_public)
-        
-        if search:
-            filters.append(
-                or_(
-                    Resource.name.ilike(f"%{search}%"),
-                    Resource.description.ilike(f"%{search}%")
-                )
-            )
+        tsquery = await _search_query(db, search, search_mode)
+        filters = await self._user_filters(db, user_id, is_public, search, tsquery)
         
         # Build the query with all filters
         query = select(Resource).where(and_(*filters))
         
-        # Apply sorting
-        if sort_by:
-            column = getattr(Resource, sort_by, None)
-            if column is not None:
-                if sort_order and sort_order.lower() == "desc":
-                    logger.info(f"Sorting by {sort_by} DESC")
-                    query = query.order_by(column.desc())
-                else:
-                    logger.info(f"Sorting by {sort_by} ASC")
-                    query = query.order_by(column.asc())
-            else:
-                # Default sort by id if column not found
-                logger.info(f"Column {sort_by} not found, sorting by id ASC")
-                query = query.order_by(Resource.id.asc())
-        else:
-            # Default sort by id
-            logger.info("No sort_by provided, sorting by id ASC")
-            query = query.order_by(Resource.id.asc())
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # Apply sorting (unknown fields fall back to id) and pagination
+        query = _apply_sorting(query, sort_by, sort_order, cursor, tsquery=tsquery)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return result.scalars().all()
     
-    @cached()
+    @cached(tags=resource_listing_tags)
     async def count_by_user(
         self, 
         db: AsyncSession, 
         *, 
         user_id: int,
         is_public: Optional[bool] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        search_mode: Optional[str] = None
     ) -> int:
         """
         Count resources owned by or shared with a user.
@@ -136,32 +820,13 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
             user_id: User ID
             is_public: Optional public status filter
             search: Optional search term for name or description
+            search_mode: Optional search mode ("auto", "substring" or "fulltext")
             
         Returns:
             int: Number of resources
         """
-        # Base condition: resources owned by or shared with the user
-        base_condition = or_(
-            Resource.owner_id == user_id,
-            Resource.id.in_(
-                select(resource_permission.c.resource_id)
-                .where(resource_permission.c.user_id == user_id)
-            )
-        )
-        
-        # Apply additional filters
-        filters = [base_condition]
-        
-        if is_public is not None:
-            filters.append(Resource.is_public == is_public)
-        
-        if search:
-            filters.append(
-                or_(
-                    Resource.name.ilike(f"%{search}%"),
-                    Resource.description.ilike(f"%{search}%")
-                )
-            )
+        tsquery = await _search_query(db, search, search_mode)
+        filters = await self._user_filters(db, user_id, is_public, search, tsquery)
         
         # Build the query with all filters
         query = select(func.count()).where(and_(*filters))
@@ -169,7 +834,7 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         result = await db.execute(query)
         return result.scalar_one()
     
-    @cached()
+    @cached(tags=resource_listing_tags)
     async def get_by_owner(
         self, 
         db: AsyncSession, 
@@ -199,7 +864,7 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         result = await db.execute(query)
         return result.scalars().all()
     
-    @cached()
+    @cached(tags=resource_listing_tags)
     async def count_by_owner(self, db: AsyncSession, *, owner_id: int) -> int:
         """
         Count resources owned by a user.
@@ -215,8 +880,7 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         result = await db.execute(query)
         return result.scalar_one()
     
-    # Use a custom cache key that explicitly includes sort_order
-    @cached(cache_key_prefix="get_with_filter")
+    @cached(tags=resource_listing_tags)
     async def get_with_filter(
         self,
         db: AsyncSession,
@@ -224,10 +888,12 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         owner_id: Optional[int] = None,
         is_public: Optional[bool] = None,
         search: Optional[str] = None,
+        search_mode: Optional[str] = None,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = "asc",
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Resource]:
         """
         Get resources with filtering and sorting.
@@ -237,10 +903,12 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
             owner_id: Optional owner ID filter
             is_public: Optional public status filter
             search: Optional search term for name or description
-            sort_by: Optional field to sort by (name, created_at, etc.)
+            search_mode: Optional search mode ("auto", "substring" or "fulltext")
+            sort_by: Optional field to sort by (name, description, etc.)
             sort_order: Optional sort order (asc or desc)
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when a cursor is given)
             limit: Maximum number of records to return
+            cursor: Optional cursor of the page to fetch
             
         Returns:
             List[Resource]: List of resources
@@ -248,60 +916,34 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         import logging
         logger = logging.getLogger(__name__)
         
-        logger.info(f"get_with_filter called with: owner_id={owner_id}, is_public={is_public}, search={search}, sort_by={sort_by}, sort_order={sort_order}, skip={skip}, limit={limit}")
+        logger.info(f"get_with_filter called with: owner_id={owner_id}, is_public={is_public}, search={search}, search_mode={search_mode}, sort_by={sort_by}, sort_order={sort_order}, skip={skip}, limit={limit}, cursor={cursor}")
         
         query = select(Resource)
         
         # Apply filters
-        filters = []
-        if owner_id is not None:
-            filters.append(Resource.owner_id == owner_id)
-        if is_public is not None:
-            filters.append(Resource.is_public == is_public)
-        if search:
-            filters.append(
-                or_(
-                    Resource.name.ilike(f"%{search}%"),
-                    Resource.description.ilike(f"%{search}%")
-                )
-            )
-        
+        tsquery = await _search_query(db, search, search_mode)
+        filters = _filter_conditions(owner_id, is_public, search, tsquery)
         if filters:
             query = query.where(and_(*filters))
         
-        # Apply sorting
-        if sort_by:
-            column = getattr(Resource, sort_by, None)
-            if column is not None:
-                if sort_order and sort_order.lower() == "desc":
-                    logger.info(f"Sorting by {sort_by} DESC")
-                    query = query.order_by(column.desc())
-                else:
-                    logger.info(f"Sorting by {sort_by} ASC")
-                    query = query.order_by(column.asc())
-            else:
-                # Default sort by id if column not found
-                logger.info(f"Column {sort_by} not found, sorting by id ASC")
-                query = query.order_by(Resource.id.asc())
-        else:
-            # Default sort by id
-            logger.info("No sort_by provided, sorting by id ASC")
-            query = query.order_by(Resource.id.asc())
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # Apply sorting (unknown fields fall back to id) and pagination
+        query = _apply_sorting(query, sort_by, sort_order, cursor, tsquery=tsquery)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return result.scalars().all()
     
-    @cached()
+    @cached(tags=resource_listing_tags)
     async def count_with_filter(
         self,
         db: AsyncSession,
         *,
         owner_id: Optional[int] = None,
         is_public: Optional[bool] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        search_mode: Optional[str] = None
     ) -> int:
         """
         Count resources with filtering.
@@ -311,6 +953,7 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
             owner_id: Optional owner ID filter
             is_public: Optional public status filter
             search: Optional search term for name or description
+            search_mode: Optional search mode ("auto", "substring" or "fulltext")
             
         Returns:
             int: Number of resources
@@ -318,25 +961,80 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         query = select(func.count()).select_from(Resource)
         
         # Apply filters
-        filters = []
-        if owner_id is not None:
-            filters.append(Resource.owner_id == owner_id)
-        if is_public is not None:
-            filters.append(Resource.is_public == is_public)
-        if search:
-            filters.append(
-                or_(
-                    Resource.name.ilike(f"%{search}%"),
-                    Resource.description.ilike(f"%{search}%")
-                )
-            )
-        
+        tsquery = await _search_query(db, search, search_mode)
+        filters = _filter_conditions(owner_id, is_public, search, tsquery)
         if filters:
             query = query.where(and_(*filters))
         
         result = await db.execute(query)
         return result.scalar_one()
     
+    @cached(tags=resource_listing_tags)
+    async def get_page_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: Optional[int] = None,
+        owner_id: Optional[int] = None,
+        is_public: Optional[bool] = None,
+        search: Optional[str] = None,
+        search_mode: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Resource], int]:
+        """
+        Get a page of resources and the total number of matches in one statement.
+        
+        The total comes from ``count(*) OVER ()``, which is computed before
+        OFFSET/LIMIT apply. With a cursor the window runs over the filtered
+        rows in a subquery so that the seek predicate does not shrink it.
+        Only an empty page (e.g. past the end) needs a separate count.
+        
+        Args:
+            db: Database session
+            user_id: Optional user whose owned and shared resources are listed
+            owner_id: Optional owner ID filter (ignored when user_id is given)
+            is_public: Optional public status filter
+            search: Optional search term for name or description
+            search_mode: Optional search mode ("auto", "substring" or "fulltext")
+            sort_by: Optional field to sort by (name, description, etc.)
+            sort_order: Optional sort order (asc or desc)
+            skip: Number of records to skip (ignored when a cursor is given)
+            limit: Maximum number of records to return
+            cursor: Optional cursor of the page to fetch
+            
+        Returns:
+            Tuple[List[Resource], int]: Resources and total number of matches
+        """
+        tsquery = await _search_query(db, search, search_mode)
+        if user_id is not None:
+            filters = await self._user_filters(db, user_id, is_public, search, tsquery)
+        else:
+            filters = _filter_conditions(owner_id, is_public, search, tsquery)
+        total_column = func.count().over().label("total")
+        
+        if cursor:
+            matches = select(Resource, total_column).where(*filters).subquery()
+            entity = aliased(Resource, matches)
+            query = _apply_sorting(
+                select(entity, matches.c.total), sort_by, sort_order, cursor, entity, tsquery
+            )
+        else:
+            query = _apply_sorting(
+                select(Resource, total_column).where(*filters), sort_by, sort_order, tsquery=tsquery
+            ).offset(skip)
+        
+        result = await db.execute(query.limit(limit))
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        
+        total = await db.execute(select(func.count()).select_from(Resource).where(*filters))
+        return [], total.scalar_one()
+    
     async def create_with_owner(
         self, db: AsyncSession, *, obj_in: ResourceCreate, owner_id: int
     ) -> Resource:
@@ -358,10 +1056,64 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         await db.refresh(db_obj)
         
         # Invalidate cache
-        invalidate_cache("ResourceRepository")
+        await self._invalidate_resource(db_obj)
+        self._index_resource(db_obj)
         
         return db_obj
     
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Resource,
+        obj_in: Union[ResourceUpdate, Dict[str, Any]]
+    ) -> Resource:
+        """
+        Update a resource and invalidate the listings that may include it.
+        
+        Args:
+            db: Database session
+            db_obj: Resource to update
+            obj_in: Resource update schema or dictionary
+            
+        Returns:
+            Resource: Updated resource
+        """
+        shared_user_ids = list(db_obj.permissions)
+        resource = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        
+        # Invalidate cache
+        await self._invalidate_resource(resource, shared_user_ids)
+        self._index_resource(resource)
+        
+        return resource
+    
+    async def remove(self, db: AsyncSession, *, id: Any) -> Resource:
+        """
+        Remove a resource and invalidate the listings that may include it.
+        
+        Args:
+            db: Database session
+            id: Resource ID
+            
+        Returns:
+            Resource: Removed resource
+        """
+        resource = await self.get(db=db, id=id)
+        shared_user_ids = list(resource.permissions)
+        await db.execute(
+            resource_permission.delete().where(resource_permission.c.resource_id == resource.id)
+        )
+        await db.delete(resource)
+        await db.commit()
+        
+        # Invalidate cache
+        await self._invalidate_resource(resource, shared_user_ids)
+        resource_search_index.remove(resource.id)
+        resource_visibility.discard(resource.id, shared_user_ids)
+        
+        return resource
+    
     async def update_with_owner_check(
         self,
         db: AsyncSession,
@@ -388,12 +1140,7 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         if db_obj.owner_id != current_user_id:
             raise ValueError("Not enough permissions")
         
-        resource = await super().update(db, db_obj=db_obj, obj_in=obj_in)
-        
-        # Invalidate cache
-        invalidate_cache("ResourceRepository")
-        
-        return resource
+        return await self.update(db, db_obj=db_obj, obj_in=obj_in)
     
     async def remove_with_owner_check(
         self, db: AsyncSession, *, id: int, current_user_id: int
@@ -419,11 +1166,17 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         if resource.owner_id != current_user_id:
             raise ValueError("Not enough permissions")
         
+        shared_user_ids = list(resource.permissions)
+        await db.execute(
+            resource_permission.delete().where(resource_permission.c.resource_id == resource.id)
+        )
         await db.delete(resource)
         await db.commit()
         
         # Invalidate cache
-        invalidate_cache("ResourceRepository")
+        await self._invalidate_resource(resource, shared_user_ids)
+        resource_search_index.remove(resource.id)
+        resource_visibility.discard(resource.id, shared_user_ids)
         
         return resource
     
@@ -452,9 +1205,10 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         )
         await db.execute(stmt)
         await db.commit()
+        resource_visibility.add(user_id, resource_id)
         
-        # Invalidate cache
-        invalidate_cache("ResourceRepository")
+        # Only the grantee's view of the resource changes
+        await invalidate_tags(user_tag(user_id), resource_tag(resource_id))
     
     async def unshare_resource(
         self, db: AsyncSession, *, resource_id: int, user_id: int
@@ -481,9 +1235,10 @@ class ResourceRepository(BaseRepository[Resource, ResourceCreate, ResourceUpdate
         )
         await db.execute(stmt)
         await db.commit()
+        resource_visibility.discard(resource_id, [user_id])
         
-        # Invalidate cache
-        invalidate_cache("ResourceRepository")
+        # Only the former grantee's view of the resource changes
+        await invalidate_tags(user_tag(user_id), resource_tag(resource_id))
 
 
 # Create a singleton instance
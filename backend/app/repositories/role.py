@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from typing import Any, Dict, FrozenSet, List
+
+from pydantic import BaseModel
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.models.role import Permission, Role, role_permission
+from app.models.user import User, user_role
+from app.repositories.base import BaseRepository
+from app.utils.caching import ALL_ROLES_TAG, cached, invalidate_tags, user_tag
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Key in Session.info marking a transaction that changed roles or permissions
+_ROLES_CHANGED = "roles_changed"
+
+# Invalidations scheduled after commits (kept referenced until done)
+_invalidation_tasks = set()
+
+# Tables whose rows make up effective permissions
+_ROLE_TABLES = frozenset((Role.__table__, Permission.__table__, user_role, role_permission))
+
+
+def permission_tags(kwargs: Dict[str, Any], result: Any) -> List[str]:
+    """
+    Get the cache tags for a user's effective permissions.
+    
+    Args:
+        kwargs: Keyword arguments of the cached call
+        result: Result of the cached call
+        
+    Returns:
+        List[str]: Cache tags
+    """
+    return [ALL_ROLES_TAG, user_tag(kwargs["user_id"])]
+
+
+class RoleRepository(BaseRepository[Role, BaseModel, BaseModel]):
+    """
+    Repository for Role model.
+    """
+    
+    @cached(tags=permission_tags)
+    async def get_permission_names(self, db: AsyncSession, *, user_id: int) -> FrozenSet[str]:
+        """
+        Get the effective permissions of a user, granted through their roles.
+        
+        Resolved with one query joining user_role, role_permission and
+        permissions, and cached until roles or permissions change.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            
+        Returns:
+            FrozenSet[str]: Permission names
+        """
+        query = (
+            select(Permission.name)
+            .join(role_permission, role_permission.c.permission_id == Permission.id)
+            .join(user_role, user_role.c.role_id == role_permission.c.role_id)
+            .where(user_role.c.user_id == user_id)
+            .distinct()
+        )
+        result = await db.execute(query)
+        return frozenset(result.scalars().all())
+
+
+def invalidate_permissions() -> None:
+    """
+    Drop every cached set of effective permissions.
+    
+    Entries cached in this process are dropped immediately; the shared
+    backend (and other workers) are invalidated in the background.
+    """
+    RoleRepository.get_permission_names.cache.invalidate_tags([ALL_ROLES_TAG])
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(invalidate_tags(ALL_ROLES_TAG))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+# Writes through an ORM session are tracked, whether flushed from objects or
+# executed as Core insert/update/delete statements on the role tables. Writes
+# on other connections (Alembic migrations, raw SQL scripts) are not seen:
+# call invalidate_permissions() after them, or wait for the cache TTL.
+
+
+@event.listens_for(Session, "after_flush")
+def _track_role_changes(session: Session, flush_context: Any) -> None:
+    # Roles and permissions themselves, or a user's role assignments
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Role, Permission)) or (
+            isinstance(obj, User) and inspect(obj).attrs.roles.history.has_changes()
+        ):
+            session.info[_ROLES_CHANGED] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_role_statements(state: ORMExecuteState) -> None:
+    # Bulk statements such as user_role.delete() bypass the flush
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    if getattr(state.statement, "table", None) in _ROLE_TABLES:
+        state.session.info[_ROLES_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_ROLES_CHANGED, False):
+        logger.info("Roles or permissions changed, invalidating effective permissions")
+        invalidate_permissions()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_role_changes(session: Session) -> None:
+    session.info.pop(_ROLES_CHANGED, None)
+
+
+# Create a singleton instance
+role_repository = RoleRepository(Role)
@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal import invalidate_token
+from app.core.revocation import revocation_list
+from app.models.token import RevokedToken
+from app.repositories.base import BaseRepository
+from app.utils.caching import add_remote_invalidation_listener
+
+# Tokens revoked by other workers are broadcast as cache tags
+add_remote_invalidation_listener(revocation_list.handle_invalidation)
+
+
+def _timestamp(value: datetime) -> float:
+    # Stored datetimes are naive UTC, like the token expiry they come from
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevokedTokenRepository(BaseRepository[RevokedToken, BaseModel, BaseModel]):
+    """
+    Repository for RevokedToken model.
+    
+    Keeps ``revocation_list`` in step with the revoked_tokens table, so
+    checking a token never queries the database.
+    """
+    
+    async def revoke(
+        self, db: AsyncSession, *, jti: str, user_id: int, expires_at: datetime
+    ) -> None:
+        """
+        Revoke a token in this and every other worker.
+        
+        Revoking a token that is already revoked is a no-op.
+        
+        Args:
+            db: Database session
+            jti: Token ID
+            user_id: ID of the user the token was issued to
+            expires_at: Expiry of the token (naive UTC)
+        """
+        db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Already revoked, possibly by a concurrent request
+            await db.rollback()
+        revocation_list.add(jti, _timestamp(expires_at))
+        await invalidate_token(jti)
+    
+    async def load_revocations(self, db: AsyncSession) -> int:
+        """
+        Load the tokens revoked since the last load into ``revocation_list``.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            int: Number of revoked tokens loaded
+        """
+        query = (
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.id > revocation_list.last_id)
+            .order_by(RevokedToken.id)
+        )
+        result = await db.execute(query)
+        return revocation_list.load(
+            (row_id, jti, _timestamp(expires_at)) for row_id, jti, expires_at in result
+        )
+    
+    async def prune_expired(self, db: AsyncSession) -> int:
+        """
+        Delete the revoked tokens that have expired, from the table and ``revocation_list``.
+        
+        Expired tokens fail verification anyway, so they no longer need to be listed.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            int: Number of rows deleted
+        """
+        now = datetime.utcnow()
+        result = await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await db.commit()
+        revocation_list.prune(_timestamp(now))
+        return result.rowcount
+
+
+# Create a singleton instance
+revoked_token_repository = RevokedTokenRepository(RevokedToken)
@@ -3,10 +3,25 @@ from typing import List, Optional, Union, Dict, Any
 from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.models.user import User
 from app.repositories.base import BaseRepository
 from app.schemas.user import UserCreate, UserUpdate
+from app.utils.caching import ALL_USERS_TAG, invalidate_tags
+
+
+def user_listing_tags(kwargs: Dict[str, Any], result: Any) -> List[str]:
+    """
+    Get the cache tags for a user listing.
+    
+    Args:
+        kwargs: Keyword arguments of the cached call
+        result: Result of the cached call
+        
+    Returns:
+        List[str]: Cache tags
+    """
+    return [ALL_USERS_TAG]
 
 
 class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
@@ -79,7 +94,7 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         db_obj = User(
             email=obj_in.email,
             username=obj_in.username,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await get_password_hash_async(obj_in.password),
             first_name=obj_in.first_name,
             last_name=obj_in.last_name,
             is_active=obj_in.is_active,
@@ -88,8 +103,46 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        await invalidate_tags(ALL_USERS_TAG)
         return db_obj
     
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        """
+        Update a user and invalidate cached user listings.
+        
+        Args:
+            db: Database session
+            db_obj: User to update
+            obj_in: User update schema or dictionary
+            
+        Returns:
+            User: Updated user
+        """
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        await invalidate_tags(ALL_USERS_TAG)
+        return user
+    
+    async def remove(self, db: AsyncSession, *, id: Any) -> User:
+        """
+        Remove a user and invalidate cached user listings.
+        
+        Args:
+            db: Database session
+            id: ID of the user to remove
+            
+        Returns:
+            User: Removed user
+        """
+        user = await super().remove(db, id=id)
+        await invalidate_tags(ALL_USERS_TAG)
+        return user
+    
     async def update_with_password(
         self,
         db: AsyncSession,
@@ -114,11 +167,11 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
             update_data = obj_in.dict(exclude_unset=True)
         
         if "password" in update_data and update_data["password"]:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await get_password_hash_async(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
         
-        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+        return await self.update(db, db_obj=db_obj, obj_in=update_data)
     
     async def authenticate(
         self, db: AsyncSession, *, email_or_username: str, password: str
@@ -137,7 +190,7 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         user = await self.get_by_email_or_username(db, email_or_username=email_or_username)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
     
@@ -22,9 +22,11 @@ class TokenPayload(BaseModel):
     Attributes:
         sub: Subject (user ID)
         exp: Expiration time
+        jti: Unique token ID, used to revoke the token
     """
     sub: Optional[str] = None
     exp: Optional[int] = None
+    jti: Optional[str] = None
 
 
 class Login(BaseModel):
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, validator, ConfigDict
 import json
@@ -71,6 +71,17 @@ class Resource(ResourceBase):
         return {}
 
 
+# Properties to return via API for name suggestions
+class ResourceSuggestion(BaseModel):
+    """
+    Schema for returning a resource name suggestion.
+    """
+    id: int
+    name: str
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 # Properties to return via API for a list of resources
 class ResourceList(BaseModel):
     """
@@ -82,12 +93,38 @@ class ResourceList(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+# Schemas for checking permissions on many resources at once
+class PermissionCheck(BaseModel):
+    """
+    Schema for checking the caller's permissions on resources.
+    """
+    resource_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    permission_types: List[Literal["read", "write", "admin"]] = Field(
+        default=["read", "write", "admin"],
+        min_length=1,
+        description="Permission types to check",
+    )
+
+
+class PermissionCheckResult(BaseModel):
+    """
+    Schema for returning the caller's permissions on resources.
+    
+    ``results`` maps each requested resource ID to the bits of the checked
+    permission types the caller has (0 for missing resources).
+    """
+    permission_bits: Dict[str, int]
+    results: Dict[int, int]
+
+
 # Schema for resource sharing
 class ResourceShare(BaseModel):
     """
     Schema for sharing a resource with a user.
     """
     user_id: int
-    permission_type: str = Field(..., description="Permission type (read, write, admin)")
+    permission_type: Literal["read", "write", "admin"] = Field(
+        ..., description="Permission type (read, write, admin)"
+    )
     
     model_config = ConfigDict(arbitrary_types_allowed=True)
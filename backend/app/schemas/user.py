@@ -67,3 +67,11 @@ class UserList(BaseModel):
     """
     users: List[User]
     total: int
+
+
+# Properties to return via API for a user's effective permissions
+class UserPermissions(BaseModel):
+    """
+    Schema for returning the permissions a user has through their roles.
+    """
+    permissions: List[str]
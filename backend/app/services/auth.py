@@ -1,3 +1,6 @@
+import asyncio
+import logging
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -8,13 +11,18 @@ from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
-from app.db.session import get_db
+from app.core.keys import key_ring
+from app.core.security import create_access_token, verify_password_async
+from app.db.session import AsyncSessionLocal, get_db
 from app.models.user import User
+from app.repositories.token import revoked_token_repository
 from app.repositories.user import user_repository
 from app.schemas.auth import TokenPayload
 from app.schemas.user import UserCreate
 
+# Configure logging
+logger = logging.getLogger(__name__)
+
 
 class AuthService:
     """
@@ -40,7 +48,7 @@ class AuthService:
         )
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         return user
     
@@ -61,6 +69,30 @@ class AuthService:
             subject=str(user_id), expires_delta=expires_delta
         )
     
+    async def revoke_token(self, db: AsyncSession, token: str) -> None:
+        """
+        Revoke an access token until it expires.
+        
+        Args:
+            db: Database session
+            token: Verified access token
+            
+        Raises:
+            HTTPException: If the token was issued without a token ID
+        """
+        token_data = TokenPayload(**key_ring.decode(token))
+        if token_data.jti is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Token cannot be revoked",
+            )
+        await revoked_token_repository.revoke(
+            db,
+            jti=token_data.jti,
+            user_id=int(token_data.sub),
+            expires_at=datetime.utcfromtimestamp(token_data.exp),
+        )
+    
     async def register_user(
         self, db: AsyncSession, user_in: UserCreate
     ) -> User:
@@ -100,3 +132,35 @@ class AuthService:
 
 # Create a singleton instance
 auth_service = AuthService()
+
+
+async def run_revocation_sync(
+    interval: Optional[float] = None, prune_interval: Optional[float] = None
+) -> None:
+    """
+    Periodically load new revocations and prune expired ones.
+    
+    Revocations made by this worker take effect immediately; this loop
+    catches up on those made by other workers.
+    
+    Args:
+        interval: Seconds between loads (defaults to settings.TOKEN_REVOCATION_SYNC_SECONDS)
+        prune_interval: Seconds between prunes (defaults to settings.TOKEN_REVOCATION_PRUNE_SECONDS)
+    """
+    interval = interval or settings.TOKEN_REVOCATION_SYNC_SECONDS
+    prune_interval = prune_interval or settings.TOKEN_REVOCATION_PRUNE_SECONDS
+    pruned_at = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                loaded = await revoked_token_repository.load_revocations(db)
+                if loaded:
+                    logger.debug(f"Loaded {loaded} revoked tokens")
+                if time.monotonic() - pruned_at >= prune_interval:
+                    pruned_at = time.monotonic()
+                    pruned = await revoked_token_repository.prune_expired(db)
+                    if pruned:
+                        logger.info(f"Pruned {pruned} expired revoked tokens")
+        except Exception:
+            logger.exception("Revoked token sync failed")
@@ -1,14 +1,151 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.resource import Resource
-from app.models.user import User
-from app.repositories.resource import resource_repository
-from app.schemas.resource import ResourceCreate, ResourceUpdate, ResourceShare
+from app.core.config import settings
+from app.core.principal import UserPrincipal
+from app.models.resource import PERMISSION_BITS, Resource
+from app.repositories.resource import (
+    SORT_RELEVANCE,
+    resource_cursor,
+    resource_listing_tags,
+    resource_repository,
+)
+from app.schemas.resource import (
+    PermissionCheck,
+    PermissionCheckResult,
+    ResourceCreate,
+    ResourceShare,
+    ResourceSuggestion,
+    ResourceUpdate,
+)
 from app.utils.caching import cached
-from app.utils.pagination import PaginationParams, create_page, Page
+from app.utils.pagination import IncludeTotal, PaginationParams, create_page, Page
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# SQLSTATE of statements cancelled by statement_timeout
+_QUERY_CANCELED = "57014"
+
+
+async def _fetch_resource_page(
+    db: AsyncSession,
+    *,
+    pagination: PaginationParams,
+    include_total: IncludeTotal,
+    user_id: Optional[int] = None,
+    owner_id: Optional[int] = None,
+    is_public: Optional[bool] = None,
+    search: Optional[str] = None,
+    search_mode: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = "asc",
+) -> Page[Resource]:
+    """
+    Fetch a page of resources and its total as requested.
+    
+    An exact total is fetched together with the rows in one statement. An
+    estimated total comes from planner statistics, but only for the
+    unfiltered listing of all resources; filtered listings, and databases
+    without statistics, get an exact count instead. No total costs nothing.
+    One row beyond the limit is always fetched to tell whether there is a
+    next page.
+    
+    Args:
+        db: Database session
+        pagination: Pagination parameters
+        include_total: How to compute the total ("exact", "estimated" or "none")
+        user_id: Optional user whose owned and shared resources are listed
+        owner_id: Optional owner ID filter (ignored when user_id is given)
+        is_public: Optional public status filter
+        search: Optional search term
+        search_mode: Optional search mode ("auto", "substring" or "fulltext")
+        sort_by: Optional field to sort by ("relevance" ranks full-text matches)
+        sort_order: Optional sort order (asc or desc)
+        
+    Returns:
+        Page[Resource]: Paginated resources
+    """
+    listing = dict(
+        sort_by=sort_by,
+        sort_order=sort_order,
+        skip=pagination.skip,
+        limit=pagination.limit + 1,
+        cursor=pagination.cursor,
+    )
+    if user_id is not None:
+        filters = dict(user_id=user_id, is_public=is_public, search=search, search_mode=search_mode)
+    else:
+        filters = dict(owner_id=owner_id, is_public=is_public, search=search, search_mode=search_mode)
+    
+    if include_total == "exact":
+        resources, total = await resource_repository.get_page_with_total(
+            db, **filters, **listing
+        )
+        return _create_resource_page(resources, total, pagination, sort_by)
+    
+    if user_id is not None:
+        resources = await resource_repository.get_by_user(db, **filters, **listing)
+    else:
+        resources = await resource_repository.get_with_filter(db, **filters, **listing)
+    
+    total = None
+    estimated = False
+    if include_total == "estimated":
+        unfiltered = user_id is None and owner_id is None and is_public is None and not search
+        if unfiltered:
+            total = await resource_repository.estimate_count(db)
+            estimated = total is not None
+        if total is None:
+            # Filtered, or no planner statistics (e.g. SQLite): count exactly
+            if user_id is not None:
+                total = await resource_repository.count_by_user(db, **filters)
+            else:
+                total = await resource_repository.count_with_filter(db, **filters)
+    
+    return _create_resource_page(resources, total, pagination, sort_by, estimated)
+
+
+def _create_resource_page(
+    resources: List[Resource],
+    total: Optional[int],
+    pagination: PaginationParams,
+    sort_by: Optional[str],
+    total_is_estimate: bool = False,
+) -> Page[Resource]:
+    """
+    Create a page from resources fetched with one extra row.
+    
+    Args:
+        resources: Fetched resources (up to ``pagination.limit + 1``)
+        total: Total number of resources, or None if not computed
+        pagination: Pagination parameters
+        sort_by: Field the resources are sorted by
+        total_is_estimate: Whether the total is an estimate
+        
+    Returns:
+        Page[Resource]: Paginated resources with the cursor of the next page
+    """
+    next_cursor = None
+    has_next = len(resources) > pagination.limit
+    if has_next:
+        resources = resources[:pagination.limit]
+        # Relevance-ranked pages are paginated by offset only
+        if sort_by != SORT_RELEVANCE:
+            next_cursor = resource_cursor(resources[-1], sort_by)
+    return create_page(
+        resources,
+        total,
+        pagination,
+        next_cursor=next_cursor,
+        has_next=has_next,
+        total_is_estimate=total_is_estimate,
+    )
 
 
 class ResourceService:
@@ -21,7 +158,7 @@ class ResourceService:
         db: AsyncSession,
         *,
         id: int,
-        current_user: User
+        current_user: UserPrincipal
     ) -> Optional[Resource]:
         """
         Get a resource by ID.
@@ -59,18 +196,132 @@ class ResourceService:
         
         return resource
     
-    @cached()
+    async def check_permissions(
+        self,
+        db: AsyncSession,
+        *,
+        check: PermissionCheck,
+        current_user: UserPrincipal
+    ) -> PermissionCheckResult:
+        """
+        Check the current user's permissions on many resources at once.
+        
+        Args:
+            db: Database session
+            check: Resource IDs and permission types to check
+            current_user: Current user
+            
+        Returns:
+            PermissionCheckResult: Granted bits of the checked permission types by resource ID
+        """
+        bits = {permission_type: PERMISSION_BITS[permission_type] for permission_type in check.permission_types}
+        checked = 0
+        for bit in bits.values():
+            checked |= bit
+        
+        resource_ids = set(check.resource_ids)
+        masks = await resource_repository.get_permission_masks(
+            db, resource_ids=resource_ids, user_id=current_user.id
+        )
+        if current_user.is_admin:
+            # Admin users have every permission on the resources that exist
+            masks = dict.fromkeys(masks, checked)
+        
+        return PermissionCheckResult(
+            permission_bits=bits,
+            results={resource_id: masks.get(resource_id, 0) & checked for resource_id in resource_ids},
+        )
+    
+    async def suggest_resources(
+        self,
+        db: AsyncSession,
+        *,
+        query: str,
+        current_user: UserPrincipal,
+        limit: int = 10
+    ) -> List[ResourceSuggestion]:
+        """
+        Suggest resources whose name starts with a query, for typeahead.
+        
+        Users get suggestions from the resources they own or that are shared
+        with them, admins from all resources. A lookup that exceeds
+        ``settings.SUGGEST_TIMEOUT_MS`` is abandoned and returns no suggestions,
+        so a slow keystroke never holds up the next one.
+        
+        The lookup runs on a short-lived session of its own. On PostgreSQL the
+        server enforces the deadline with ``statement_timeout``; elsewhere the
+        lookup is cancelled, which only ever affects that session.
+        
+        Args:
+            db: Database session
+            query: Name prefix typed so far
+            current_user: Current user
+            limit: Maximum number of suggestions
+            
+        Returns:
+            List[ResourceSuggestion]: Suggestions ordered by name
+        """
+        prefix = query.strip().lower()
+        if not prefix:
+            return []
+        
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            lookup = self._suggest(db=session, prefix=prefix, current_user=current_user, limit=limit)
+            try:
+                if session.get_bind().dialect.name == "postgresql":
+                    return await lookup
+                return await asyncio.wait_for(lookup, timeout=settings.SUGGEST_TIMEOUT_MS / 1000)
+            except asyncio.TimeoutError:
+                pass
+            except DBAPIError as e:
+                if getattr(e.orig, "sqlstate", None) != _QUERY_CANCELED:
+                    raise
+        logger.warning(f"Resource suggestions for {prefix!r} exceeded {settings.SUGGEST_TIMEOUT_MS} ms")
+        return []
+    
+    @cached(expire_seconds=30, max_entries=2048, tags=resource_listing_tags)
+    async def _suggest(
+        self,
+        db: AsyncSession,
+        *,
+        prefix: str,
+        current_user: UserPrincipal,
+        limit: int
+    ) -> List[ResourceSuggestion]:
+        """
+        Get name suggestions, cached per user for a short time.
+        
+        Args:
+            db: Database session
+            prefix: Lowercase name prefix
+            current_user: Current user
+            limit: Maximum number of suggestions
+            
+        Returns:
+            List[ResourceSuggestion]: Suggestions ordered by name
+        """
+        rows = await resource_repository.suggest_names(
+            db,
+            prefix=prefix,
+            user_id=None if current_user.is_admin else current_user.id,
+            limit=limit,
+            timeout_ms=settings.SUGGEST_TIMEOUT_MS,
+        )
+        return [ResourceSuggestion(id=row.id, name=row.name) for row in rows]
+    
     async def get_resources(
         self,
         db: AsyncSession,
         *,
         pagination: PaginationParams,
-        current_user: User,
+        current_user: UserPrincipal,
         owner_id: Optional[int] = None,
         is_public: Optional[bool] = None,
         search: Optional[str] = None,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "asc"
+        sort_order: Optional[str] = "asc",
+        include_total: IncludeTotal = "exact",
+        search_mode: Optional[str] = None
     ) -> Page[Resource]:
         """
         Get resources with pagination, filtering, and sorting.
@@ -84,82 +335,34 @@ class ResourceService:
             search: Optional search term
             sort_by: Optional field to sort by
             sort_order: Optional sort order (asc or desc)
+            include_total: How to compute the total ("exact", "estimated" or "none")
+            search_mode: Optional search mode ("auto", "substring" or "fulltext")
             
         Returns:
             Page[Resource]: Paginated resources
         """
+        listing = dict(
+            pagination=pagination,
+            include_total=include_total,
+            is_public=is_public,
+            search=search,
+            search_mode=search_mode,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        )
+        
         # If user is admin, they can see all resources with applied filters
-        # If user is not admin, they can only see their own resources or resources shared with them
         if current_user.is_admin:
-            # Admin user - get resources with filters
-            resources = await resource_repository.get_with_filter(
-                db,
-                owner_id=owner_id,
-                is_public=is_public,
-                search=search,
-                sort_by=sort_by,
-                sort_order=sort_order,
-                skip=pagination.skip,
-                limit=pagination.limit
-            )
-            
-            # Count total resources
-            total = await resource_repository.count_with_filter(
-                db,
-                owner_id=owner_id,
-                is_public=is_public,
-                search=search
-            )
-        else:
-            # Regular user - get only resources they own or have been shared with them
-            # If owner_id is specified and it's not the current user, ignore it for security
-            effective_owner_id = owner_id if owner_id == current_user.id else None
-            
-            if effective_owner_id is None:
-                # Get resources owned by or shared with the user
-                resources = await resource_repository.get_by_user(
-                    db,
-                    user_id=current_user.id,
-                    skip=pagination.skip,
-                    limit=pagination.limit,
-                    sort_by=sort_by,
-                    sort_order=sort_order,
-                    is_public=is_public,
-                    search=search
-                )
-                
-                # Count total resources
-                total = await resource_repository.count_by_user(
-                    db, 
-                    user_id=current_user.id,
-                    is_public=is_public,
-                    search=search
-                )
-            else:
-                # Get only resources owned by the user (with additional filters)
-                resources = await resource_repository.get_with_filter(
-                    db,
-                    owner_id=current_user.id,
-                    is_public=is_public,
-                    search=search,
-                    sort_by=sort_by,
-                    sort_order=sort_order,
-                    skip=pagination.skip,
-                    limit=pagination.limit
-                )
-                
-                # Count total resources
-                total = await resource_repository.count_with_filter(
-                    db,
-                    owner_id=current_user.id,
-                    is_public=is_public,
-                    search=search
-                )
+            return await _fetch_resource_page(db, owner_id=owner_id, **listing)
+        
+        # Regular user - get only resources they own or have been shared with them
+        # If owner_id is specified and it's not the current user, ignore it for security
+        if owner_id != current_user.id:
+            return await _fetch_resource_page(db, user_id=current_user.id, **listing)
         
-        # Create paginated response
-        return create_page(resources, total, pagination)
+        # Get only resources owned by the user (with additional filters)
+        return await _fetch_resource_page(db, owner_id=current_user.id, **listing)
     
-    @cached()
     async def get_user_resources(
         self,
         db: AsyncSession,
@@ -169,7 +372,9 @@ class ResourceService:
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = "asc",
         is_public: Optional[bool] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        include_total: IncludeTotal = "exact",
+        search_mode: Optional[str] = None
     ) -> Page[Resource]:
         """
         Get resources owned by or shared with a user.
@@ -182,39 +387,30 @@ class ResourceService:
             sort_order: Optional sort order (asc or desc)
             is_public: Optional public status filter
             search: Optional search term
+            include_total: How to compute the total ("exact", "estimated" or "none")
+            search_mode: Optional search mode ("auto", "substring" or "fulltext")
             
         Returns:
             Page[Resource]: Paginated resources
         """
-        # Get resources
-        resources = await resource_repository.get_by_user(
+        return await _fetch_resource_page(
             db,
+            pagination=pagination,
+            include_total=include_total,
             user_id=user_id,
-            skip=pagination.skip,
-            limit=pagination.limit,
+            is_public=is_public,
+            search=search,
+            search_mode=search_mode,
             sort_by=sort_by,
             sort_order=sort_order,
-            is_public=is_public,
-            search=search
         )
-        
-        # Count total resources
-        total = await resource_repository.count_by_user(
-            db, 
-            user_id=user_id,
-            is_public=is_public,
-            search=search
-        )
-        
-        # Create paginated response
-        return create_page(resources, total, pagination)
     
     async def create_resource(
         self,
         db: AsyncSession,
         *,
         obj_in: ResourceCreate,
-        current_user: User
+        current_user: UserPrincipal
     ) -> Resource:
         """
         Create a new resource.
@@ -237,7 +433,7 @@ class ResourceService:
         *,
         id: int,
         obj_in: ResourceUpdate,
-        current_user: User
+        current_user: UserPrincipal
     ) -> Resource:
         """
         Update a resource.
@@ -280,7 +476,7 @@ class ResourceService:
         db: AsyncSession,
         *,
         id: int,
-        current_user: User
+        current_user: UserPrincipal
     ) -> Resource:
         """
         Delete a resource.
@@ -328,7 +524,7 @@ class ResourceService:
         *,
         id: int,
         share_data: ResourceShare,
-        current_user: User
+        current_user: UserPrincipal
     ) -> None:
         """
         Share a resource with a user.
@@ -375,7 +571,7 @@ class ResourceService:
         *,
         id: int,
         user_id: int,
-        current_user: User
+        current_user: UserPrincipal
     ) -> None:
         """
         Unshare a resource from a user.
@@ -3,10 +3,10 @@ from typing import List, Optional, Dict, Any
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principal import UserPrincipal, invalidate_principal
 from app.models.user import User
 from app.repositories.user import user_repository
 from app.schemas.user import UserCreate, UserUpdate
-from app.utils.caching import cached
 from app.utils.pagination import PaginationParams, create_page, Page
 
 
@@ -15,7 +15,6 @@ class UserService:
     Service for user operations.
     """
     
-    @cached()
     async def get_users(
         self,
         db: AsyncSession,
@@ -114,7 +113,7 @@ class UserService:
         *,
         user_id: int,
         obj_in: UserUpdate,
-        current_user: User
+        current_user: UserPrincipal
     ) -> User:
         """
         Update a user.
@@ -146,14 +145,17 @@ class UserService:
             )
         
         # Update user
-        return await user_repository.update_with_password(db, db_obj=user, obj_in=obj_in)
+        user = await user_repository.update_with_password(db, db_obj=user, obj_in=obj_in)
+        # Authenticated requests must see the new username and status
+        await invalidate_principal(user_id)
+        return user
     
     async def delete_user(
         self,
         db: AsyncSession,
         *,
         user_id: int,
-        current_user: User
+        current_user: UserPrincipal
     ) -> User:
         """
         Delete a user.
@@ -184,13 +186,16 @@ class UserService:
             )
         
         # Delete user
-        return await user_repository.remove(db, id=user_id)
+        user = await user_repository.remove(db, id=user_id)
+        # Tokens of the deleted user must stop authenticating
+        await invalidate_principal(user_id)
+        return user
     
     async def get_me(
         self,
         db: AsyncSession,
         *,
-        current_user: User
+        current_user: UserPrincipal
     ) -> User:
         """
         Get the current user.
@@ -201,8 +206,17 @@ class UserService:
             
         Returns:
             User: Current user
+            
+        Raises:
+            HTTPException: If the user no longer exists
         """
-        return current_user
+        user = await user_repository.get(db, id=current_user.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        return user
 
 
 # Create a singleton instance
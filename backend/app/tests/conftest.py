@@ -68,7 +68,7 @@ async def client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
 
 
 @pytest.fixture
-async def db_session() -> AsyncGenerator[AsyncSession, None]:
+async def db_session(test_app: FastAPI) -> AsyncGenerator[AsyncSession, None]:
     """Get a test database session."""
     async with TestingSessionLocal() as session:
         try:
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routes import auth
+from app.core.config import settings
+from app.core.rate_limit import LoginRateLimiter
+from app.models.token import RevokedToken
+from app.repositories.token import revoked_token_repository
+from app.repositories.user import user_repository
+from app.schemas.user import UserCreate
+
+
+@pytest.mark.asyncio
+async def test_login_attempts_are_rate_limited(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """Test that excess attempts get 429 before the password is checked."""
+    limiter = LoginRateLimiter(per_username=2, per_ip=6, window=60, max_keys=100)
+    monkeypatch.setattr(auth, "login_rate_limiter", limiter)
+    await user_repository.create_with_password(
+        db_session,
+        obj_in=UserCreate(
+            email="rate_limited@example.com", username="rate_limited", password="password123"
+        ),
+    )
+    url = f"{settings.API_V1_STR}/auth/login"
+
+    # Successful sign-ins do not count against the account
+    for _ in range(3):
+        response = await client.post(url, data={"username": "rate_limited", "password": "password123"})
+        assert response.status_code == status.HTTP_200_OK
+
+    for _ in range(2):
+        response = await client.post(url, data={"username": "Rate_Limited", "password": "wrong"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await client.post(url, data={"username": "rate_limited", "password": "password123"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Other accounts are limited by the client IP only
+    response = await client.post(url, data={"username": "someone_else", "password": "wrong"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await client.post(url, data={"username": "someone_else", "password": "wrong"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    stats = limiter.stats()
+    assert stats["allowed"] == 6
+    assert stats["rejected"] == {"username": 1, "ip": 1}
+    assert stats["estimated_cpu_seconds_saved"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_the_token(client: AsyncClient, db_session: AsyncSession):
+    """Test that a token stops working once revoked, even if its user is cached."""
+    await user_repository.create_with_password(
+        db_session,
+        obj_in=UserCreate(email="logout@example.com", username="logout", password="password123"),
+    )
+    tokens = []
+    for _ in range(2):
+        response = await client.post(
+            f"{settings.API_V1_STR}/auth/login",
+            data={"username": "logout", "password": "password123"},
+        )
+        tokens.append(response.json()["access_token"])
+    revoked, kept = ({"Authorization": f"Bearer {token}"} for token in tokens)
+    me = f"{settings.API_V1_STR}/users/me"
+
+    assert (await client.get(me, headers=revoked)).status_code == status.HTTP_200_OK
+    response = await client.post(f"{settings.API_V1_STR}/auth/logout", headers=revoked)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.get(me, headers=revoked)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token has been revoked"
+    assert (await client.get(me, headers=kept)).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_tokens_revoked_by_another_worker_are_rejected_when_cached(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """Test that a cached token stops working once another worker's revocation is loaded."""
+    user = await user_repository.create_with_password(
+        db_session,
+        obj_in=UserCreate(email="remote@example.com", username="remote", password="password123"),
+    )
+    response = await client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": "remote", "password": "password123"},
+    )
+    token = response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    me = f"{settings.API_V1_STR}/users/me"
+    assert (await client.get(me, headers=headers)).status_code == status.HTTP_200_OK
+
+    # Another worker revokes the token: only the shared table changes, no
+    # cache tag is broadcast to this worker
+    jti = jwt.get_unverified_claims(token)["jti"]
+    db_session.add(
+        RevokedToken(
+            jti=jti, user_id=user.id, expires_at=datetime.utcnow() + timedelta(minutes=5)
+        )
+    )
+    await db_session.commit()
+    assert await revoked_token_repository.load_revocations(db_session) >= 1
+
+    response = await client.get(me, headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token has been revoked"
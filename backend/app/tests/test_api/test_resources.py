@@ -0,0 +1,169 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.schemas.user import UserCreate
+from app.repositories.user import user_repository
+
+
+@pytest.mark.asyncio
+async def test_listing_responses_are_cached_and_invalidated(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """Test that cached listing bodies are served until a write invalidates them."""
+    user = await user_repository.create_with_password(
+        db_session,
+        obj_in=UserCreate(
+            email="response_cache@example.com",
+            username="response_cache",
+            password="password123",
+        ),
+    )
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    url = f"{settings.API_V1_STR}/resources/me"
+
+    first = await client.get(url, headers=headers)
+    second = await client.get(url, headers=headers)
+    assert first.status_code == status.HTTP_200_OK
+    assert first.content == second.content
+    assert first.json()["items"] == []
+
+    # Creating a resource invalidates the cached body
+    for i in range(10):
+        response = await client.post(
+            f"{settings.API_V1_STR}/resources/",
+            headers=headers,
+            json={"name": f"cached resource {i}", "description": "x" * 100},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    response = await client.get(url, headers=headers)
+    assert len(response.json()["items"]) == 10
+
+    # Large bodies are served pre-compressed to clients accepting gzip
+    response = await client.get(url, headers={**headers, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.json()["items"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_listing_totals_can_be_skipped(client: AsyncClient, db_session: AsyncSession):
+    """Test that include_total=none skips the count but still reports has_next."""
+    user = await user_repository.create_with_password(
+        db_session,
+        obj_in=UserCreate(
+            email="include_total@example.com",
+            username="include_total",
+            password="password123",
+        ),
+    )
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    for i in range(3):
+        await client.post(
+            f"{settings.API_V1_STR}/resources/", headers=headers, json={"name": f"total {i}"}
+        )
+    url = f"{settings.API_V1_STR}/resources/me?limit=2"
+
+    page_info = (await client.get(f"{url}&include_total=none", headers=headers)).json()["page_info"]
+    assert page_info["total"] is None
+    assert page_info["pages"] is None
+    assert page_info["has_next"] is True
+
+    # SQLite has no planner estimates, so the exact count is used
+    page_info = (await client.get(f"{url}&include_total=estimated", headers=headers)).json()["page_info"]
+    assert page_info["total"] == 3
+    assert page_info["total_is_estimate"] is False
+
+    response = await client.get(f"{url}&include_total=approximate", headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_suggestions_match_visible_name_prefixes(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """Test that suggestions are visible resources whose name starts with the query."""
+    users = []
+    for username in ("suggest_owner", "suggest_other"):
+        users.append(
+            await user_repository.create_with_password(
+                db_session,
+                obj_in=UserCreate(
+                    email=f"{username}@example.com", username=username, password="password123"
+                ),
+            )
+        )
+    owner_headers, other_headers = (
+        {"Authorization": f"Bearer {create_access_token(user.id)}"} for user in users
+    )
+    for name in ("Report 2025", "report_draft", "Annual report", "Repo%rt"):
+        await client.post(
+            f"{settings.API_V1_STR}/resources/", headers=owner_headers, json={"name": name}
+        )
+    url = f"{settings.API_V1_STR}/resources/suggest"
+
+    response = await client.get(url, params={"q": "REPO"}, headers=owner_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [s["name"] for s in response.json()] == ["Repo%rt", "Report 2025", "report_draft"]
+
+    # LIKE wildcards in the query are matched literally
+    response = await client.get(url, params={"q": "repo%"}, headers=owner_headers)
+    assert [s["name"] for s in response.json()] == ["Repo%rt"]
+
+    response = await client.get(url, params={"q": "rep", "limit": 1}, headers=owner_headers)
+    assert len(response.json()) == 1
+
+    # Other users' resources are not suggested
+    response = await client.get(url, params={"q": "rep"}, headers=other_headers)
+    assert response.json() == []
+
+    response = await client.get(url, params={"q": ""}, headers=owner_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_permissions_are_checked_in_batch(client: AsyncClient, db_session: AsyncSession):
+    """Test that one call reports the caller's permission bits on many resources."""
+    owner, grantee = [
+        await user_repository.create_with_password(
+            db_session,
+            obj_in=UserCreate(
+                email=f"{username}@example.com", username=username, password="password123"
+            ),
+        )
+        for username in ("batch_owner", "batch_grantee")
+    ]
+    owner_headers = {"Authorization": f"Bearer {create_access_token(owner.id)}"}
+    grantee_headers = {"Authorization": f"Bearer {create_access_token(grantee.id)}"}
+    ids = []
+    for name, is_public in (("shared", False), ("public", True), ("private", False)):
+        response = await client.post(
+            f"{settings.API_V1_STR}/resources/",
+            headers=owner_headers,
+            json={"name": name, "is_public": is_public},
+        )
+        ids.append(response.json()["id"])
+    await client.post(
+        f"{settings.API_V1_STR}/resources/{ids[0]}/share",
+        headers=owner_headers,
+        json={"user_id": grantee.id, "permission_type": "write"},
+    )
+    url = f"{settings.API_V1_STR}/resources/permissions:check"
+
+    response = await client.post(url, headers=grantee_headers, json={"resource_ids": [*ids, 0]})
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["permission_bits"] == {"read": 1, "write": 2, "admin": 4}
+    assert body["results"] == {str(ids[0]): 3, str(ids[1]): 1, str(ids[2]): 0, "0": 0}
+
+    response = await client.post(
+        url, headers=owner_headers, json={"resource_ids": ids, "permission_types": ["admin"]}
+    )
+    assert response.json()["results"] == {str(i): 4 for i in ids}
+
+    response = await client.post(url, headers=owner_headers, json={"resource_ids": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
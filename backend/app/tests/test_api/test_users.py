@@ -0,0 +1,101 @@
+import pytest
+from fastapi import HTTPException, status
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.api.deps import require_permissions
+from app.core.config import settings
+from app.core.principal import UserPrincipal, principal_cache
+from app.core.security import create_access_token, get_password_hash
+from app.models.role import Permission, Role, role_permission
+from app.models.user import User
+from app.repositories.user import user_repository
+
+
+@pytest.mark.asyncio
+async def test_effective_permissions_follow_role_changes(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """Test that cached effective permissions are invalidated when roles change."""
+    read = Permission(name="rbac_read")
+    write = Permission(name="rbac_write")
+    role = Role(name="rbac_reader", permissions=[read])
+    user = User(
+        email="rbac@example.com",
+        username="rbac",
+        hashed_password=get_password_hash("password123"),
+        roles=[role],
+    )
+    db_session.add_all([write, user])
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    url = f"{settings.API_V1_STR}/users/me/permissions"
+
+    response = await client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"permissions": ["rbac_read"]}
+
+    guard = require_permissions("rbac_write")
+    with pytest.raises(HTTPException) as exc_info:
+        await guard(db=db_session, current_user=user)
+    assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+
+    # Granting a permission to the role takes effect on the next check
+    result = await db_session.execute(
+        select(Role).options(selectinload(Role.permissions)).where(Role.id == role.id)
+    )
+    result.scalar_one().permissions.append(write)
+    await db_session.commit()
+
+    response = await client.get(url, headers=headers)
+    assert response.json() == {"permissions": ["rbac_read", "rbac_write"]}
+    assert await guard(db=db_session, current_user=user) is user
+
+    # So does a bulk Core statement on the association table
+    await db_session.execute(
+        role_permission.delete().where(role_permission.c.permission_id == write.id)
+    )
+    await db_session.commit()
+    response = await client.get(url, headers=headers)
+    assert response.json() == {"permissions": ["rbac_read"]}
+
+
+@pytest.mark.asyncio
+async def test_authenticated_users_are_cached_until_updated(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """Test that repeated requests with a token skip the user lookup until the user changes."""
+    user = User(
+        email="principal@example.com",
+        username="principal",
+        hashed_password=get_password_hash("password123"),
+    )
+    db_session.add(user)
+    await db_session.commit()
+    token = create_access_token(user.id)
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{settings.API_V1_STR}/users/me/permissions"
+
+    await client.get(url, headers=headers)
+    principal, _ = principal_cache.get(token).value
+    assert principal == UserPrincipal(id=user.id, username="principal", is_active=True, is_admin=False)
+
+    # A cached token authenticates without loading the user
+    async def fail_lookup(*args, **kwargs):
+        raise AssertionError("user loaded")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(user_repository, "get", fail_lookup)
+        response = await client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.put(
+        f"{settings.API_V1_STR}/users/me", headers=headers, json={"is_active": False}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert token not in principal_cache
+
+    response = await client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,8 +1,22 @@
+import asyncio
+from datetime import datetime, timedelta
+
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import JWTError, jwk, jwt
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import verify_password
+from app.core.exceptions import ServiceUnavailableError, TooManyRequestsError
+from app.core.config import settings
+from app.core.keys import KeyRing, SigningKey, check_key_configuration
+from app.core.rate_limit import LoginRateLimiter
+from app.core.revocation import RevocationList, revocation_list, revoked_token_tag
+from app.core.security import PasswordHasher, verify_password
+from app.models.token import RevokedToken
 from app.models.user import User
+from app.repositories.token import revoked_token_repository
 from app.schemas.user import UserCreate
 from app.services.auth import auth_service
 
@@ -83,3 +97,168 @@ async def test_create_access_token():
     # Check that the token is a string
     assert isinstance(token, str)
     assert len(token) > 0
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_is_bounded_and_off_the_event_loop():
+    """Test that hashing runs on the pool and calls beyond its bound are rejected."""
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticking = asyncio.create_task(ticker())
+    hashing = asyncio.create_task(hasher.hash("password123"))
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        await hasher.verify("password123", "unused")
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+    hashed = await hashing
+    ticking.cancel()
+    # The event loop kept running while bcrypt worked
+    assert ticks > 1
+    assert await hasher.verify("password123", hashed)
+
+    stats = hasher.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["peak_pending"] == 1
+    assert stats["pending"] == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limit_is_shared_through_redis():
+    """Test that workers sharing a Redis server share their attempt counts."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    workers = [
+        LoginRateLimiter(
+            per_username=3,
+            per_ip=100,
+            window=60,
+            max_keys=10,
+            client=fakeredis.aioredis.FakeRedis(server=server),
+        )
+        for _ in range(2)
+    ]
+
+    await workers[0].hit("shared", "10.0.0.1")
+    await workers[1].hit("shared", "10.0.0.2")
+    counter = await workers[0].hit("shared", "10.0.0.1")
+    with pytest.raises(TooManyRequestsError) as exc_info:
+        await workers[1].hit("SHARED", "10.0.0.2")
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+    # A successful sign-in gives the account's attempt back, to the window
+    # it was counted in
+    client = workers[0].client
+    assert await client.get(counter) == b"3"
+    await workers[0].succeeded("shared", counter)
+    assert await client.get(counter) == b"2"
+    await workers[1].hit("shared", "10.0.0.2")
+    assert workers[1].stats()["rejected"] == {"username": 1, "ip": 0}
+
+
+def test_revocation_list_filters_grows_and_prunes():
+    """Test that revoked tokens are found, the filter grows and expired tokens are pruned."""
+    revocations = RevocationList(capacity=4)
+    assert revocations.load((i, f"jti-{i}", 100 + i) for i in range(1, 11)) == 10
+    assert revocations.last_id == 10
+
+    assert all(revocations.is_revoked(f"jti-{i}") for i in range(1, 11))
+    assert not revocations.is_revoked("not-revoked")
+    assert not revocations.is_revoked(None)
+    stats = revocations.stats()
+    assert stats["filter_capacity"] >= 10
+    assert stats["checks"] == 12
+    assert stats["filter_hits"] - stats["false_positives"] == 10
+
+    assert revocations.prune(now=105) == 5
+    assert not revocations.is_revoked("jti-1")
+    assert revocations.is_revoked("jti-10")
+
+    # Revocations broadcast by other workers arrive as cache tags
+    revocations.handle_invalidation([revoked_token_tag("remote"), "user:1"])
+    revocations.handle_invalidation(None)
+    assert revocations.is_revoked("remote")
+
+
+@pytest.mark.asyncio
+async def test_revoking_a_token_twice_is_a_no_op(db_session: AsyncSession):
+    """Test that revoking an already revoked token does not fail."""
+    user = await auth_service.register_user(
+        db=db_session,
+        user_in=UserCreate(
+            email="revoke@example.com", username="revokeuser", password="password123"
+        ),
+    )
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+    for _ in range(2):
+        await revoked_token_repository.revoke(
+            db_session, jti="revoked-twice", user_id=user.id, expires_at=expires_at
+        )
+
+    count = await db_session.execute(
+        select(func.count()).select_from(RevokedToken).where(RevokedToken.jti == "revoked-twice")
+    )
+    assert count.scalar() == 1
+    assert revocation_list.is_revoked("revoked-twice")
+
+
+def make_ec_jwk(kid: str) -> dict:
+    """Generate a private ES256 JWK."""
+    pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return {**jwk.construct(pem, "ES256").to_dict(), "kid": kid}
+
+
+def test_key_ring_verifies_tokens_across_rotation():
+    """Test that tokens name their key and stay valid after the active key changes."""
+    keys = {"keys": [make_ec_jwk("old"), make_ec_jwk("new")]}
+    old_ring = KeyRing.from_jwks(keys, active_kid="old")
+    new_ring = KeyRing.from_jwks(keys, active_kid="new")
+
+    old_token = old_ring.sign({"sub": "1"})
+    assert jwt.get_unverified_header(old_token)["kid"] == "old"
+    assert new_ring.decode(old_token) == {"sub": "1"}
+    assert old_ring.decode(new_ring.sign({"sub": "2"})) == {"sub": "2"}
+
+    # Only public keys are published
+    published = new_ring.jwks()["keys"]
+    assert [key["kid"] for key in published] == ["old", "new"]
+    assert all("d" not in key and key["alg"] == "ES256" for key in published)
+
+    # Tokens of keys removed from the ring, or signed with another secret, are rejected
+    with pytest.raises(JWTError):
+        KeyRing.from_jwks({"keys": keys["keys"][1:]}).decode(old_token)
+    secret_ring = KeyRing([SigningKey.from_secret("secret")])
+    assert secret_ring.jwks() == {"keys": []}
+    with pytest.raises(JWTError):
+        secret_ring.decode(jwt.encode({"sub": "1"}, "other", algorithm="HS256"))
+
+
+def test_startup_requires_a_shared_signing_key(monkeypatch):
+    """Test that a random per-process key is only accepted in debug mode."""
+    monkeypatch.setattr(settings, "JWT_KEYS_FILE", None)
+    monkeypatch.setattr(settings, "DEBUG", False)
+    # As if SECRET_KEY was left to its random default
+    fields_set = settings.model_fields_set - {"SECRET_KEY"}
+    monkeypatch.setattr(settings, "__pydantic_fields_set__", fields_set)
+    with pytest.raises(RuntimeError):
+        check_key_configuration()
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    check_key_configuration()
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "JWT_KEYS_FILE", "/etc/app/jwt-keys.json")
+    check_key_configuration()
@@ -0,0 +1,274 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.resource import Resource
+from app.models.user import User
+from app.schemas.resource import ResourceCreate, ResourceShare, ResourceUpdate
+from app.schemas.user import UserCreate
+from app.repositories.resource import resource_repository
+from app.repositories.user import user_repository
+from app.services.resource import resource_service
+from app.utils.pagination import PaginationParams
+
+
+async def create_user(db: AsyncSession, username: str, is_admin: bool = False) -> User:
+    """Create a user for a test."""
+    return await user_repository.create_with_password(
+        db,
+        obj_in=UserCreate(
+            email=f"{username}@example.com",
+            username=username,
+            password="password123",
+            is_admin=is_admin,
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_listings(db_session: AsyncSession):
+    """Test that resource writes evict the cached listings they affect."""
+    owner = await create_user(db_session, "cache_owner")
+    grantee = await create_user(db_session, "cache_grantee")
+    pagination = PaginationParams(skip=0, limit=100)
+
+    resource = await resource_service.create_resource(
+        db_session, obj_in=ResourceCreate(name="first"), current_user=owner
+    )
+    page = await resource_service.get_resources(
+        db_session, pagination=pagination, current_user=owner
+    )
+    assert [r.name for r in page.items] == ["first"]
+
+    # Creating a resource invalidates the owner's listing
+    await resource_service.create_resource(
+        db_session, obj_in=ResourceCreate(name="second"), current_user=owner
+    )
+    page = await resource_service.get_resources(
+        db_session, pagination=pagination, current_user=owner
+    )
+    assert [r.name for r in page.items] == ["first", "second"]
+
+    # Sharing invalidates the grantee's listing
+    page = await resource_service.get_resources(
+        db_session, pagination=pagination, current_user=grantee
+    )
+    assert page.items == []
+    await resource_service.share_resource(
+        db_session,
+        id=resource.id,
+        share_data=ResourceShare(user_id=grantee.id, permission_type="read"),
+        current_user=owner,
+    )
+    page = await resource_service.get_resources(
+        db_session, pagination=pagination, current_user=grantee
+    )
+    assert [r.name for r in page.items] == ["first"]
+
+    # Updating a shared resource invalidates the grantee's listing too
+    await resource_service.update_resource(
+        db_session, id=resource.id, obj_in=ResourceUpdate(name="renamed"), current_user=owner
+    )
+    page = await resource_service.get_resources(
+        db_session, pagination=pagination, current_user=grantee
+    )
+    assert [r.name for r in page.items] == ["renamed"]
+
+    # Unsharing removes it again
+    await resource_service.unshare_resource(
+        db_session, id=resource.id, user_id=grantee.id, current_user=owner
+    )
+    page = await resource_service.get_resources(
+        db_session, pagination=pagination, current_user=grantee
+    )
+    assert page.items == []
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_walks_every_resource_once(db_session: AsyncSession):
+    """Test that following next_cursor visits each resource once, in sort order."""
+    owner = await create_user(db_session, "cursor_owner")
+    for i in range(7):
+        await resource_service.create_resource(
+            db_session,
+            obj_in=ResourceCreate(name=f"cursor {i}", description=None if i % 3 else "same"),
+            current_user=owner,
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        page = await resource_service.get_user_resources(
+            db_session,
+            pagination=PaginationParams(limit=3, cursor=cursor),
+            user_id=owner.id,
+            sort_by="description",
+            sort_order="desc",
+        )
+        seen.extend(page.items)
+        # The window-function total is not narrowed by the cursor
+        assert page.page_info.total == 7
+        cursor = page.page_info.next_cursor
+        assert page.page_info.has_next == (cursor is not None)
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len({r.id for r in seen}) == 7
+    keys = [(r.description or "", r.id) for r in seen]
+    assert keys == sorted(keys, reverse=True)
+
+    # A page past the end still reports the total
+    page = await resource_service.get_user_resources(
+        db_session, pagination=PaginationParams(skip=20, limit=3), user_id=owner.id
+    )
+    assert page.items == []
+    assert page.page_info.total == 7
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_by_timestamp(db_session: AsyncSession):
+    """Test that cursors carry timestamps when sorting by created_at."""
+    owner = await create_user(db_session, "timestamp_owner")
+    created = datetime(2024, 1, 1, 12, 0, 0, 250000)
+    for i in range(5):
+        resource = await resource_service.create_resource(
+            db_session, obj_in=ResourceCreate(name=f"timestamp {i}"), current_user=owner
+        )
+        await db_session.execute(
+            update(Resource)
+            .where(Resource.id == resource.id)
+            .values(created_at=created + timedelta(minutes=i % 3))
+        )
+    await db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = await resource_service.get_user_resources(
+            db_session,
+            pagination=PaginationParams(limit=2, cursor=cursor),
+            user_id=owner.id,
+            sort_by="created_at",
+            sort_order="asc",
+        )
+        seen.extend((r.created_at, r.id) for r in page.items)
+        cursor = page.page_info.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen)
+
+
+@pytest.mark.asyncio
+async def test_fulltext_search_falls_back_to_substring_without_postgres(db_session: AsyncSession):
+    """Test that full-text search degrades to substring matching on SQLite."""
+    owner = await create_user(db_session, "search_owner")
+    await resource_service.create_resource(
+        db_session, obj_in=ResourceCreate(name="Quarterly report"), current_user=owner
+    )
+    await resource_service.create_resource(
+        db_session, obj_in=ResourceCreate(name="Team photo"), current_user=owner
+    )
+
+    page = await resource_service.get_user_resources(
+        db_session,
+        pagination=PaginationParams(),
+        user_id=owner.id,
+        search="report",
+        search_mode="fulltext",
+        sort_by="relevance",
+    )
+    assert [r.name for r in page.items] == ["Quarterly report"]
+
+
+@pytest.mark.asyncio
+async def test_shared_access_follows_shares_and_unshares(db_session: AsyncSession):
+    """Test that access is granted and revoked as shares change."""
+    owner = await create_user(db_session, "visibility_owner")
+    grantee = await create_user(db_session, "visibility_grantee")
+    resource = await resource_service.create_resource(
+        db_session, obj_in=ResourceCreate(name="private"), current_user=owner
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await resource_service.get_resource(db_session, id=resource.id, current_user=grantee)
+    assert exc_info.value.status_code == 403
+
+    await resource_service.share_resource(
+        db_session,
+        id=resource.id,
+        share_data=ResourceShare(user_id=grantee.id, permission_type="read"),
+        current_user=owner,
+    )
+    found = await resource_service.get_resource(db_session, id=resource.id, current_user=grantee)
+    assert found.id == resource.id
+    assert found.permissions[grantee.id].permission_type == "read"
+    assert not found.has_permission(grantee.id, "write")
+
+    await resource_service.unshare_resource(
+        db_session, id=resource.id, user_id=grantee.id, current_user=owner
+    )
+    with pytest.raises(HTTPException):
+        await resource_service.get_resource(db_session, id=resource.id, current_user=grantee)
+    page = await resource_service.get_resources(
+        db_session, pagination=PaginationParams(), current_user=grantee
+    )
+    assert page.items == []
+
+
+@pytest.mark.asyncio
+async def test_slow_suggestions_are_abandoned_off_the_request_session(
+    db_session: AsyncSession, monkeypatch
+):
+    """Test that a lookup past the deadline returns nothing and spares the caller's session."""
+    owner = await create_user(db_session, "slow_suggest")
+    sessions = []
+
+    async def slow_suggest_names(db, **kwargs):
+        sessions.append(db)
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(settings, "SUGGEST_TIMEOUT_MS", 10)
+    monkeypatch.setattr(resource_repository, "suggest_names", slow_suggest_names)
+    suggestions = await resource_service.suggest_resources(
+        db_session, query="slow", current_user=owner
+    )
+
+    assert suggestions == []
+    assert sessions and sessions[0] is not db_session
+    assert (await db_session.execute(select(func.count(Resource.id)))).scalar() >= 0
+
+
+@pytest.mark.asyncio
+async def test_only_unfiltered_totals_are_estimated(db_session: AsyncSession, monkeypatch):
+    """Test that filtered listings count exactly instead of trusting planner estimates."""
+    admin = await create_user(db_session, "estimate_admin", is_admin=True)
+    await resource_service.create_resource(
+        db_session, obj_in=ResourceCreate(name="estimated"), current_user=admin
+    )
+
+    async def estimate_count(db):
+        return 1_000_000
+
+    monkeypatch.setattr(resource_repository, "estimate_count", estimate_count)
+    pagination = PaginationParams(limit=1)
+    page = await resource_service.get_resources(
+        db_session, pagination=pagination, current_user=admin, include_total="estimated"
+    )
+    assert (page.page_info.total, page.page_info.total_is_estimate) == (1_000_000, True)
+
+    page = await resource_service.get_resources(
+        db_session,
+        pagination=pagination,
+        current_user=admin,
+        search="estimated",
+        include_total="estimated",
+    )
+    assert (page.page_info.total, page.page_info.total_is_estimate) == (1, False)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.principal import (
+    UserPrincipal,
+    cache_principal,
+    get_cached_principal,
+    principal_cache,
+    principal_tag,
+)
+from app.utils.caching import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    TieredCacheBackend,
+    get_cache,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_server():
+    """Create an in-process Redis stand-in shared by several clients."""
+    return fakeredis.FakeServer()
+
+
+def make_client(server):
+    """Create a client connected to the fake server."""
+    return fakeredis.aioredis.FakeRedis(server=server)
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip(redis_server):
+    """Test storing, reading and tag-invalidating entries in Redis."""
+    backend = RedisCacheBackend(client=make_client(redis_server), prefix="test:")
+    await backend.set("ns", ("key", 1), {"value": 1}, ttl=60, tags=["user:1"])
+    await backend.set("ns", ("key", 2), {"value": 2}, ttl=60, tags=["user:2"])
+
+    entry = await backend.get("ns", ("key", 1))
+    assert entry.value == {"value": 1}
+    assert not entry.is_stale
+
+    assert await backend.invalidate_tags(["user:1"]) == 1
+    assert await backend.get("ns", ("key", 1)) is None
+    assert (await backend.get("ns", ("key", 2))).value == {"value": 2}
+
+    assert await backend.clear("ns") == 1
+    assert await backend.get("ns", ("key", 2)) is None
+
+
+@pytest.mark.asyncio
+async def test_tiered_backend_shares_entries_between_workers(redis_server):
+    """Test that an entry written by one worker is served to another."""
+    worker_a = TieredCacheBackend(
+        MemoryCacheBackend(), RedisCacheBackend(client=make_client(redis_server), prefix="tier:")
+    )
+    worker_b = TieredCacheBackend(
+        MemoryCacheBackend(), RedisCacheBackend(client=make_client(redis_server), prefix="tier:")
+    )
+    await worker_a.set("tiered.shared", "key", "value", ttl=60, tags=["user:1"])
+
+    # Drop the shared in-process copy so worker B has to go to L2
+    get_cache("tiered.shared").clear()
+    entry = await worker_b.get("tiered.shared", "key")
+    assert entry.value == "value"
+    assert "key" in get_cache("tiered.shared")
+
+
+@pytest.mark.asyncio
+async def test_tiered_backend_broadcasts_invalidations(redis_server):
+    """Test that invalidations published by one worker clear another's L1."""
+    listener = TieredCacheBackend(
+        MemoryCacheBackend(), RedisCacheBackend(client=make_client(redis_server), prefix="bus:")
+    )
+    publisher = TieredCacheBackend(
+        MemoryCacheBackend(), RedisCacheBackend(client=make_client(redis_server), prefix="bus:")
+    )
+    await listener.start()
+    try:
+        # Give the listener time to subscribe
+        await asyncio.sleep(0.05)
+        get_cache("tiered.bus").set("key", "value", ttl=60, tags=["user:7"])
+
+        await publisher._publish({"tags": ["user:7"]})
+        for _ in range(50):
+            if "key" not in get_cache("tiered.bus"):
+                break
+            await asyncio.sleep(0.01)
+
+        assert "key" not in get_cache("tiered.bus")
+    finally:
+        await listener.stop()
+
+
+@pytest.mark.asyncio
+async def test_tiered_backend_broadcasts_reach_cached_principals(redis_server):
+    """Test that another worker's principal invalidation drops this worker's entries."""
+    backend = TieredCacheBackend(
+        MemoryCacheBackend(), RedisCacheBackend(client=make_client(redis_server), prefix="auth:")
+    )
+    principal = UserPrincipal(id=9, username="remote", is_active=True, is_admin=True)
+    cache_principal("remote-token", principal, expires_at=None, duration=0.001)
+    assert get_cached_principal("remote-token") == principal
+
+    await backend.handle_message(json.dumps({"origin": "other", "tags": [principal_tag(9)]}))
+    assert get_cached_principal("remote-token") is None
+
+
+def test_principals_are_cached_briefly_without_broadcasts():
+    """Test that the memory backend caps how long other workers may serve stale principals."""
+    principal = UserPrincipal(id=10, username="unshared", is_active=True, is_admin=False)
+    cache_principal("unshared-token", principal, expires_at=None, duration=0.001)
+
+    entry = principal_cache.get("unshared-token")
+    assert entry.expires_at - time.monotonic() <= settings.AUTH_CACHE_UNSHARED_TTL_SECONDS
@@ -0,0 +1,328 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.models.user import User
+from app.utils.caching import (
+    CacheEngine,
+    cached,
+    get_cache,
+    get_cache_stats,
+    invalidate_tags,
+    make_cache_key,
+)
+from app.utils.pagination import PaginationParams
+from app.utils.response_cache import cached_json_response
+
+
+def test_lru_evicts_least_recently_used():
+    """Test that the LRU policy evicts the least recently used entry."""
+    cache = CacheEngine("test.lru", max_entries=2, max_bytes=1024 * 1024)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+
+    # Touch "a" so "b" becomes the eviction victim
+    assert cache.get("a").value == 1
+    cache.set("c", 3, ttl=60)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.evictions == 1
+
+
+def test_byte_budget_is_enforced():
+    """Test that entries are evicted to stay within the byte budget."""
+    cache = CacheEngine("test.bytes", max_entries=100, max_bytes=4096)
+    for i in range(20):
+        cache.set(i, "x" * 1000, ttl=60)
+
+    assert cache.current_bytes <= 4096
+    assert len(cache) < 20
+    assert 19 in cache
+
+    # A value larger than the whole budget is not cached at all
+    assert cache.set("huge", "x" * 10000, ttl=60) is False
+    assert "huge" not in cache
+
+
+def test_expired_entries_are_not_returned():
+    """Test that expired entries are dropped on access."""
+    cache = CacheEngine("test.expired", max_entries=10, max_bytes=1024 * 1024)
+    cache.set("a", 1, ttl=-1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+
+
+def test_expired_entries_are_swept_in_batches():
+    """Test that expired entries are removed earliest first, in bounded batches."""
+    cache = CacheEngine("test.sweep", max_entries=100, max_bytes=1024 * 1024)
+    for i in range(10):
+        cache.set(("expired", i), i, ttl=-1)
+    cache.set("live", 1, ttl=60)
+    # A replaced entry leaves an outdated heap item behind
+    cache.set(("expired", 0), 0, ttl=60)
+    
+    assert cache.clear_expired(limit=4) == 4
+    assert cache.clear_expired() == 5
+    assert cache.clear_expired() == 0
+    assert len(cache) == 2
+    assert ("expired", 0) in cache
+    assert cache.expirations == 9
+
+
+def test_tinylfu_keeps_frequently_used_entries():
+    """Test that TinyLFU admission protects hot entries from a scan."""
+    cache = CacheEngine("test.tinylfu", max_entries=100, max_bytes=1024 * 1024, policy="tinylfu")
+    for i in range(100):
+        cache.set(("hot", i), i, ttl=60)
+    for _ in range(5):
+        for i in range(100):
+            cache.get(("hot", i))
+
+    # A one-off scan of cold keys must not flush the hot working set
+    for i in range(1000):
+        cache.get(("cold", i))
+        cache.set(("cold", i), i, ttl=60)
+
+    hot_survivors = sum(1 for i in range(100) if ("hot", i) in cache)
+    assert hot_survivors >= 90
+    assert len(cache) <= 100
+
+
+def test_invalidate_tags_removes_only_tagged_entries():
+    """Test that tag invalidation leaves unrelated entries alone."""
+    cache = CacheEngine("test.tags", max_entries=10, max_bytes=1024 * 1024)
+    cache.set("a", 1, ttl=60, tags=["user:1", "resource:1"])
+    cache.set("b", 2, ttl=60, tags=["user:2", "resource:1"])
+    cache.set("c", 3, ttl=60, tags=["user:2"])
+
+    assert cache.invalidate_tags(["resource:1"]) == 2
+    assert "a" not in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.tag_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator_uses_bounded_cache():
+    """Test that the decorator stores results in a per-function cache."""
+    calls = []
+
+    @cached(max_entries=2)
+    async def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    assert await square(2) == 4
+    assert await square(2) == 4
+    assert calls == [2]
+
+    await square(3)
+    await square(4)
+    assert len(square.cache) == 2
+    assert square.cache is get_cache(square.__qualname__)
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator_tags_entries():
+    """Test that decorated results can be invalidated by their tags."""
+    calls = []
+
+    @cached(tags=lambda kwargs, result: [f"user:{kwargs['user_id']}"])
+    async def listing(*, user_id: int) -> list:
+        calls.append(user_id)
+        return [user_id]
+
+    await listing(user_id=1)
+    await listing(user_id=2)
+    await invalidate_tags("user:1")
+    await listing(user_id=1)
+    await listing(user_id=2)
+
+    assert calls == [1, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_coalesced():
+    """Test that concurrent misses on the same key run the function once."""
+    calls = []
+    release = asyncio.Event()
+
+    @cached()
+    async def slow(x: int) -> int:
+        calls.append(x)
+        await release.wait()
+        return x * 10
+
+    tasks = [asyncio.create_task(slow(1)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [10] * 5
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_receive_leader_error():
+    """Test that an error raised by the leader reaches every follower."""
+    calls = []
+    release = asyncio.Event()
+
+    @cached()
+    async def failing(x: int) -> int:
+        calls.append(x)
+        await release.wait()
+        raise RuntimeError("boom")
+
+    tasks = [asyncio.create_task(failing(1)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert calls == [1]
+    assert len(failing.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_refreshing():
+    """Test that a stale entry is returned and refreshed in the background."""
+    values = iter([1, 2, 3])
+
+    @cached(soft_ttl=0, jitter=0)
+    async def counter() -> int:
+        return next(values)
+
+    assert await counter() == 1
+    # Stale: the old value is served and a refresh is scheduled once
+    assert await counter() == 1
+    assert await counter() == 1
+    await asyncio.sleep(0.01)
+    assert await counter() == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_responses_are_refreshed_on_a_fresh_session(db_session: AsyncSession):
+    """Test that a stale response body is served while a new session recomputes it."""
+
+    class Counter(BaseModel):
+        value: int
+
+    values = iter([1, 2])
+    sessions = []
+
+    async def compute(session: AsyncSession) -> dict:
+        sessions.append(session)
+        return {"value": next(values)}
+
+    async def respond() -> bytes:
+        response = await cached_json_response(
+            Request({"type": "http", "headers": []}),
+            db_session,
+            namespace="test.stale_response",
+            key=("counter",),
+            model=Counter,
+            compute=compute,
+            tags=lambda content: [],
+            soft_ttl=0,
+        )
+        return response.body
+
+    assert await respond() == b'{"value":1}'
+    assert await respond() == b'{"value":1}'
+    await asyncio.sleep(0.05)
+    assert await respond() == b'{"value":2}'
+    assert sessions[0] is db_session
+    assert sessions[1] is not db_session
+
+
+@pytest.mark.asyncio
+async def test_concurrent_response_misses_compute_once(db_session: AsyncSession):
+    """Test that identical concurrent response cache misses share one computation."""
+
+    class Counter(BaseModel):
+        value: int
+
+    calls = 0
+
+    async def compute(session: AsyncSession) -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    async def respond() -> bytes:
+        response = await cached_json_response(
+            Request({"type": "http", "headers": []}),
+            db_session,
+            namespace="test.coalesced_response",
+            key=("counter",),
+            model=Counter,
+            compute=compute,
+            tags=lambda content: [],
+        )
+        return response.body
+
+    bodies = await asyncio.gather(*(respond() for _ in range(5)))
+
+    assert bodies == [b'{"value":1}'] * 5
+    assert calls == 1
+    assert get_cache("test.coalesced_response").coalesced == 4
+
+
+def test_soft_ttl_precedes_hard_ttl():
+    """Test that an entry becomes stale before it expires."""
+    cache = CacheEngine("test.jitter", max_entries=10, max_bytes=1024 * 1024)
+    cache.set("a", 1, ttl=60, soft_ttl=30)
+    entry = cache.get("a")
+
+    assert entry.stale_at < entry.expires_at
+    assert not entry.is_stale
+
+
+def test_cache_key_uses_key_extractors():
+    """Test that known argument types are reduced to their identifying fields."""
+    user = User(id=7, username="keyuser", email="key@example.com", is_admin=False)
+    key = make_cache_key(
+        (),
+        {"pagination": PaginationParams(skip=10, limit=20), "current_user": user, "search": None},
+    )
+
+    assert key == ((), "current_user", (7, False), "pagination", (10, 20, None), "search", None)
+    assert make_cache_key((), {"search": None, "current_user": user}) == make_cache_key(
+        (), {"current_user": user, "search": None}
+    )
+    hash(key)
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_track_counters_and_largest_entries():
+    """Test that per-function counters and the largest entries are reported."""
+    
+    @cached()
+    async def payload(n: int) -> str:
+        await asyncio.sleep(0.001)
+        return "x" * n
+    
+    await payload(10)
+    await payload(5000)
+    await payload(10)
+    payload.cache.set("expired", 1, ttl=-1)
+    payload.cache.get("expired")
+    
+    stats = get_cache_stats(top=1)
+    info = stats["caches"][payload.__qualname__]
+    assert info["hits"] == 1
+    assert info["misses"] == 2
+    assert info["hit_ratio"] == pytest.approx(1 / 3)
+    assert info["expirations"] == 1
+    assert info["avg_miss_latency_ms"] > 0
+    assert info["latency_saved_seconds"] > 0
+    assert len(stats["largest_entries"]) == 1
+    assert stats["largest_entries"][0]["size"] >= 5000
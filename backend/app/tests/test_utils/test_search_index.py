@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.resource import Resource
+from app.repositories import resource as resource_module
+from app.repositories.resource import resource_repository, resource_search_index
+from app.schemas.resource import ResourceCreate, ResourceUpdate
+from app.utils.caching import ALL_RESOURCES_TAG, invalidate_tags, resource_tag
+from app.utils.search_index import InvertedIndex
+
+
+def test_index_matches_every_term_by_prefix():
+    """Test that queries match documents containing all terms, as prefixes."""
+    index = InvertedIndex()
+    index.add(1, ["Quarterly report", "Finance team"])
+    index.add(2, ["Annual report", None])
+    index.add(3, ["Team photo"])
+
+    assert index.search("report").tolist() == [1, 2]
+    assert index.search("REP").tolist() == [1, 2]
+    assert index.search("rep team").tolist() == [1]
+    assert index.search("rep", prefix=False).tolist() == []
+    assert index.search("missing team").tolist() == []
+    assert index.search("  ").tolist() == []
+
+
+def test_index_replaces_and_removes_documents():
+    """Test that updated and removed documents no longer match their old terms."""
+    index = InvertedIndex()
+    index.add(1, ["draft notes"])
+    index.add(1, ["final notes"])
+
+    assert index.search("draft").tolist() == []
+    assert index.search("notes").tolist() == [1]
+    assert index.term_count == 2
+
+    assert index.remove(1) is True
+    assert index.remove(1) is False
+    assert len(index) == 0
+    assert index.term_count == 0
+
+
+@pytest.mark.asyncio
+async def test_repository_searches_use_the_index(db_session: AsyncSession, monkeypatch):
+    """Test that the enabled index is built, maintained and used by listings."""
+    monkeypatch.setattr(settings, "SEARCH_INDEX_ENABLED", True)
+    report = await resource_repository.create_with_owner(
+        db_session,
+        obj_in=ResourceCreate(name="Budget", meta_data='{"tags": ["finance"]}'),
+        owner_id=1,
+    )
+    try:
+        await resource_repository.build_search_index(db_session)
+        assert resource_search_index.ready
+
+        # Metadata tags are indexed; substring matches inside a word are not
+        found = await resource_repository.get_with_filter(db_session, search="fin")
+        assert [r.id for r in found] == [report.id]
+        assert await resource_repository.get_with_filter(db_session, search="udget") == []
+
+        # Writes keep the index up to date
+        await resource_repository.update(
+            db_session,
+            db_obj=await resource_repository.get(db_session, id=report.id),
+            obj_in=ResourceUpdate(name="Forecast"),
+        )
+        found = await resource_repository.get_with_filter(db_session, search="forecast")
+        assert [r.id for r in found] == [report.id]
+
+        await resource_repository.remove(db_session, id=report.id)
+        assert report.id not in resource_search_index
+    finally:
+        resource_search_index.clear()
+
+
+@pytest.mark.asyncio
+async def test_index_follows_other_workers_and_caps_inline_ids(
+    db_session: AsyncSession, monkeypatch
+):
+    """Test that remote writes are re-read and broad matches keep prefix semantics."""
+    monkeypatch.setattr(settings, "SEARCH_INDEX_ENABLED", True)
+    resource = await resource_repository.create_with_owner(
+        db_session, obj_in=ResourceCreate(name="Roadmap"), owner_id=1
+    )
+    try:
+        await resource_repository.build_search_index(db_session)
+
+        # Another worker renames the resource and broadcasts its tag
+        await db_session.execute(
+            update(Resource).where(Resource.id == resource.id).values(name="Quokka timeline")
+        )
+        await db_session.commit()
+        resource_module._handle_search_invalidation([resource_tag(resource.id), "user:1"])
+        found = await resource_repository.get_with_filter(db_session, search="quokka")
+        assert [r.id for r in found] == [resource.id]
+        assert not resource_module._stale_search_ids
+
+        # Searches match the same resources on both sides of the inline cap
+        inline = await resource_repository.get_with_filter(db_session, search="quok")
+        assert await resource_repository.get_with_filter(db_session, search="imeline") == []
+        monkeypatch.setattr(resource_module, "_MAX_INLINE_SEARCH_IDS", 0)
+        await invalidate_tags(ALL_RESOURCES_TAG)
+        bound = await resource_repository.get_with_filter(db_session, search="quok")
+        assert [r.id for r in bound] == [r.id for r in inline] == [resource.id]
+        assert await resource_repository.get_with_filter(db_session, search="imeline") == []
+    finally:
+        resource_search_index.clear()
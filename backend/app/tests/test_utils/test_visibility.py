@@ -0,0 +1,60 @@
+from app.utils.caching import user_tag
+from app.utils.visibility import VisibilityIndex
+
+
+def test_sets_are_maintained_incrementally():
+    """Test that shares and unshares update a loaded set in place."""
+    index = VisibilityIndex(max_users=10, max_ids=100, ttl=60)
+    assert index.put(1, [5, 3], index.epoch)
+
+    index.add(1, 4)
+    index.add(1, 4)
+    index.discard(5, [1, 2])
+    assert index.get(1).tolist() == [3, 4]
+    assert index.contains(1, 4) is True
+    assert index.contains(1, 5) is False
+    # Users without a loaded set are left to the next load
+    index.add(2, 7)
+    assert index.contains(2, 7) is None
+    assert index.size == 2
+
+
+def test_loads_racing_with_writes_are_dropped():
+    """Test that a set read before a write is not stored after it."""
+    index = VisibilityIndex(max_users=10, max_ids=100, ttl=60)
+    epoch = index.epoch
+    index.add(1, 9)
+
+    assert index.put(1, [3], epoch) is False
+    assert index.get(1) is None
+
+
+def test_least_recently_used_sets_are_evicted():
+    """Test that the user and ID limits evict the least recently used sets."""
+    index = VisibilityIndex(max_users=2, max_ids=5, ttl=60)
+    index.put(1, [1], index.epoch)
+    index.put(2, [2], index.epoch)
+    index.get(1)
+    index.put(3, [3], index.epoch)
+    assert index.get(2) is None
+    assert index.evictions == 1
+
+    index.put(4, [1, 2, 3, 4, 5], index.epoch)
+    assert len(index) == 1
+    assert index.size == 5
+    # A set larger than the whole budget is not stored
+    assert index.put(5, range(6), index.epoch) is False
+
+
+def test_remote_invalidations_drop_user_sets():
+    """Test that user tags invalidated by other workers drop those users' sets."""
+    index = VisibilityIndex(max_users=10, max_ids=100, ttl=60)
+    index.put(1, [1], index.epoch)
+    index.put(2, [2], index.epoch)
+
+    index.handle_invalidation([user_tag(1), "resource:2"])
+    assert index.get(1) is None
+    assert index.get(2).tolist() == [2]
+
+    index.handle_invalidation(None)
+    assert len(index) == 0
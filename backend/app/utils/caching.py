@@ -1,212 +1,1412 @@
+import asyncio
 import functools
 import hashlib
+import heapq
+import inspect
+import itertools
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, TypeVar, cast
+import pickle
+import random
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.session import get_db
+from app.models.user import User
+from app.utils.pagination import PaginationParams
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache
-_cache: Dict[str, Dict[str, Any]] = {}
-
 T = TypeVar("T")
 
+# Supported eviction policies
+POLICY_LRU = "lru"
+POLICY_TINYLFU = "tinylfu"
+
+# Attributes that never contribute to the size of a cached value
+_SKIPPED_ATTRIBUTES = ("_sa_instance_state",)
+
+# Tag attached to entries whose result may contain any resource
+ALL_RESOURCES_TAG = "resources:all"
+
+# Tag attached to entries whose result may contain any user
+ALL_USERS_TAG = "users:all"
+
+# Tag attached to entries derived from roles and their permissions
+ALL_ROLES_TAG = "roles:all"
+
+# Incremented on every invalidation so in-flight calls can detect that
+# the result they are about to store may already be stale
+_invalidation_epoch = 0
+
+# Weight of the latest miss in the moving average of miss latency
+_MISS_LATENCY_ALPHA = 0.1
+
+# Background refreshes of stale entries (kept referenced until done)
+_refresh_tasks: Set[asyncio.Task] = set()
+
+# In-process state derived from cached data, notified of invalidations
+# received from other workers (None when a whole namespace was cleared)
+_remote_invalidation_listeners: List[Callable[[Optional[List[str]]], None]] = []
+
 
-def _get_cache_key(func: Callable, *args: Any, **kwargs: Any) -> str:
+def user_tag(user_id: Any) -> str:
     """
-    Generate a cache key based on function name and arguments.
+    Get the tag for entries scoped to a user.
     
     Args:
-        func: Function to cache
-        args: Positional arguments
-        kwargs: Keyword arguments
+        user_id: User ID
         
     Returns:
-        str: Cache key
+        str: Cache tag
     """
-    # Convert args and kwargs to a string representation
-    key_parts = [func.__module__, func.__name__]
+    return f"user:{user_id}"
+
+
+def resource_tag(resource_id: Any) -> str:
+    """
+    Get the tag for entries containing a resource.
     
-    # Add args to key parts
-    for arg in args:
-        if isinstance(arg, (str, int, float, bool, type(None))):
-            key_parts.append(str(arg))
-        elif hasattr(arg, "__dict__"):
-            # For objects, use their __dict__ representation
-            key_parts.append(str(arg.__dict__))
+    Args:
+        resource_id: Resource ID
+        
+    Returns:
+        str: Cache tag
+    """
+    return f"resource:{resource_id}"
+
+
+def add_remote_invalidation_listener(listener: Callable[[Optional[List[str]]], None]) -> None:
+    """
+    Register a callback for invalidations broadcast by other workers.
+    
+    Args:
+        listener: Callable receiving the invalidated tags, or None when
+            cache entries were cleared without tags
+    """
+    _remote_invalidation_listeners.append(listener)
+
+
+def get_invalidation_epoch() -> int:
+    """
+    Get the current invalidation epoch.
+    
+    Callers caching a result outside the ``cached`` decorator compare the
+    epoch before and after computing it, and skip storing the result if an
+    invalidation happened in between.
+    
+    Returns:
+        int: Invalidation epoch
+    """
+    return _invalidation_epoch
+
+
+def _estimate_size(obj: Any, _seen: Optional[set] = None, _depth: int = 0) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+    
+    Walks containers, pydantic models and ORM instances a few levels deep
+    and sums ``sys.getsizeof`` of everything reachable, without serializing.
+    
+    Args:
+        obj: Value to measure
+        
+    Returns:
+        int: Estimated size in bytes
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))) or _depth > 6:
+        return size
+    
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += _estimate_size(k, _seen, _depth + 1)
+            size += _estimate_size(v, _seen, _depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _estimate_size(item, _seen, _depth + 1)
+    elif hasattr(obj, "__dict__"):
+        for k, v in vars(obj).items():
+            if k not in _SKIPPED_ATTRIBUTES:
+                size += _estimate_size(v, _seen, _depth + 1)
+    elif hasattr(obj, "__slots__"):
+        for k in obj.__slots__:
+            size += _estimate_size(getattr(obj, k, None), _seen, _depth + 1)
+    return size
+
+
+class CacheEntry:
+    """
+    A single cached value.
+    
+    Attributes:
+        value: Cached result
+        expires_at: Monotonic time after which the entry is expired
+        stale_at: Monotonic time after which the entry should be refreshed
+        size: Estimated size of the value in bytes
+        tags: Tags used to invalidate the entry
+    """
+    
+    __slots__ = ("value", "expires_at", "stale_at", "size", "tags")
+    
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        size: int,
+        tags: tuple = (),
+        stale_at: Optional[float] = None,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_at = expires_at if stale_at is None else stale_at
+        self.size = size
+        self.tags = tags
+    
+    @property
+    def is_stale(self) -> bool:
+        """Whether the entry is past its soft TTL."""
+        return self.stale_at <= time.monotonic()
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of key access frequencies used for TinyLFU admission.
+    
+    Counters saturate at 15 and are halved every ``10 * width`` increments so
+    that keys which were popular a long time ago lose their advantage.
+    """
+    
+    _SEEDS = (0x97CB3127, 0xB71C71A5, 0x9E3779B1, 0x85EBCA6B)
+    
+    def __init__(self, capacity: int):
+        # Four counters per cached entry keep collisions between cold and hot keys rare
+        width = 16
+        while width < capacity * 4:
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in self._SEEDS]
+        self._additions = 0
+        self._sample_size = 10 * width
+    
+    def _indexes(self, key: Hashable) -> List[int]:
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return [
+            (((h ^ seed) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 40 & self._mask
+            for seed in self._SEEDS
+        ]
+    
+    def increment(self, key: Hashable) -> None:
+        """
+        Record an access to a key.
+        
+        Args:
+            key: Accessed key
+        """
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+        
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [bytearray(c >> 1 for c in row) for row in self._rows]
+            self._additions //= 2
+    
+    def frequency(self, key: Hashable) -> int:
+        """
+        Estimate how often a key has been accessed recently.
+        
+        Args:
+            key: Key to look up
+            
+        Returns:
+            int: Estimated access frequency (0-15)
+        """
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+
+class CacheEngine:
+    """
+    Bounded in-process cache with O(1) eviction.
+    
+    Entries are kept in insertion/access order so the least recently used
+    entry is always at the front. With the ``tinylfu`` policy new entries land
+    in a small admission window (1% of capacity); when the window overflows
+    its oldest entry only enters the main region if it has been requested
+    more often than the main region's eviction victim (W-TinyLFU).
+    
+    Expiry times are also kept in a min-heap so expired entries can be swept
+    in bounded batches without scanning the whole cache. Heap items of
+    entries removed for other reasons are skipped when they surface.
+    
+    Attributes:
+        name: Name of the cache (the qualified name of the cached function)
+        max_entries: Maximum number of entries
+        max_bytes: Maximum estimated size of all entries in bytes
+        policy: Eviction policy ("lru" or "tinylfu")
+        current_bytes: Estimated size of all entries in bytes
+        evictions: Number of entries evicted to respect the limits
+        expirations: Number of entries dropped because they expired
+        hits: Number of calls served from the cache
+        misses: Number of calls that computed their result
+        coalesced: Number of calls that awaited an identical call in flight
+        miss_latency: Moving average of the time taken by misses in seconds
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        policy: str = POLICY_LRU,
+    ):
+        if policy not in (POLICY_LRU, POLICY_TINYLFU):
+            raise ValueError(f"Unknown cache eviction policy: {policy}")
+        
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.current_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.miss_latency = 0.0
+        
+        self._main: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._window: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[Hashable]] = {}
+        # (expires_at, sequence, key) of stored entries, possibly outdated
+        self._expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self._expiry_sequence = itertools.count()
+        self._sketch: Optional[FrequencySketch] = None
+        self._window_capacity = 0
+        if policy == POLICY_TINYLFU:
+            self._sketch = FrequencySketch(self.max_entries)
+            self._window_capacity = max(1, self.max_entries // 100)
+    
+    def __len__(self) -> int:
+        return len(self._main) + len(self._window)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._main or key in self._window
+    
+    @property
+    def tag_count(self) -> int:
+        """Number of distinct tags attached to live entries."""
+        return len(self._tag_index)
+    
+    @property
+    def latency_saved(self) -> float:
+        """Estimated time in seconds saved by hits, assuming each would have cost an average miss."""
+        return self.hits * self.miss_latency
+    
+    def record_hit(self) -> None:
+        """Count a call served from the cache."""
+        self.hits += 1
+    
+    def record_miss(self, duration: float) -> None:
+        """
+        Count a call that computed its result.
+        
+        Args:
+            duration: Time taken to compute the result in seconds
+        """
+        self.misses += 1
+        if self.misses == 1:
+            self.miss_latency = duration
         else:
-            # For other types, use their string representation
-            key_parts.append(str(arg))
-    
-    # Add kwargs to key parts
-    for k, v in sorted(kwargs.items()):
-        if isinstance(v, (str, int, float, bool, type(None))):
-            key_parts.append(f"{k}:{v}")
-        elif hasattr(v, "__dict__"):
-            # For objects, use their __dict__ representation
-            key_parts.append(f"{k}:{v.__dict__}")
+            self.miss_latency += _MISS_LATENCY_ALPHA * (duration - self.miss_latency)
+    
+    def items(self) -> List[tuple]:
+        """
+        Get a snapshot of all entries.
+        
+        Returns:
+            List[tuple]: (key, entry) pairs
+        """
+        return list(self._window.items()) + list(self._main.items())
+    
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Get a live entry and mark it as recently used.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Optional[CacheEntry]: The entry if present and not expired, None otherwise
+        """
+        if self._sketch is not None:
+            self._sketch.increment(key)
+        
+        segment = self._main
+        entry = segment.get(key)
+        if entry is None:
+            segment = self._window
+            entry = segment.get(key)
+            if entry is None:
+                return None
+        
+        if entry.expires_at <= time.monotonic():
+            self.delete(key)
+            self.expirations += 1
+            return None
+        
+        segment.move_to_end(key)
+        return entry
+    
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        soft_ttl: Optional[float] = None,
+    ) -> bool:
+        """
+        Store a value, evicting other entries if a limit is exceeded.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds
+            tags: Tags used to invalidate the entry
+            soft_ttl: Optional time in seconds after which the entry is stale
+            
+        Returns:
+            bool: True if the value was stored, False if it is larger than the byte budget
+        """
+        size = _estimate_size(value)
+        self.delete(key)
+        if size > self.max_bytes:
+            logger.debug("Value for %s in cache %s exceeds the byte budget", key, self.name)
+            return False
+        
+        now = time.monotonic()
+        entry = CacheEntry(
+            value,
+            now + ttl,
+            size,
+            tuple(set(tags)),
+            stale_at=None if soft_ttl is None else now + min(soft_ttl, ttl),
+        )
+        if self._sketch is None:
+            self._main[key] = entry
+        else:
+            self._window[key] = entry
+        self.current_bytes += size
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self._push_expiry(key, entry)
+        
+        self._enforce_limits()
+        return True
+    
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove an entry.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            bool: True if an entry was removed
+        """
+        entry = self._main.pop(key, None)
+        if entry is None:
+            entry = self._window.pop(key, None)
+            if entry is None:
+                return False
+        self._forget(key, entry)
+        return True
+    
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Remove all entries carrying any of the given tags.
+        
+        Args:
+            tags: Tags to invalidate
+            
+        Returns:
+            int: Number of removed entries
+        """
+        removed = 0
+        for tag in tags:
+            for key in self._tag_index.pop(tag, ()):
+                if self.delete(key):
+                    removed += 1
+        return removed
+    
+    def clear(self) -> int:
+        """
+        Remove all entries.
+        
+        Returns:
+            int: Number of removed entries
+        """
+        count = len(self)
+        self._main.clear()
+        self._window.clear()
+        self._tag_index.clear()
+        self._expiry_heap.clear()
+        self.current_bytes = 0
+        return count
+    
+    def clear_expired(self, limit: Optional[int] = None) -> int:
+        """
+        Remove expired entries, earliest expiry first.
+        
+        Args:
+            limit: Optional maximum number of entries to remove
+            
+        Returns:
+            int: Number of removed entries
+        """
+        now = time.monotonic()
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] <= now and (limit is None or removed < limit):
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._main.get(key) or self._window.get(key)
+            # Skip items left behind by entries that were replaced or removed
+            if entry is not None and entry.expires_at == expires_at:
+                self.delete(key)
+                removed += 1
+        self.expirations += removed
+        return removed
+    
+    def _push_expiry(self, key: Hashable, entry: CacheEntry) -> None:
+        heap = self._expiry_heap
+        # Rebuild the heap once outdated items outnumber live entries
+        if len(heap) > 2 * len(self) + 64:
+            heap[:] = [
+                (e.expires_at, next(self._expiry_sequence), k) for k, e in self.items()
+            ]
+            heapq.heapify(heap)
         else:
-            # For other types, use their string representation
-            key_parts.append(f"{k}:{v}")
+            heapq.heappush(heap, (entry.expires_at, next(self._expiry_sequence), key))
+    
+    def _forget(self, key: Hashable, entry: CacheEntry) -> None:
+        # Account for an entry that has been removed from its segment
+        self.current_bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+    
+    def _evict(self, segment: "OrderedDict[Hashable, CacheEntry]") -> None:
+        key, entry = segment.popitem(last=False)
+        self._forget(key, entry)
+        self.evictions += 1
+    
+    def _admit(self, key: Hashable, entry: CacheEntry) -> None:
+        # Move a candidate from the admission window into the main region
+        main_capacity = max(1, self.max_entries - self._window_capacity)
+        if len(self._main) >= main_capacity:
+            victim_key = next(iter(self._main))
+            if self._sketch.frequency(key) <= self._sketch.frequency(victim_key):
+                # The candidate is not popular enough to displace the victim
+                self._forget(key, entry)
+                self.evictions += 1
+                return
+            self._evict(self._main)
+        self._main[key] = entry
+    
+    def _enforce_limits(self) -> None:
+        while len(self._window) > self._window_capacity:
+            key, entry = self._window.popitem(last=False)
+            self._admit(key, entry)
+        
+        while len(self) > self.max_entries or self.current_bytes > self.max_bytes:
+            self._evict(self._main if self._main else self._window)
+
+
+# Registry of caches, one per decorated function
+_caches: Dict[str, CacheEngine] = {}
+
+
+def get_cache(
+    name: str,
+    *,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    policy: Optional[str] = None,
+) -> CacheEngine:
+    """
+    Get or create the cache with the given name.
+    
+    Limits configured for the name in ``settings.CACHE_FUNCTION_LIMITS`` take
+    precedence over the arguments, which take precedence over the global
+    ``CACHE_MAX_ENTRIES``, ``CACHE_MAX_BYTES`` and ``CACHE_EVICTION_POLICY``.
+    
+    Args:
+        name: Cache name
+        max_entries: Optional maximum number of entries
+        max_bytes: Optional maximum estimated size in bytes
+        policy: Optional eviction policy ("lru" or "tinylfu")
+        
+    Returns:
+        CacheEngine: The cache
+    """
+    engine = _caches.get(name)
+    if engine is None:
+        limits = settings.CACHE_FUNCTION_LIMITS.get(name, {})
+        engine = CacheEngine(
+            name,
+            max_entries=limits.get("max_entries") or max_entries or settings.CACHE_MAX_ENTRIES,
+            max_bytes=limits.get("max_bytes") or max_bytes or settings.CACHE_MAX_BYTES,
+            policy=limits.get("policy") or policy or settings.CACHE_EVICTION_POLICY,
+        )
+        _caches[name] = engine
+    return engine
+
+
+# Types whose values can be used in cache keys as they are
+_KEY_PRIMITIVES = frozenset((str, int, float, bool, type(None), bytes))
+
+# Arguments of these types never contribute to cache keys
+_KEY_IGNORED_TYPES = (AsyncSession, Request)
+
+# Functions turning values of a type into hashable key parts
+_key_extractors: Dict[type, Callable[[Any], Hashable]] = {}
+
+
+def register_key_extractor(cls: type, extractor: Callable[[Any], Hashable]) -> None:
+    """
+    Register how values of a type are represented in cache keys.
+    
+    Args:
+        cls: Type of the argument
+        extractor: Callable returning a hashable representation of a value
+    """
+    _key_extractors[cls] = extractor
+
+
+def _normalize_key_part(value: Any) -> Hashable:
+    """
+    Turn an argument into a hashable cache key part.
+    
+    Args:
+        value: Argument value
+        
+    Returns:
+        Hashable: Key part
+    """
+    cls = type(value)
+    if cls in _KEY_PRIMITIVES:
+        return value
+    
+    extractor = _key_extractors.get(cls)
+    if extractor is None:
+        # Look through base classes once and remember the result
+        extractor = next(
+            (_key_extractors[base] for base in cls.__mro__[1:] if base in _key_extractors),
+            None,
+        )
+        if extractor is not None:
+            _key_extractors[cls] = extractor
+    if extractor is not None:
+        return extractor(value)
+    
+    if cls is tuple or cls is list:
+        return tuple(_normalize_key_part(item) for item in value)
+    if cls is dict:
+        return tuple(sorted((k, _normalize_key_part(v)) for k, v in value.items()))
+    if cls is frozenset or cls is set:
+        return frozenset(_normalize_key_part(item) for item in value)
+    return (cls.__qualname__, repr(value))
+
+
+def make_cache_key(
+    args: tuple, kwargs: Dict[str, Any], skip_kwargs: frozenset = frozenset()
+) -> tuple:
+    """
+    Build the cache key of a call.
+    
+    The key is a flat tuple of the normalized positional arguments followed
+    by alternating keyword names and normalized values. Database sessions
+    and requests are left out, as are the keyword arguments listed in
+    ``skip_kwargs``.
     
-    # Create a hash of the key parts
-    key_str = ":".join(key_parts)
-    logger.debug(f"Cache key parts: {key_parts}")
-    logger.debug(f"Cache key string: {key_str}")
-    return hashlib.md5(key_str.encode()).hexdigest()
+    Args:
+        args: Positional arguments (without ``self``)
+        kwargs: Keyword arguments
+        skip_kwargs: Keyword arguments to leave out
+        
+    Returns:
+        tuple: Hashable cache key
+    """
+    positional = []
+    for arg in args:
+        if type(arg) in _KEY_PRIMITIVES:
+            positional.append(arg)
+        elif not isinstance(arg, _KEY_IGNORED_TYPES):
+            positional.append(_normalize_key_part(arg))
+    
+    parts = [tuple(positional)]
+    for k in sorted(kwargs):
+        if k in skip_kwargs:
+            continue
+        v = kwargs[k]
+        if type(v) in _KEY_PRIMITIVES:
+            parts.append(k)
+            parts.append(v)
+        elif not isinstance(v, _KEY_IGNORED_TYPES):
+            parts.append(k)
+            parts.append(_normalize_key_part(v))
+    return tuple(parts)
+
+
+register_key_extractor(PaginationParams, lambda p: (p.skip, p.limit, p.cursor))
+register_key_extractor(User, lambda u: (u.id, u.is_admin))
 
 
 def cached(
     expire_seconds: Optional[int] = None,
     skip_kwargs: Optional[list] = None,
     cache_key_prefix: Optional[str] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    policy: Optional[str] = None,
+    tags: Optional[Callable[[Dict[str, Any], Any], Iterable[str]]] = None,
+    single_flight: bool = True,
+    soft_ttl: Optional[int] = None,
+    jitter: Optional[float] = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Cache decorator for functions.
     
+    Each decorated function gets its own bounded cache named after its
+    qualified name (e.g. "ResourceRepository.get_by_user"), so its limits
+    can be tuned through ``settings.CACHE_FUNCTION_LIMITS``. Every entry is
+    tagged with the owning class name (e.g. "ResourceRepository") plus any
+    tags returned by ``tags``, and can be dropped with ``invalidate_tags``.
+    
+    Concurrent misses on the same key are coalesced: the first caller runs
+    the function while the others await its result (or its exception).
+    
+    With ``soft_ttl`` an entry older than ``soft_ttl`` seconds is still
+    served until ``expire_seconds`` (the hard TTL) while a background task
+    recomputes it using a fresh database session. Both TTLs are shortened by
+    a random fraction of up to ``jitter`` so entries filled in a burst do not
+    all expire at once.
+    
     Args:
         expire_seconds: Cache expiration time in seconds (defaults to settings.CACHE_EXPIRE_SECONDS)
         skip_kwargs: List of keyword arguments to skip when generating cache key
         cache_key_prefix: Optional prefix to add to the cache key
+        max_entries: Optional maximum number of cached results
+        max_bytes: Optional maximum estimated size of cached results in bytes
+        policy: Optional eviction policy ("lru" or "tinylfu")
+        tags: Optional callable receiving the call's keyword arguments and
+            the result, returning the tags to attach to the entry
+        single_flight: Whether to coalesce concurrent misses on the same key
+        soft_ttl: Optional time in seconds after which entries are refreshed in the background
+        jitter: Maximum fraction by which TTLs are randomly shortened
+            (defaults to settings.CACHE_TTL_JITTER)
         
     Returns:
         Callable: Decorated function
     """
-    skip_kwargs = skip_kwargs or ["db", "request"]
+    skip = frozenset(skip_kwargs or ["db", "request"])
     expire_time = expire_seconds or settings.CACHE_EXPIRE_SECONDS
+    max_jitter = settings.CACHE_TTL_JITTER if jitter is None else jitter
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        name = func.__qualname__
+        params = list(inspect.signature(func).parameters)
+        is_method = bool(params) and params[0] == "self"
+        cache = get_cache(
+            name,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            policy=policy,
+        )
+        owner_tag = func.__qualname__.rpartition(".")[0] or func.__module__
+        # Futures of the calls currently computing a result, by cache key
+        in_flight: Dict[Hashable, asyncio.Future] = {}
+        # Keys with a background refresh scheduled or running
+        refreshing: Set[Hashable] = set()
+        
+        async def compute(cache_key: Hashable, args: tuple, kwargs: Dict[str, Any]) -> T:
+            future = asyncio.get_running_loop().create_future()
+            in_flight[cache_key] = future
+            
+            # Call the function and cache the result, unless something was
+            # invalidated meanwhile and the result may already be stale
+            epoch = _invalidation_epoch
+            started = time.perf_counter()
+            try:
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as exc:
+                    future.set_exception(exc)
+                    # Followers re-raise it; do not report it as never retrieved
+                    future.exception()
+                    raise
+                except BaseException:
+                    future.cancel()
+                    raise
+                future.set_result(result)
+                cache.record_miss(time.perf_counter() - started)
+                
+                if epoch == _invalidation_epoch:
+                    entry_tags = [owner_tag]
+                    if tags is not None:
+                        entry_tags.extend(tags(kwargs, result))
+                    factor = 1.0 - random.random() * max_jitter
+                    await _backend.set(
+                        name,
+                        cache_key,
+                        result,
+                        expire_time * factor,
+                        tags=entry_tags,
+                        soft_ttl=None if soft_ttl is None else soft_ttl * factor,
+                    )
+            finally:
+                # Keep the key in flight until the result is stored so that
+                # no caller misses both the future and the cache
+                if in_flight.get(cache_key) is future:
+                    del in_flight[cache_key]
+            
+            return result
+        
+        async def refresh(cache_key: Hashable, args: tuple, kwargs: Dict[str, Any]) -> None:
+            # The caller's session is closed once its request is done, so the
+            # refresh runs on a session of its own bound to the same engine
+            session = next(
+                (a for a in (*args, *kwargs.values()) if isinstance(a, AsyncSession)),
+                None,
+            )
+            try:
+                if session is None:
+                    await compute(cache_key, args, kwargs)
+                    return
+                async with AsyncSession(session.bind, expire_on_commit=False) as fresh:
+                    await compute(
+                        cache_key,
+                        tuple(fresh if a is session else a for a in args),
+                        {k: fresh if v is session else v for k, v in kwargs.items()},
+                    )
+            except Exception:
+                logger.exception(f"Background refresh of {func.__qualname__} failed")
+            finally:
+                refreshing.discard(cache_key)
+        
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
             if not settings.CACHE_ENABLED:
                 return await func(*args, **kwargs)
 
-            # Filter out kwargs that should be skipped
-            cache_kwargs = {k: v for k, v in kwargs.items() if k not in skip_kwargs}
-            
-            # Log the function call and its arguments for debugging
-            logger.debug(f"Caching function: {func.__name__}")
-            logger.debug(f"Args: {args}")
-            logger.debug(f"Cache kwargs: {cache_kwargs}")
-            
-            # Generate cache key
+            # Generate cache key (bound instances are singletons and left out)
+            cache_key = make_cache_key(args[1:] if is_method else args, kwargs, skip)
             if cache_key_prefix:
-                # Create a unique key with the prefix and function name
-                key_parts = [cache_key_prefix, func.__name__]
-                
-                # Add sort_order explicitly to the key parts if it exists in kwargs
-                if 'sort_order' in kwargs:
-                    key_parts.append(f"sort_order={kwargs['sort_order']}")
-                
-                # Add args to key parts
-                for arg in args:
-                    if isinstance(arg, (str, int, float, bool, type(None))):
-                        key_parts.append(str(arg))
-                    elif hasattr(arg, "__dict__"):
-                        key_parts.append(str(arg.__dict__))
-                    else:
-                        key_parts.append(str(arg))
-                
-                # Add kwargs to key parts
-                for k, v in sorted(cache_kwargs.items()):
-                    if isinstance(v, (str, int, float, bool, type(None))):
-                        key_parts.append(f"{k}:{v}")
-                    elif hasattr(v, "__dict__"):
-                        key_parts.append(f"{k}:{v.__dict__}")
-                    else:
-                        key_parts.append(f"{k}:{v}")
-                
-                # Create a hash of the key parts
-                key_str = ":".join(key_parts)
-                cache_key = hashlib.md5(key_str.encode()).hexdigest()
-                logger.debug(f"Generated cache key with prefix: {cache_key}")
-            else:
-                # Generate the cache key without a prefix
-                cache_key = _get_cache_key(func, *args, **cache_kwargs)
-                logger.debug(f"Generated cache key: {cache_key}")
+                cache_key = (cache_key_prefix, *cache_key)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cache key for {name}: {cache_key}")
             
             # Check if result is in cache and not expired
-            if cache_key in _cache:
-                cache_item = _cache[cache_key]
-                if datetime.now() < cache_item["expire_time"]:
-                    return cast(T, cache_item["result"])
+            cache_item = await _backend.get(name, cache_key)
+            if cache_item is not None:
+                cache.record_hit()
+                if cache_item.is_stale and cache_key not in refreshing:
+                    refreshing.add(cache_key)
+                    task = asyncio.create_task(refresh(cache_key, args, kwargs))
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+                return cast(T, cache_item.value)
             
-            # Call the function and cache the result
-            result = await func(*args, **kwargs)
-            _cache[cache_key] = {
-                "result": result,
-                "expire_time": datetime.now() + timedelta(seconds=expire_time),
-            }
+            # Wait for an identical call that is already running
+            leader = in_flight.get(cache_key) if single_flight else None
+            if leader is not None:
+                cache.coalesced += 1
+                try:
+                    return cast(T, await asyncio.shield(leader))
+                except asyncio.CancelledError:
+                    task = asyncio.current_task()
+                    if not leader.cancelled() or (task is not None and task.cancelling()):
+                        raise
+                    # The leader was cancelled but this caller was not: retry
+                    return await wrapper(*args, **kwargs)
             
-            return result
+            return await compute(cache_key, args, kwargs)
         
+        wrapper.cache = cache
         return wrapper
     
     return decorator
 
 
-def invalidate_cache(prefix: Optional[str] = None) -> None:
+class CacheBackend:
+    """
+    Interface of a cache store used by the ``cached`` decorator.
+    
+    Entries are addressed by a namespace (the qualified name of the cached
+    function) and a key within that namespace.
+    """
+    
+    name = "base"
+    
+    async def get(self, namespace: str, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Get a live entry.
+        
+        Args:
+            namespace: Cache namespace
+            key: Cache key
+            
+        Returns:
+            Optional[CacheEntry]: The entry if present and not expired, None otherwise
+        """
+        raise NotImplementedError
+    
+    async def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        soft_ttl: Optional[float] = None,
+    ) -> bool:
+        """
+        Store a value.
+        
+        Args:
+            namespace: Cache namespace
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds
+            tags: Tags used to invalidate the entry
+            soft_ttl: Optional time in seconds after which the entry is stale
+            
+        Returns:
+            bool: True if the value was stored
+        """
+        raise NotImplementedError
+    
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Remove all entries carrying any of the given tags.
+        
+        Args:
+            tags: Tags to invalidate
+            
+        Returns:
+            int: Number of removed entries
+        """
+        raise NotImplementedError
+    
+    async def clear(self, prefix: Optional[str] = None) -> int:
+        """
+        Remove all entries, or those of namespaces starting with a prefix.
+        
+        Args:
+            prefix: Optional namespace prefix
+            
+        Returns:
+            int: Number of removed entries
+        """
+        raise NotImplementedError
+    
+    async def start(self) -> None:
+        """Start background work such as invalidation listeners."""
+    
+    async def stop(self) -> None:
+        """Stop background work and release connections."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process cache backend built on the per-namespace ``CacheEngine`` registry.
+    """
+    
+    name = "memory"
+    
+    async def get(self, namespace: str, key: Hashable) -> Optional[CacheEntry]:
+        engine = _caches.get(namespace)
+        return engine.get(key) if engine is not None else None
+    
+    async def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        soft_ttl: Optional[float] = None,
+    ) -> bool:
+        return get_cache(namespace).set(key, value, ttl, tags=tags, soft_ttl=soft_ttl)
+    
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tags = tuple(tags)
+        return sum(engine.invalidate_tags(tags) for engine in _caches.values())
+    
+    async def clear(self, prefix: Optional[str] = None) -> int:
+        return sum(
+            engine.clear()
+            for name, engine in _caches.items()
+            if not prefix or name.startswith(prefix)
+        )
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend storing pickled entries in a Redis-protocol server.
+    
+    Each tag is a Redis set holding the keys of the entries carrying it, so
+    tag invalidation only touches the tagged entries. Connection errors are
+    logged and treated as cache misses.
+    
+    Attributes:
+        client: ``redis.asyncio`` compatible client
+        prefix: Prefix of every key written by the backend
+    """
+    
+    name = "redis"
+    
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "cache:"):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "The redis package is required for the redis cache backend"
+                ) from e
+            client = redis.from_url(url or settings.CACHE_REDIS_URL)
+        
+        self.client = client
+        self.prefix = prefix
+        # Tag sets must outlive every entry they reference
+        self._max_ttl = 0
+    
+    def _key(self, namespace: str, key: Hashable) -> str:
+        if not isinstance(key, str):
+            key = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return f"{self.prefix}{namespace}:{key}"
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+    
+    async def get(self, namespace: str, key: Hashable) -> Optional[CacheEntry]:
+        try:
+            blob = await self.client.get(self._key(namespace, key))
+        except (OSError, ConnectionError, _redis_errors()) as e:
+            logger.warning(f"Cache backend get failed: {e}")
+            return None
+        if blob is None:
+            return None
+        
+        try:
+            value, expires_at, stale_at, tags = pickle.loads(blob)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry: {e}")
+            return None
+        # Translate wall-clock deadlines into this process' monotonic clock
+        offset = time.monotonic() - time.time()
+        return CacheEntry(
+            value,
+            expires_at + offset,
+            len(blob),
+            tags,
+            stale_at=stale_at + offset,
+        )
+    
+    async def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        soft_ttl: Optional[float] = None,
+    ) -> bool:
+        now = time.time()
+        tags = tuple(set(tags))
+        stale_at = now + (ttl if soft_ttl is None else min(soft_ttl, ttl))
+        try:
+            blob = pickle.dumps((value, now + ttl, stale_at, tags), pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Value for {namespace} cannot be stored in the cache backend: {e}")
+            return False
+        
+        redis_key = self._key(namespace, key)
+        self._max_ttl = max(self._max_ttl, int(ttl) + 1)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(redis_key, blob, px=max(1, int(ttl * 1000)))
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), redis_key)
+                    pipe.expire(self._tag_key(tag), self._max_ttl)
+                await pipe.execute()
+        except (OSError, ConnectionError, _redis_errors()) as e:
+            logger.warning(f"Cache backend set failed: {e}")
+            return False
+        return True
+    
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        try:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                keys = await self.client.smembers(tag_key)
+                if keys:
+                    removed += await self.client.delete(*keys)
+                await self.client.delete(tag_key)
+        except (OSError, ConnectionError, _redis_errors()) as e:
+            logger.warning(f"Cache backend invalidation failed: {e}")
+        return removed
+    
+    async def clear(self, prefix: Optional[str] = None) -> int:
+        pattern = f"{self.prefix}{prefix or ''}*"
+        removed = 0
+        try:
+            batch = []
+            async for redis_key in self.client.scan_iter(match=pattern, count=500):
+                batch.append(redis_key)
+                if len(batch) >= 500:
+                    removed += await self.client.delete(*batch)
+                    batch = []
+            if batch:
+                removed += await self.client.delete(*batch)
+        except (OSError, ConnectionError, _redis_errors()) as e:
+            logger.warning(f"Cache backend clear failed: {e}")
+        return removed
+    
+    async def stop(self) -> None:
+        await self.client.aclose()
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Two-tier cache: an in-process L1 in front of a shared L2.
+    
+    Reads check L1 first and fill it from L2 on an L1 miss. Invalidations
+    are applied to both tiers and broadcast on a Redis pub/sub channel so
+    that every other worker drops the affected L1 entries too.
+    
+    Attributes:
+        l1: In-process backend
+        l2: Shared backend
+        channel: Pub/sub channel used for invalidation messages
+    """
+    
+    name = "tiered"
+    
+    def __init__(
+        self,
+        l1: MemoryCacheBackend,
+        l2: RedisCacheBackend,
+        channel: str = "cache:invalidate",
+    ):
+        self.l1 = l1
+        self.l2 = l2
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+    
+    async def get(self, namespace: str, key: Hashable) -> Optional[CacheEntry]:
+        entry = await self.l1.get(namespace, key)
+        if entry is not None:
+            return entry
+        
+        entry = await self.l2.get(namespace, key)
+        if entry is not None:
+            now = time.monotonic()
+            get_cache(namespace).set(
+                key,
+                entry.value,
+                entry.expires_at - now,
+                tags=entry.tags,
+                soft_ttl=entry.stale_at - now,
+            )
+        return entry
+    
+    async def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        soft_ttl: Optional[float] = None,
+    ) -> bool:
+        tags = tuple(tags)
+        stored = await self.l1.set(namespace, key, value, ttl, tags=tags, soft_ttl=soft_ttl)
+        return await self.l2.set(namespace, key, value, ttl, tags=tags, soft_ttl=soft_ttl) or stored
+    
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        removed = await self.l1.invalidate_tags(tags)
+        removed += await self.l2.invalidate_tags(tags)
+        await self._publish({"tags": tags})
+        return removed
+    
+    async def clear(self, prefix: Optional[str] = None) -> int:
+        removed = await self.l1.clear(prefix)
+        removed += await self.l2.clear(prefix)
+        await self._publish({"clear": prefix or ""})
+        return removed
+    
+    async def _publish(self, message: Dict[str, Any]) -> None:
+        message["origin"] = self.origin
+        try:
+            await self.l2.client.publish(self.channel, json.dumps(message))
+        except (OSError, ConnectionError, _redis_errors()) as e:
+            logger.warning(f"Cache invalidation broadcast failed: {e}")
+    
+    async def handle_message(self, data: Any) -> None:
+        """
+        Apply an invalidation message published by another worker.
+        
+        Args:
+            data: Raw message payload
+        """
+        message = json.loads(data)
+        if message.get("origin") == self.origin:
+            return
+        
+        global _invalidation_epoch
+        _invalidation_epoch += 1
+        if "tags" in message:
+            await self.l1.invalidate_tags(message["tags"])
+        if "clear" in message:
+            await self.l1.clear(message["clear"] or None)
+        for listener in _remote_invalidation_listeners:
+            listener(message.get("tags"))
+    
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.l2.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self.handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+    
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+    
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.l2.stop()
+
+
+def _redis_errors() -> tuple:
+    # Exception types raised by redis-py, when it is installed
+    try:
+        from redis.exceptions import RedisError
+    except ImportError:
+        return ()
+    return (RedisError,)
+
+
+def create_cache_backend() -> CacheBackend:
+    """
+    Create the cache backend selected by ``settings.CACHE_BACKEND``.
+    
+    Returns:
+        CacheBackend: "memory", "redis" or "tiered" backend
+    """
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend()
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend()
+    if settings.CACHE_BACKEND == "tiered":
+        return TieredCacheBackend(MemoryCacheBackend(), RedisCacheBackend())
+    raise ValueError(f"Unknown cache backend: {settings.CACHE_BACKEND}")
+
+
+_backend: CacheBackend = create_cache_backend()
+
+
+def get_cache_backend() -> CacheBackend:
+    """
+    Get the active cache backend.
+    
+    Returns:
+        CacheBackend: The backend used by ``cached``
+    """
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """
+    Replace the active cache backend.
+    
+    Args:
+        backend: Backend to use from now on
+    """
+    global _backend
+    _backend = backend
+
+
+async def invalidate_tags(*tags: str) -> int:
+    """
+    Invalidate all cache entries carrying any of the given tags.
+    
+    Args:
+        tags: Tags to invalidate (see ``user_tag`` and ``resource_tag``)
+        
+    Returns:
+        int: Number of removed entries
+    """
+    global _invalidation_epoch
+    _invalidation_epoch += 1
+    
+    removed = await _backend.invalidate_tags(tags)
+    logger.debug("Invalidated %d cache entries for tags %s", removed, tags)
+    return removed
+
+
+async def invalidate_cache(prefix: Optional[str] = None) -> None:
     """
     Invalidate cache entries.
     
     Args:
-        prefix: Optional prefix to filter cache keys
+        prefix: Optional cache name prefix or tag (e.g. "ResourceRepository")
     """
-    global _cache
+    global _invalidation_epoch
+    _invalidation_epoch += 1
     
+    await _backend.clear(prefix)
     if prefix:
-        # Invalidate cache entries that start with the prefix
-        _cache = {k: v for k, v in _cache.items() if not k.startswith(prefix)}
-    else:
-        # Invalidate all cache entries
-        _cache = {}
+        await _backend.invalidate_tags([prefix])
 
 
-def get_cache_stats() -> Dict[str, Any]:
+def get_cache_stats(top: int = 0) -> Dict[str, Any]:
     """
     Get cache statistics.
     
+    Sizes are tracked as entries are stored and evicted, so this only walks
+    the entries once (to count expired ones and find the largest) and never
+    serializes cached values.
+    
+    Args:
+        top: Number of largest entries to include
+        
     Returns:
         Dict[str, Any]: Cache statistics
     """
-    now = datetime.now()
-    entries_info = []
+    now = time.monotonic()
+    caches_info = {}
     expired_count = 0
-    active_count = 0
+    total_count = 0
+    hits = 0
+    misses = 0
+    latency_saved = 0.0
     
-    for k, v in _cache.items():
-        expires_in = (v["expire_time"] - now).total_seconds()
-        is_expired = expires_in <= 0
+    for name, cache in _caches.items():
+        total_count += len(cache)
+        expired_count += sum(1 for _, v in cache.items() if v.expires_at <= now)
+        hits += cache.hits
+        misses += cache.misses
+        latency_saved += cache.latency_saved
         
-        if is_expired:
-            expired_count += 1
-        else:
-            active_count += 1
-            
-        entries_info.append({
-            "key": k,
-            "expires_in": expires_in,
-            "is_expired": is_expired,
-            "size": len(json.dumps(v["result"])),
-        })
+        caches_info[name] = {
+            "entries": len(cache),
+            "max_entries": cache.max_entries,
+            "bytes": cache.current_bytes,
+            "max_bytes": cache.max_bytes,
+            "policy": cache.policy,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "coalesced": cache.coalesced,
+            "hit_ratio": _ratio(cache.hits, cache.misses),
+            "evictions": cache.evictions,
+            "expirations": cache.expirations,
+            "avg_miss_latency_ms": cache.miss_latency * 1000,
+            "latency_saved_seconds": cache.latency_saved,
+            "tags": cache.tag_count,
+        }
+    
+    # Keep only the top-N while walking the entries instead of sorting them all
+    largest = []
+    if top > 0:
+        largest = heapq.nlargest(
+            top,
+            (
+                (entry.size, name, key, entry.expires_at)
+                for name, cache in _caches.items()
+                for key, entry in cache.items()
+            ),
+            key=lambda item: item[0],
+        )
     
     return {
-        "total_entries": len(_cache),
-        "active_entries": active_count,
+        "backend": _backend.name,
+        "total_entries": total_count,
+        "active_entries": total_count - expired_count,
         "expired_entries": expired_count,
-        "memory_usage": len(json.dumps(_cache)),
-        "entries": entries_info,
+        "memory_usage": sum(cache.current_bytes for cache in _caches.values()),
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": _ratio(hits, misses),
+        "latency_saved_seconds": latency_saved,
+        "caches": caches_info,
+        "largest_entries": [
+            {
+                "cache": name,
+                "key": repr(key),
+                "size": size,
+                "expires_in": expires_at - now,
+            }
+            for size, name, key, expires_at in largest
+        ],
     }
 
 
+def _ratio(hits: int, misses: int) -> float:
+    # Hit ratio, 0 when the cache has not been used yet
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
 def clear_expired_cache() -> int:
     """
     Clear expired cache entries.
@@ -214,12 +1414,56 @@ def clear_expired_cache() -> int:
     Returns:
         int: Number of cleared entries
     """
-    global _cache
-    now = datetime.now()
-    expired_keys = [k for k, v in _cache.items() if v["expire_time"] <= now]
+    cleared = sum(cache.clear_expired() for cache in _caches.values())
+    
+    logger.info(f"Cleared {cleared} expired cache entries")
+    return cleared
+
+
+def sweep_expired_cache(batch_size: int) -> int:
+    """
+    Remove up to ``batch_size`` expired entries across all caches.
+    
+    Args:
+        batch_size: Maximum number of entries to remove
+        
+    Returns:
+        int: Number of removed entries
+    """
+    removed = 0
+    for cache in list(_caches.values()):
+        if removed >= batch_size:
+            break
+        removed += cache.clear_expired(limit=batch_size - removed)
+    return removed
+
+
+async def run_cache_sweeper(
+    interval: Optional[float] = None, batch_size: Optional[int] = None
+) -> None:
+    """
+    Periodically remove expired entries in bounded batches.
     
-    for k in expired_keys:
-        del _cache[k]
+    The sweeper yields to the event loop between batches so that a large
+    number of entries expiring at once never stalls request handling.
     
-    logger.info(f"Cleared {len(expired_keys)} expired cache entries")
-    return len(expired_keys)
+    Args:
+        interval: Seconds between sweeps (defaults to settings.CACHE_SWEEP_INTERVAL_SECONDS)
+        batch_size: Entries removed per batch (defaults to settings.CACHE_SWEEP_BATCH_SIZE)
+    """
+    interval = interval or settings.CACHE_SWEEP_INTERVAL_SECONDS
+    batch_size = batch_size or settings.CACHE_SWEEP_BATCH_SIZE
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            total = 0
+            while True:
+                removed = sweep_expired_cache(batch_size)
+                total += removed
+                if removed < batch_size:
+                    break
+                await asyncio.sleep(0)
+            if total:
+                logger.debug(f"Swept {total} expired cache entries")
+        except Exception:
+            logger.exception("Cache sweep failed")
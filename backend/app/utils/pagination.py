@@ -1,6 +1,9 @@
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+import base64
+import binascii
+import json
+from typing import Annotated, Any, Dict, Generic, List, Literal, Optional, TypeVar
 
-from fastapi import Query
+from fastapi import HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict
 
 T = TypeVar("T")
@@ -8,6 +11,10 @@ T = TypeVar("T")
 # Define a model config that allows arbitrary types
 model_config = ConfigDict(arbitrary_types_allowed=True)
 
+# How the total of a listing is computed: an exact count, a planner
+# estimate (unfiltered listings only, exact otherwise), or not at all
+IncludeTotal = Literal["exact", "estimated", "none"]
+
 
 class PaginationParams:
     """
@@ -16,15 +23,24 @@ class PaginationParams:
     Attributes:
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: Opaque position returned as ``next_cursor`` by the previous
+            page; when given, ``skip`` is ignored
     """
 
     def __init__(
         self,
-        skip: int = Query(0, ge=0, description="Number of records to skip"),
-        limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+        skip: Annotated[int, Query(ge=0, description="Number of records to skip")] = 0,
+        limit: Annotated[
+            int, Query(ge=1, le=1000, description="Maximum number of records to return")
+        ] = 100,
+        cursor: Annotated[
+            Optional[str],
+            Query(description="Cursor of the next page (next_cursor of the previous page)"),
+        ] = None,
     ):
         self.skip = skip
         self.limit = limit
+        self.cursor = cursor
 
 
 class PageInfo(BaseModel):
@@ -32,18 +48,22 @@ class PageInfo(BaseModel):
     Pagination information.
     
     Attributes:
-        total: Total number of records
+        total: Total number of records, if computed
         page: Current page number
-        pages: Total number of pages
+        pages: Total number of pages, if the total is computed
         has_next: Whether there is a next page
         has_prev: Whether there is a previous page
+        next_cursor: Cursor of the next page, if any
+        total_is_estimate: Whether the total is a planner estimate
     """
 
-    total: int
+    total: Optional[int]
     page: int
-    pages: int
+    pages: Optional[int]
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class Page(BaseModel, Generic[T]):
@@ -61,16 +81,65 @@ class Page(BaseModel, Generic[T]):
     model_config = model_config
 
 
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+    
+    Args:
+        values: JSON-serializable sort key values
+        
+    Returns:
+        str: Cursor
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor created by ``encode_cursor``.
+    
+    Args:
+        cursor: Cursor
+        
+    Returns:
+        List[Any]: Sort key values
+        
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return values
+
+
 def create_page_info(
-    total: int, page_params: PaginationParams, page: Optional[int] = None
+    total: Optional[int],
+    page_params: PaginationParams,
+    page: Optional[int] = None,
+    next_cursor: Optional[str] = None,
+    has_next: Optional[bool] = None,
+    total_is_estimate: bool = False,
 ) -> PageInfo:
     """
     Create pagination information.
     
     Args:
-        total: Total number of records
+        total: Total number of records, or None if not computed
         page_params: Pagination parameters
         page: Current page number (calculated from skip and limit if not provided)
+        next_cursor: Optional cursor of the next page
+        has_next: Whether there is a next page, e.g. known from fetching one
+            extra row (calculated from the total if not provided)
+        total_is_estimate: Whether the total is an estimate
         
     Returns:
         PageInfo: Pagination information
@@ -78,31 +147,51 @@ def create_page_info(
     if page is None:
         page = (page_params.skip // page_params.limit) + 1 if page_params.limit else 1
 
-    pages = (total // page_params.limit) + (1 if total % page_params.limit else 0) if page_params.limit else 1
+    pages = None
+    if total is not None:
+        pages = (total // page_params.limit) + (1 if total % page_params.limit else 0) if page_params.limit else 1
+    
+    if has_next is None:
+        has_next = next_cursor is not None if page_params.cursor or pages is None else page < pages
+    # Page numbers are meaningless when paginating with a cursor
+    has_prev = bool(page_params.cursor) or page > 1
     
     return PageInfo(
         total=total,
         page=page,
         pages=pages,
-        has_next=page < pages,
-        has_prev=page > 1,
+        has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
     )
 
 
 def create_page(
-    items: List[T], total: int, page_params: PaginationParams, page: Optional[int] = None
+    items: List[T],
+    total: Optional[int],
+    page_params: PaginationParams,
+    page: Optional[int] = None,
+    next_cursor: Optional[str] = None,
+    has_next: Optional[bool] = None,
+    total_is_estimate: bool = False,
 ) -> Page[T]:
     """
     Create a paginated response.
     
     Args:
         items: List of items
-        total: Total number of records
+        total: Total number of records, or None if not computed
         page_params: Pagination parameters
         page: Current page number (calculated from skip and limit if not provided)
+        next_cursor: Optional cursor of the next page
+        has_next: Whether there is a next page (calculated from the total if not provided)
+        total_is_estimate: Whether the total is an estimate
         
     Returns:
         Page[T]: Paginated response
     """
-    page_info = create_page_info(total, page_params, page)
+    page_info = create_page_info(
+        total, page_params, page, next_cursor, has_next, total_is_estimate
+    )
     return Page(items=items, page_info=page_info)
@@ -0,0 +1,231 @@
+import asyncio
+import gzip
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.principal import UserPrincipal
+from app.utils.caching import get_cache, get_cache_backend, get_invalidation_epoch
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Futures of the responses currently being computed, by namespace and key
+_in_flight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+
+# Namespaces and keys of the stale responses being refreshed
+_refreshing: Set[Tuple[str, Hashable]] = set()
+
+# Background refreshes of stale responses (kept referenced until done)
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+class CachedResponse:
+    """
+    Encoded body of a cached JSON response.
+
+    Attributes:
+        body: JSON body
+        compressed: Gzip-compressed body, if the body is worth compressing
+    """
+
+    __slots__ = ("body", "compressed")
+
+    def __init__(self, body: bytes, compressed: Optional[bytes] = None):
+        self.body = body
+        self.compressed = compressed
+
+
+def response_scope(current_user: UserPrincipal) -> Hashable:
+    """
+    Get the visibility scope of a user for response cache keys.
+
+    Admin users see the same data regardless of who they are, so they share
+    one scope; every other user has a scope of their own.
+
+    Args:
+        current_user: Current user
+
+    Returns:
+        Hashable: Visibility scope
+    """
+    return "admin" if current_user.is_admin else current_user.id
+
+
+def _build_response(cached: CachedResponse, request: Request) -> Response:
+    # Serve the pre-compressed body to clients that accept gzip
+    headers = {"Vary": "Accept-Encoding"}
+    body = cached.body
+    if cached.compressed is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        body = cached.compressed
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _render(
+    db: AsyncSession,
+    *,
+    namespace: str,
+    key: Hashable,
+    model: Type[BaseModel],
+    compute: Callable[[AsyncSession], Awaitable[Any]],
+    tags: Callable[[Any], Iterable[str]],
+    expire_seconds: Optional[int],
+    soft_ttl: Optional[int],
+) -> CachedResponse:
+    """
+    Compute and encode a response, and cache it unless it may already be stale.
+
+    Identical misses arriving meanwhile wait for this computation instead of
+    starting their own.
+
+    Args:
+        db: Database session passed to ``compute``
+        namespace: Cache namespace of the endpoint
+        key: Cache key
+        model: Response model used to encode the content
+        compute: Callable producing the content
+        tags: Callable returning the cache tags for the content
+        expire_seconds: Cache expiration time in seconds
+        soft_ttl: Optional time in seconds after which the response is refreshed
+
+    Returns:
+        CachedResponse: Encoded response
+    """
+    stats = get_cache(namespace)
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[(namespace, key)] = future
+
+    epoch = get_invalidation_epoch()
+    started = time.perf_counter()
+    try:
+        try:
+            content = await compute(db)
+            body = model.model_validate(content, from_attributes=True).model_dump_json().encode()
+            compressed = None
+            if len(body) >= settings.RESPONSE_CACHE_COMPRESS_MIN_BYTES:
+                compressed = gzip.compress(body, compresslevel=5)
+            cached = CachedResponse(body, compressed)
+        except Exception as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; do not report it as never retrieved
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        future.set_result(cached)
+        stats.record_miss(time.perf_counter() - started)
+
+        # Do not store a result that an invalidation may have made stale
+        if settings.CACHE_ENABLED and epoch == get_invalidation_epoch():
+            factor = 1.0 - random.random() * settings.CACHE_TTL_JITTER
+            await get_cache_backend().set(
+                namespace,
+                key,
+                cached,
+                (expire_seconds or settings.CACHE_EXPIRE_SECONDS) * factor,
+                tags=tags(content),
+                soft_ttl=None if soft_ttl is None else soft_ttl * factor,
+            )
+    finally:
+        # Keep the key in flight until the response is stored so that no
+        # request misses both the future and the cache
+        if _in_flight.get((namespace, key)) is future:
+            del _in_flight[(namespace, key)]
+    return cached
+
+
+async def _refresh(db: AsyncSession, namespace: str, key: Hashable, **options: Any) -> None:
+    # The request's session is closed once it is done, so the refresh runs
+    # on a session of its own bound to the same engine
+    try:
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            await _render(session, namespace=namespace, key=key, **options)
+    except Exception:
+        logger.exception(f"Background refresh of {namespace} failed")
+    finally:
+        _refreshing.discard((namespace, key))
+
+
+async def cached_json_response(
+    request: Request,
+    db: AsyncSession,
+    *,
+    namespace: str,
+    key: Hashable,
+    model: Type[BaseModel],
+    compute: Callable[[AsyncSession], Awaitable[Any]],
+    tags: Callable[[Any], Iterable[str]],
+    expire_seconds: Optional[int] = None,
+    soft_ttl: Optional[int] = None,
+) -> Response:
+    """
+    Serve a JSON response from the response cache, computing it on a miss.
+
+    The cache holds the final encoded body (and a gzip-compressed copy of
+    larger bodies), so a hit skips the service call, response model
+    validation and JSON encoding altogether.
+
+    With ``soft_ttl`` a response older than ``soft_ttl`` seconds is still
+    served until ``expire_seconds`` while a background task recomputes it
+    using a fresh database session. The services behind these endpoints are
+    not cached themselves, so a refresh only reads the repository caches,
+    which writes invalidate by tag.
+
+    Concurrent misses for the same key are coalesced: one request computes
+    the response while the others wait for it.
+
+    Args:
+        request: Current request
+        db: Database session passed to ``compute``
+        namespace: Cache namespace of the endpoint
+        key: Cache key (normalized query parameters and visibility scope)
+        model: Response model used to encode the content
+        compute: Callable producing the content from a database session
+        tags: Callable returning the cache tags for the content
+        expire_seconds: Cache expiration time in seconds (defaults to settings.CACHE_EXPIRE_SECONDS)
+        soft_ttl: Optional time in seconds after which responses are refreshed in the background
+
+    Returns:
+        Response: JSON response
+    """
+    options = dict(
+        model=model,
+        compute=compute,
+        tags=tags,
+        expire_seconds=expire_seconds,
+        soft_ttl=soft_ttl,
+    )
+    if settings.CACHE_ENABLED:
+        entry = await get_cache_backend().get(namespace, key)
+        if entry is not None:
+            get_cache(namespace).record_hit()
+            if entry.is_stale and (namespace, key) not in _refreshing:
+                _refreshing.add((namespace, key))
+                task = asyncio.create_task(_refresh(db, namespace, key, **options))
+                _refresh_tasks.add(task)
+                task.add_done_callback(_refresh_tasks.discard)
+            return _build_response(entry.value, request)
+
+        # Wait for an identical miss that is already being computed
+        leader = _in_flight.get((namespace, key))
+        if leader is not None:
+            get_cache(namespace).coalesced += 1
+            try:
+                return _build_response(await asyncio.shield(leader), request)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not leader.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                # The leader was cancelled but this request was not: retry
+                return await cached_json_response(request, db, namespace=namespace, key=key, **options)
+
+    cached = await _render(db, namespace=namespace, key=key, **options)
+    return _build_response(cached, request)
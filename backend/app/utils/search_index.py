@@ -0,0 +1,159 @@
+import bisect
+import re
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+# Word characters form terms; everything else separates them
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase terms.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List[str]: Terms in order of appearance
+    """
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index mapping terms to the IDs of the documents containing them.
+
+    Posting lists are kept as sorted ``array('I')`` (4 bytes per ID) and the
+    vocabulary as a sorted list, so prefix lookups are a binary search.
+    Documents are added, replaced and removed one at a time, so the index
+    can be maintained incrementally as the underlying rows change.
+
+    Attributes:
+        ready: Whether the index holds every document and can answer queries
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []
+        self._documents: Dict[int, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._documents
+
+    @property
+    def term_count(self) -> int:
+        """Number of distinct terms."""
+        return len(self._postings)
+
+    def add(self, doc_id: int, texts: Iterable[Optional[str]]) -> None:
+        """
+        Index a document, replacing any previous version of it.
+
+        Args:
+            doc_id: Document ID
+            texts: Texts of the document
+        """
+        terms = frozenset(term for text in texts for term in tokenize(text))
+        previous = self._documents.get(doc_id, frozenset())
+        for term in previous - terms:
+            self._remove_posting(term, doc_id)
+        for term in terms - previous:
+            self._add_posting(term, doc_id)
+        self._documents[doc_id] = terms
+
+    def remove(self, doc_id: int) -> bool:
+        """
+        Remove a document.
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            bool: True if the document was indexed
+        """
+        terms = self._documents.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            self._remove_posting(term, doc_id)
+        return True
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._postings.clear()
+        self._vocabulary.clear()
+        self._documents.clear()
+        self.ready = False
+
+    def search(self, query: str, prefix: bool = True) -> array:
+        """
+        Find the documents containing every term of a query.
+
+        Args:
+            query: Query text
+            prefix: Whether query terms also match longer terms starting with them
+
+        Returns:
+            array: Sorted IDs of the matching documents
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return array("I")
+
+        matches = []
+        for term in terms:
+            if prefix:
+                postings = [self._postings[t] for t in self._terms_with_prefix(term)]
+            else:
+                postings = [self._postings[term]] if term in self._postings else []
+            if not postings:
+                return array("I")
+            matches.append(postings)
+
+        # Intersect starting from the rarest term to keep the working set small
+        matches.sort(key=lambda lists: sum(len(p) for p in lists))
+        result = set().union(*matches[0])
+        for lists in matches[1:]:
+            result.intersection_update(set().union(*lists))
+            if not result:
+                break
+        return array("I", sorted(result))
+
+    def _terms_with_prefix(self, prefix: str) -> List[str]:
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+
+    def _add_posting(self, term: str, doc_id: int) -> None:
+        postings = self._postings.get(term)
+        if postings is None:
+            self._postings[term] = array("I", (doc_id,))
+            bisect.insort(self._vocabulary, term)
+        elif postings[-1] < doc_id:
+            # IDs mostly grow, so most insertions are appends
+            postings.append(doc_id)
+        else:
+            index = bisect.bisect_left(postings, doc_id)
+            if index == len(postings) or postings[index] != doc_id:
+                postings.insert(index, doc_id)
+
+    def _remove_posting(self, term: str, doc_id: int) -> None:
+        postings = self._postings.get(term)
+        if postings is None:
+            return
+        index = bisect.bisect_left(postings, doc_id)
+        if index < len(postings) and postings[index] == doc_id:
+            del postings[index]
+        if not postings:
+            del self._postings[term]
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
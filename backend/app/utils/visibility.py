@@ -0,0 +1,204 @@
+import bisect
+import time
+from array import array
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from app.utils.caching import user_tag
+
+# Prefix of the cache tags scoped to a user (see ``user_tag``)
+_USER_TAG_PREFIX = user_tag("")
+
+
+class VisibilityIndex:
+    """
+    Bounded in-memory map from users to the IDs of the resources shared with them.
+
+    Each user's IDs are kept as a sorted ``array('I')`` (4 bytes per ID), so
+    membership is a binary search and the whole set can be inlined into a
+    listing filter. Sets are loaded on demand, maintained incrementally by
+    shares, unshares and deletions, and evicted least recently used first
+    once either the number of users or the total number of IDs exceeds its
+    limit. Sets older than ``ttl`` seconds are reloaded, which bounds how
+    long a missed invalidation can go unnoticed.
+
+    Loads race with writes: a loader records ``epoch`` before reading the
+    database and ``put`` drops its result if any write happened since.
+
+    Attributes:
+        max_users: Maximum number of users with a loaded set
+        max_ids: Maximum total number of IDs across all sets
+        ttl: Maximum age of a set in seconds
+        hits: Number of lookups answered from a loaded set
+        misses: Number of lookups that required a load
+        evictions: Number of sets evicted to stay within the limits
+    """
+
+    def __init__(self, max_users: int, max_ids: int, ttl: float):
+        self.max_users = max_users
+        self.max_ids = max_ids
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sets: "OrderedDict[int, Tuple[float, array]]" = OrderedDict()
+        self._size = 0
+        self._epoch = 0
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    @property
+    def epoch(self) -> int:
+        """Counter incremented on every write."""
+        return self._epoch
+
+    @property
+    def size(self) -> int:
+        """Total number of IDs across all sets."""
+        return self._size
+
+    def get(self, user_id: int) -> Optional[array]:
+        """
+        Get the loaded set of a user.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Optional[array]: Sorted resource IDs, or None if not loaded (or too old)
+        """
+        item = self._sets.get(user_id)
+        if item is None or time.monotonic() - item[0] > self.ttl:
+            if item is not None:
+                self._drop(user_id)
+            self.misses += 1
+            return None
+        self._sets.move_to_end(user_id)
+        self.hits += 1
+        return item[1]
+
+    def contains(self, user_id: int, resource_id: int) -> Optional[bool]:
+        """
+        Check whether a resource is shared with a user.
+
+        Args:
+            user_id: User ID
+            resource_id: Resource ID
+
+        Returns:
+            Optional[bool]: Whether the resource is shared, or None if the user's set is not loaded
+        """
+        ids = self.get(user_id)
+        if ids is None:
+            return None
+        index = bisect.bisect_left(ids, resource_id)
+        return index < len(ids) and ids[index] == resource_id
+
+    def put(self, user_id: int, ids: Iterable[int], epoch: int) -> bool:
+        """
+        Store the set of a user loaded from the database.
+
+        Args:
+            user_id: User ID
+            ids: Resource IDs shared with the user
+            epoch: Value of ``epoch`` recorded before the load
+
+        Returns:
+            bool: True if the set was stored
+        """
+        if epoch != self._epoch:
+            return False
+        ids = array("I", sorted(ids))
+        if len(ids) > self.max_ids:
+            return False
+
+        self._drop(user_id)
+        self._sets[user_id] = (time.monotonic(), ids)
+        self._size += len(ids)
+        while len(self._sets) > self.max_users or self._size > self.max_ids:
+            victim = next(iter(self._sets))
+            self._drop(victim)
+            self.evictions += 1
+        return True
+
+    def add(self, user_id: int, resource_id: int) -> None:
+        """
+        Record that a resource was shared with a user.
+
+        Args:
+            user_id: User ID
+            resource_id: Resource ID
+        """
+        self._epoch += 1
+        item = self._sets.get(user_id)
+        if item is None:
+            return
+        ids = item[1]
+        index = bisect.bisect_left(ids, resource_id)
+        if index == len(ids) or ids[index] != resource_id:
+            ids.insert(index, resource_id)
+            self._size += 1
+
+    def discard(self, resource_id: int, user_ids: Iterable[int]) -> None:
+        """
+        Record that a resource is no longer shared with some users.
+
+        Args:
+            resource_id: Resource ID
+            user_ids: IDs of the users the resource was unshared from or shared with before deletion
+        """
+        self._epoch += 1
+        for user_id in user_ids:
+            item = self._sets.get(user_id)
+            if item is None:
+                continue
+            ids = item[1]
+            index = bisect.bisect_left(ids, resource_id)
+            if index < len(ids) and ids[index] == resource_id:
+                del ids[index]
+                self._size -= 1
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        """
+        Drop the sets of some users so they are reloaded on next use.
+
+        Args:
+            user_ids: User IDs
+        """
+        self._epoch += 1
+        for user_id in user_ids:
+            self._drop(user_id)
+
+    def clear(self) -> None:
+        """Drop all sets."""
+        self._epoch += 1
+        self._sets.clear()
+        self._size = 0
+
+    def handle_invalidation(self, tags: Optional[List[str]]) -> None:
+        """
+        Drop the sets of the users whose cache tags another worker invalidated.
+
+        Shares, unshares and deletions invalidate the tags of the affected
+        users, so this keeps the sets of every worker consistent.
+
+        Args:
+            tags: Invalidated tags, or None if the whole cache was cleared
+        """
+        if tags is None:
+            self.clear()
+            return
+        user_ids = []
+        for tag in tags:
+            if tag.startswith(_USER_TAG_PREFIX):
+                try:
+                    user_ids.append(int(tag[len(_USER_TAG_PREFIX):]))
+                except ValueError:
+                    continue
+        self.invalidate(user_ids)
+
+    def _drop(self, user_id: int) -> None:
+        item = self._sets.pop(user_id, None)
+        if item is not None:
+            self._size -= len(item[1])
@@ -0,0 +1,58 @@
+"""
+Microbenchmark for access token verification.
+
+Compares the per-request cost of verifying a token the way
+``get_current_user`` used to (``jwt.decode`` with the secret, parsed into a
+key on every call) with ``KeyRing.decode`` (key looked up by ``kid`` and
+parsed once), for HS256 and ES256. ES256 verification runs on the
+cryptography backend of ``python-jose[cryptography]``, i.e. on OpenSSL.
+
+Usage:
+    python -m benchmarks.bench_jwt_decode
+"""
+
+import time
+import timeit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+
+from app.core.keys import KeyRing, SigningKey
+
+ITERATIONS = 2_000
+
+
+def per_call_us(func, number: int) -> float:
+    """Time a function in microseconds per call."""
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def main() -> None:
+    claims = {"sub": "42", "exp": int(time.time()) + 3600, "jti": "0" * 32}
+
+    secret = "benchmark-secret-key"
+    hs_ring = KeyRing([SigningKey.from_secret(secret)])
+    hs_token = hs_ring.sign(claims)
+    legacy = per_call_us(lambda: jwt.decode(hs_token, secret, algorithms=["HS256"]), ITERATIONS * 10)
+    current = per_call_us(lambda: hs_ring.decode(hs_token), ITERATIONS * 10)
+    print(f"HS256 secret per call:   {legacy:9.2f} us/call")
+    print(f"HS256 key ring:          {current:9.2f} us/call")
+
+    pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    key = jwk.construct(pem, "ES256")
+    es_ring = KeyRing([SigningKey.from_jwk({**key.to_dict(), "kid": "bench"})])
+    es_token = es_ring.sign(claims)
+    public_pem = key.public_key().to_pem()
+    legacy = per_call_us(lambda: jwt.decode(es_token, public_pem, algorithms=["ES256"]), ITERATIONS)
+    current = per_call_us(lambda: es_ring.decode(es_token), ITERATIONS)
+    print(f"ES256 PEM per call:      {legacy:9.2f} us/call  ({type(key).__name__})")
+    print(f"ES256 key ring:          {current:9.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()